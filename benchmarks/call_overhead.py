@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import timeit
+
+import tadpole                as td
+import tadpole.autodiff.graph as ag
+
+
+"""
+Benchmark of the per-call overhead of differentiable functions
+in plain evaluation (no graph is active): the argument envelope route 
+vs the fast path that calls the raw function directly.
+
+Run: python benchmarks/call_overhead.py
+
+"""
+
+
+
+def envelope_route(fun):
+
+    def wrap(*args):
+        return ag.EnvelopeArgs(*args).applywrap(fun, fun._fun)
+
+    return wrap
+
+
+def bench(fun, *args, number=2000):
+
+    fun(*args)
+
+    time = min(timeit.repeat(lambda: fun(*args), number=number, repeat=5))
+
+    return 1e6 * time / number
+
+
+
+i, j, k = td.IndexGen("i", 4), td.IndexGen("j", 4), td.IndexGen("k", 4)
+
+x = td.randn((i,j))
+y = td.randn((j,k))
+z = td.randn((i,j))
+w = x * x
+
+cases = {
+   "add":      (td.add,      (x, z)),
+   "contract": (td.contract, (x, y)),
+   "sqrt":     (td.sqrt,     (w,)),
+}
+
+
+print(f"{'function':<12}{'raw [us]':>10}{'envelope [us]':>15}"
+      f"{'fast path [us]':>16}{'overhead before':>17}{'overhead after':>16}")
+
+for name, (fun, args) in cases.items():
+
+    assert td.allclose(envelope_route(fun)(*args), fun(*args))
+
+    t0 = bench(fun._fun,             *args)
+    t1 = bench(envelope_route(fun),  *args)
+    t2 = bench(fun,                  *args)
+
+    print(f"{name:<12}{t0:>10.1f}{t1:>15.1f}"
+          f"{t2:>16.1f}{t1 - t0:>17.1f}{t2 - t0:>16.1f}")
+
+
+
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import timeit
+
+import tadpole                    as td
+import tadpole.tensor.contraction as tnc
+
+
+"""
+Benchmark of pairwise tensor contractions:
+the tensordot fast path vs the einsum route.
+
+Run: python benchmarks/pairwise_contract.py
+
+"""
+
+
+
+def einsum_route(x, y):
+
+    return tnc.tensor_contract(x, y).einsum()
+
+
+def tensordot_route(x, y):
+
+    return tnc.tensor_contract(x, y).contract()
+
+
+def bench(fun, *args, number=200):
+
+    fun(*args)
+
+    time = min(timeit.repeat(lambda: fun(*args), number=number, repeat=5))
+
+    return 1e6 * time / number
+
+
+
+cases = {
+   "matrix (256)": (("i","j"),     ("j","k"),     {"i": 256, "j": 256, "k": 256}),
+   "mps (chi=64)": (("l","s","r"), ("r","t","q"), {"l": 64, "s": 2, "r": 64,
+                                                   "t": 2, "q": 64}),
+   "small (8)":    (("i","j","k"), ("k","j","l"), {"i": 8, "j": 8, "k": 8,
+                                                   "l": 8}),
+}
+
+
+print(f"{'case':<16}{'einsum [us]':>14}{'tensordot [us]':>18}{'speedup':>10}")
+
+for name, (xnames, ynames, sizes) in cases.items():
+
+    inds = {s: td.IndexGen(s, n) for s, n in sizes.items()}
+
+    x = td.randn(tuple(inds[s] for s in xnames))
+    y = td.randn(tuple(inds[s] for s in ynames))
+
+    assert td.allclose(einsum_route(x, y), tensordot_route(x, y))
+
+    t0 = bench(einsum_route,    x, y)
+    t1 = bench(tensordot_route, x, y)
+
+    print(f"{name:<16}{t0:>14.1f}{t1:>18.1f}{t0 / t1:>10.2f}")
+
+
+
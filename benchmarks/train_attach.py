@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import timeit
+
+import tadpole               as td
+import tadpole.util          as util
+import tadpole.tensor.engine as tnengine
+
+
+"""
+Benchmark of attaching operands to a train (util.Sequence):
+the cost per push should stay flat as the train grows, and
+attaching 100 operands should be a negligible part of td.contract.
+
+Run: python benchmarks/train_attach.py
+
+"""
+
+
+
+def bench(fun, number=5):
+
+    fun()
+
+    time = min(timeit.repeat(fun, number=number, repeat=5))
+
+    return 1e3 * time / number
+
+
+
+def push_sequence(n):
+
+    def fun():
+
+        seq = util.Sequence()
+
+        for item in range(n):
+            seq = seq.push(item)
+
+        return list(seq)
+
+    return fun
+
+
+
+def attach_train(xs):
+
+    datas = [td.asdata(x)            for x in xs]
+    inds  = [tuple(td.union_inds(x)) for x in xs]
+
+    def fun():
+
+        train = tnengine.TrainTensorData()
+
+        for data, ind in zip(datas, inds):
+            train = train.attach(data, ind)
+
+        return list(train.data()), list(train.inds())
+
+    return fun
+
+
+
+print(f"{'npush':>8}{'total [ms]':>14}{'per push [us]':>16}")
+
+for n in (100, 1000, 4000):
+
+    t = bench(push_sequence(n))
+
+    print(f"{n:>8}{t:>14.3f}{1e3 * t / n:>16.3f}")
+
+
+
+n    = 100
+inds = [td.IndexGen(f"i{k}", 2) for k in range(n + 1)]
+xs   = [td.randn((inds[k], inds[k+1]), seed=k) for k in range(n)]
+
+t0 = bench(attach_train(xs))
+t1 = bench(lambda: td.contract(*xs), number=3)
+
+print()
+print(f"{'operands':>8}{'attach [ms]':>14}{'contract [ms]':>16}")
+print(f"{n:>8}{t0:>14.3f}{t1:>16.3f}")
+
+
+
@@ -158,17 +158,30 @@ class ArgsTensorCollection:
 
    def gradient(self, fun):
 
-       grads = { 
-                i: td.gradient(fun, i)(*self._ts) 
-                   for i in range(len(self._tensors))
-               }
+       adx   = tuple(range(len(self._tensors)))
+       grads = dict(enumerate(td.gradient(fun, adx)(*self._ts)))
 
        return self.__class__(TensorCollection(grads))
 
 
    def evaluate_with_gradient(self, fun):
 
-       return self.apply(fun), self.gradient(fun)
+       adx        = tuple(range(len(self._tensors)))
+       val, grads = td.evaluate_with_gradient(fun, adx)(*self._ts)
+
+       return val, self.__class__(TensorCollection(dict(enumerate(grads))))
+
+
+   def compile(self, fun):
+
+       adx  = tuple(range(len(self._tensors)))
+       cfun = td.jit(fun, adx)
+
+       def wrap(ts):
+           val, grads = cfun(*ts._ts)
+           return val, ts.__class__(TensorCollection(dict(enumerate(grads))))
+
+       return wrap
 
 
 
@@ -229,6 +242,17 @@ class ArgsTensor:
        return val, self.__class__(grad)
 
 
+   def compile(self, fun):
+
+       cfun = td.jit(fun)
+
+       def wrap(ts):
+           val, grad = cfun(ts._t)
+           return val, ts.__class__(grad)
+
+       return wrap
+
+
 
 class Optimize:
 
@@ -240,11 +264,11 @@ class Optimize:
 
    def _costfun(self):
 
+       evaluate_with_gradient = self._ts.compile(self._fun)
+
        def wrap(x):
 
-           ts    = self._ts.unpack(x)
-           val   = ts.apply(self._fun)
-           grads = ts.gradient(self._fun)
+           val, grads = evaluate_with_gradient(self._ts.unpack(x))
 
            return td.asdata(val, backend="numpy"), grads.pack()
 
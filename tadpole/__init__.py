@@ -4,6 +4,7 @@
 from . import linalg
 
 from .container  import container as tuple
+from .util       import profile
 from .autodiff   import *
 from .index      import *
 from .tensor     import *
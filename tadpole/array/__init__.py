@@ -101,6 +101,7 @@ from .unary import (
    count_nonzero,
    put,
    argsort,
+   unique,
    diag,
 )
 
@@ -167,6 +168,7 @@ from .binary import (
    logical_and,
    logical_or,
    add,
+   iadd,
    sub,
    mul,
    div,
@@ -178,6 +180,7 @@ from .binary import (
 
 from .binary import (
    dot,
+   tensordot,
    kron,
 )
 
@@ -196,6 +199,14 @@ from .nary import (
    concat,
    where,
    einsum,
+   contract,
+)
+
+
+from .nary import (
+   contract_cache_info,
+   contract_cache_clear,
+   MAX_SYMBOLS,
 )
 
 
@@ -85,6 +85,14 @@ class Backend(abc.ABC):
    def size(self, array):
        pass
 
+   @abc.abstractmethod
+   def nbytes(self, array):
+       pass
+
+   @abc.abstractmethod
+   def buffer(self, array):
+       pass
+
    @abc.abstractmethod
    def ndim(self, array):
        pass
@@ -180,6 +188,10 @@ class Backend(abc.ABC):
    def argsort(self, array, axis=-1, **opts):
        pass
 
+   @abc.abstractmethod
+   def unique(self, array):
+       pass
+
    @abc.abstractmethod
    def diag(self, array, **opts):
        pass
@@ -321,6 +333,10 @@ class Backend(abc.ABC):
    def add(self, x, y):
        pass 
 
+   @abc.abstractmethod
+   def iadd(self, x, y):
+       pass 
+
    @abc.abstractmethod
    def sub(self, x, y):
        pass 
@@ -356,6 +372,10 @@ class Backend(abc.ABC):
    def dot(self, x, y):
        pass
 
+   @abc.abstractmethod
+   def tensordot(self, x, y, axes):
+       pass
+
    @abc.abstractmethod
    def kron(self, x, y):
        pass
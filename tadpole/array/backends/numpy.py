@@ -149,6 +149,19 @@ class NumpyBackend(backend.Backend):
        return array.size
 
 
+   def nbytes(self, array):
+
+       return array.nbytes
+
+
+   def buffer(self, array):
+
+       while isinstance(array.base, np.ndarray):
+          array = array.base
+
+       return array.ctypes.data, array.nbytes
+
+
    def ndim(self, array):
 
        return array.ndim
@@ -284,6 +297,11 @@ class NumpyBackend(backend.Backend):
           axis = -1
 
        return np.argsort(array, axis=axis, **opts)
+
+
+   def unique(self, array):
+
+       return np.unique(array, return_inverse=True)
  
 
    # --- Logical operations --- #
@@ -450,6 +468,11 @@ class NumpyBackend(backend.Backend):
    def add(self, x, y):
 
        return x + y
+
+
+   def iadd(self, x, y):
+
+       return np.add(x, y, out=x)
         
 
    def sub(self, x, y):
@@ -486,7 +509,10 @@ class NumpyBackend(backend.Backend):
 
    def einsum(self, equation, *xs, optimize=True):
 
-       return np.einsum(equation, *xs, optimize=optimize)
+       if isinstance(equation, str):
+          return np.einsum(equation, *xs, optimize=optimize)
+
+       return np.einsum(*util.interleaved(xs, equation), optimize=optimize)
        
 
    def dot(self, x, y):
@@ -494,6 +520,11 @@ class NumpyBackend(backend.Backend):
        return np.dot(x, y)
        
 
+   def tensordot(self, x, y, axes):
+
+       return np.tensordot(x, y, axes)
+
+
    def kron(self, x, y):
 
        return np.kron(x, y)       
@@ -4,6 +4,8 @@
 import functools
 import numpy as np
 
+import tadpole.util as util
+
 from tadpole.array.backends.backend import Backend
 from tadpole.array.backends.numpy   import NumpyBackend
 from tadpole.array.backends.torch   import TorchBackend
@@ -109,6 +111,21 @@ def set_default(backend):
 
 
 
+# --- Report backend calls to the active profiler --------------------------- #
+
+def instrument():
+
+    names = Backend.__abstractmethods__ - {"name"}
+
+    for name, backend in BackendRegistry._backends.items():
+        util.instrument(backend, names, name)
+
+
+instrument()
+
+
+
+
 # --- Extract backend string from input array ------------------------------- #
 
 @functools.lru_cache(None)
@@ -184,6 +184,18 @@ class TorchBackend(backend.Backend):
        return torch.numel(array)
 
 
+   def nbytes(self, array):
+
+       return array.element_size() * torch.numel(array)
+
+
+   def buffer(self, array):
+
+       storage = array.untyped_storage()
+
+       return storage.data_ptr(), storage.nbytes()
+
+
    def ndim(self, array):
 
        return array.dim()
@@ -340,6 +352,11 @@ class TorchBackend(backend.Backend):
        return torch.argsort(array, axis=axis, **opts)
 
 
+   def unique(self, array):
+
+       return torch.unique(array, sorted=True, return_inverse=True)
+
+
    # --- Logical operations --- #
 
    def allclose(self, x, y, **opts):
@@ -504,6 +521,11 @@ class TorchBackend(backend.Backend):
    def add(self, x, y):
 
        return torch.add(x, y)
+
+
+   def iadd(self, x, y):
+
+       return x.add_(y)
         
 
    def sub(self, x, y):
@@ -540,7 +562,10 @@ class TorchBackend(backend.Backend):
 
    def einsum(self, equation, *xs, optimize=True):
 
-       return torch.einsum(equation, *xs)
+       if isinstance(equation, str):
+          return torch.einsum(equation, *xs)
+
+       return torch.einsum(*util.interleaved(xs, equation))
        
 
    def dot(self, x, y):
@@ -548,6 +573,11 @@ class TorchBackend(backend.Backend):
        return torch.dot(x, y)
        
 
+   def tensordot(self, x, y, axes):
+
+       return torch.tensordot(x, y, dims=axes)
+
+
    def kron(self, x, y):
 
        return torch.kron(x, y)
@@ -20,3 +20,31 @@ def unit(self, shape, idx, **opts):
 
     return array
 
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Contraction methods                                                    ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Interleave operands with integer sublists of an einsum equation ------- #
+
+def interleaved(xs, equation):
+
+    inputs, output = equation
+
+    args = []
+    for x, sublist in zip(xs, inputs):
+        args.extend((x, list(sublist)))
+
+    args.append(list(output))
+
+    return args
+
+
+
+
@@ -210,6 +210,13 @@ class Array(types.Array):
 
        return self.new(data)
 
+
+   def iadd(self):
+
+       data = self._backend.iadd(*self._datas)
+
+       return self.new(data)
+
        
    def sub(self):
 
@@ -262,6 +269,13 @@ class Array(types.Array):
        return self.new(data)
        
 
+   def tensordot(self, axes):
+
+       data = self._backend.tensordot(*self._datas, axes)
+
+       return self.new(data)
+
+
    def kron(self):
 
        data = self._backend.kron(*self._datas)
@@ -372,6 +386,12 @@ def add(x, y):
     return (x | y).add()
 
 
+@typecast
+def iadd(x, y):
+
+    return (x | y).iadd()
+
+
 @typecast
 def sub(x, y):
 
@@ -418,6 +438,12 @@ def dot(x, y):
     return (x | y).dot()
 
      
+@typecast
+def tensordot(x, y, axes):
+
+    return (x | y).tensordot(axes)
+
+
 @typecast  
 def kron(x, y):
 
@@ -4,6 +4,8 @@
 import tadpole.util as util
 
 import operator
+import functools
+import opt_einsum as oe
 from functools import reduce
 
 import tadpole.array.backends as backends
@@ -15,6 +17,49 @@ import tadpole.array.binary   as binary
 
 
 
+###############################################################################
+###                                                                         ###
+###  Cache of precompiled contraction expressions                           ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Number of einsum symbols, beyond it equations are given as sublists --- #
+
+MAX_SYMBOLS = 52
+
+
+
+
+# --- Precompiled contraction expression (cached) --------------------------- #
+
+@functools.lru_cache(2**10)
+def contract_expression(equation, shapes, dtypes, backend, optimize="auto"):
+
+    if isinstance(equation, str):
+       return oe.contract_expression(equation, *shapes, optimize=optimize)
+
+    return oe.contract_expression(
+       *backends.util.interleaved(shapes, equation), optimize=optimize
+    )
+
+
+
+
+# --- Contraction cache statistics ------------------------------------------ #
+
+def contract_cache_info():
+
+    return contract_expression.cache_info()
+
+
+def contract_cache_clear():
+
+    return contract_expression.cache_clear()
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Definition of Nary Array (supports nary operations)                    ###
@@ -114,9 +159,33 @@ class Array(types.Array):
 
    def einsum(self, equation, optimize=True):
 
+       if not isinstance(equation, str) \
+          and any(s >= MAX_SYMBOLS for s in util.concat(equation[0])):
+
+          data = oe.contract(
+                    *backends.util.interleaved(self._datas, equation), 
+                    backend=self._backend.name(), 
+                    optimize=optimize
+                 )
+          return self.new(data)
+
        data = self._backend.einsum(equation, *self._datas, optimize=optimize)
 
        return self.new(data)
+
+
+   def contract(self, equation, optimize="auto"):
+
+       backend = self._backend.name()
+       shapes  = tuple(map(self._backend.shape, self._datas))
+       dtypes  = tuple(str(self._backend.dtype(x)) for x in self._datas)
+
+       expr = contract_expression(
+                 equation, shapes, dtypes, backend, optimize
+              )
+       data = expr(*self._datas, backend=backend)
+
+       return self.new(data)
  
 
 
@@ -172,4 +241,13 @@ def einsum(equation, *xs, optimize=True):
 
 
 
+def contract(equation, *xs, optimize="auto"):
+
+    array = reduce(operator.or_, xs) 
+    array = array.nary()
+            
+    return array.contract(equation, optimize=optimize)
+
+
+
 
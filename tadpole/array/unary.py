@@ -230,6 +230,17 @@ class Array(types.Array):
        return self._backend.size(self._data)
 
 
+   @property
+   def nbytes(self):
+
+       return self._backend.nbytes(self._data)
+
+
+   def buffers(self):
+
+       return (self._backend.buffer(self._data),)
+
+
    @property
    def ndim(self):
 
@@ -378,6 +389,13 @@ class Array(types.Array):
        data = self._backend.argsort(self._data, axis, **opts)
 
        return self.new(data)   
+
+
+   def unique(self):
+
+       vals, inverse = self._backend.unique(self._data)
+
+       return self.new(vals), self.new(inverse)
   
 
    # --- Standard math --- #
@@ -774,6 +792,11 @@ def argsort(x, axis=None, **opts):
     return x.argsort(axis, **opts)
 
 
+def unique(x):
+
+    return x.unique()
+
+
     
 
 # --- Standard math --------------------------------------------------------- #
@@ -927,10 +950,12 @@ def lq(x):
     if iscomplex(x):
        x = conj(x)
 
-    Q, R = qr(transpose(x, (1,0)))
+    axes = (*range(ndim(x) - 2), ndim(x) - 1, ndim(x) - 2)
+
+    Q, R = qr(transpose(x, axes))
     
-    L = transpose(R, (1,0))
-    Q = transpose(Q, (1,0))
+    L = transpose(R, axes)
+    Q = transpose(Q, axes)
 
     if iscomplex(x):
        L = conj(L) 
@@ -8,7 +8,9 @@ from . import wrappers as wrappers
 from .wrappers import (
    differentiable,
    nondifferentiable,
+   structural,
    checkpoint,
+   checkpoint_loop,
 )
 
 
@@ -24,6 +26,16 @@ from .grad import (
    evaluate_with_gradient,
    gradient,
    derivative,
+   hvp,
+   hessian,
+   backprop_memory,
+   graph_stats,
+   reverse_engine,
+)
+
+
+from .tape import (
+   jit,
 )
 
 
@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import collections
+import operator
+import threading
+import concurrent.futures
 from functools import reduce
 
 import tadpole.util as util
@@ -65,6 +68,54 @@ def derivative(fun, x):
 
 
 
+# --- Directional derivative ------------------------------------------------ #
+
+@nary.nary_op
+def directional_derivative(fun, x, v):
+
+    return diffop_forward(fun, x).grad(v)
+
+
+
+
+# --- Hessian-vector product (forward-over-reverse) ------------------------- #
+
+def hvp(fun, adx=None):
+
+    def hvpfun(*args, **kwargs):
+
+        *args, v = args
+
+        return directional_derivative(
+                  gradient(fun, adx), adx, v
+               )(*args, **kwargs)
+
+    return hvpfun
+
+
+
+
+# --- Hessian --------------------------------------------------------------- #
+
+@nary.nary_op
+def hessian(fun, x, inds=None):
+
+    space  = x.space()
+    hvpfun = hvp(fun)
+
+    if inds is None:
+       dualspace = space.dual()
+    else:
+       dualspace = space.reshape(inds)
+
+    return reduce(operator.add, (
+       hvpfun(x, unit) @ dual
+          for unit, dual in zip(space.units(), dualspace.units())
+    ))
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Differential operator                                                  ###
@@ -72,14 +123,136 @@ def derivative(fun, x):
 ###############################################################################
 
 
+# --- Packer: packs a plural variable (tuple of arguments) into one -------- #
+
+class Packer:
+
+   def __init__(self, pack=None):
+
+       self._pack = pack
+
+
+   def register(self, pack):
+
+       self._pack = pack
+       return self
+
+
+   def __call__(self, x):
+
+       if self._pack is None or not isinstance(x, tuple):
+          return x
+
+       return self._pack(*x)
+
+
+
+
+# --- A global instance of Packer and its access ports ---------------------- #
+
+_PACKER = Packer()
+
+
+def register_pack(pack):
+
+    return _PACKER.register(pack)
+
+
+def pack(x):
+
+    return _PACKER(x)
+
+
+
+
 # --- Create reverse differential operator ---------------------------------- #
 
 def diffop_reverse(fun, x):
 
-    evalop     = EvalOp(fun, x)
-    start, end = evalop.execute(an.GateReverse())
+    return DifferentialOp(_REVERSE_ENGINE(fun, pack(x)))
+
 
-    return DifferentialOp(PropagationReverse(start, end))
+
+
+# --- Reverse propagation engine -------------------------------------------- #
+
+class ReverseEngine:
+
+   def __init__(self, name="graph", workers=None):
+
+       self._name     = name
+       self._workers  = workers
+       self._previous = []
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("name",    self._name)
+       rep.val("workers", self._workers)
+
+       return str(rep)
+
+
+   def __enter__(self):
+
+       return self
+
+
+   def __exit__(self, exception_type, exception_val, trace):
+
+       self._name, self._workers = self._previous.pop()
+
+
+   def use(self, name, workers=None):
+
+       if name not in ("graph", "tape", "parallel"):
+          raise ValueError(
+             f"{type(self).__name__}.use: invalid engine {name}, "
+             f"must be one of 'graph', 'tape', 'parallel'."
+          )
+
+       self._previous.append((self._name, self._workers))
+
+       self._name    = name
+       self._workers = workers
+
+       return self
+
+
+   def __call__(self, fun, x):
+
+       evalop = EvalOp(fun, x)
+
+       if self._name == "tape":
+
+          tape       = an.NodeTape()
+          start, end = evalop.execute(an.GateReverse(), tape)
+
+          return PropagationTape(start, end, tape, release=True)
+
+       start, end = evalop.execute(an.GateReverse())
+
+       if self._name == "parallel":
+          return PropagationParallel(
+                    start, end, self._workers, release=True
+                 )
+
+       return PropagationReverse(start, end, release=True)
+
+
+
+
+# --- A global instance of ReverseEngine and its access port ---------------- #
+
+_REVERSE_ENGINE = ReverseEngine()
+
+
+def reverse_engine(name, workers=None):
+
+    return _REVERSE_ENGINE.use(name, workers)
 
 
 
@@ -197,10 +370,11 @@ class PropagationForward(Propagation):
 
 class PropagationReverse(Propagation):
 
-   def __init__(self, start, end):
+   def __init__(self, start, end, release=False):
 
-       self._start = start
-       self._end   = end
+       self._start   = start
+       self._end     = end
+       self._release = release
 
 
    def __repr__(self):
@@ -233,19 +407,222 @@ class PropagationReverse(Propagation):
 
    def grads(self, seed):
 
-       if not self._end.connected(self._start):
+       if not self._end.depends(self._start):
           return GradAccum(self._start.tonull())
 
-       grads = GradAccum({self._end: seed})
+       global _MEMORY
+
+       memory   = MemoryLog()
+       countmap = childcount(self._end, self._start)
+
+       for node in countmap:
+           memory.push(("value", node), node)
+
+       grads = GradAccum(
+                  {self._end: seed}, memory, inplace=True, nodes=countmap
+               )
+
+       for node in toposort(self._end, countmap): 
 
-       for node in toposort(self._end): 
            grads = node.grads(grads)
 
+           if self._release:
+              memory.pop(("value", node))
+              node.release()
+
+       _MEMORY = memory
        return grads
 
 
 
 
+# --- Reverse gradient propagation with a pool of threads ------------------- #
+
+class PropagationParallel(Propagation):
+
+   def __init__(self, start, end, workers=None, release=False):
+
+       self._start   = start
+       self._end     = end
+       self._workers = workers
+       self._release = release
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("start",   self._start)
+       rep.val("end",     self._end)
+       rep.val("workers", self._workers)
+
+       return str(rep)
+
+
+   def __eq__(self, other):
+
+       log = util.LogicalChain()
+       log.typ(self, other)
+
+       if bool(log):
+          log.val(self._start,   other._start)
+          log.val(self._end,     other._end)
+          log.val(self._workers, other._workers)
+
+       return bool(log)
+
+
+   def apply(self, fun):
+
+       return fun(self._end)
+
+
+   def _step(self, node, grads):
+
+       grads = node.grads(grads)
+
+       if self._release:
+          grads.release(node)
+
+       return node
+
+
+   def grads(self, seed):
+
+       if not self._end.depends(self._start):
+          return GradAccum(self._start.tonull())
+
+       global _MEMORY
+
+       memory   = MemoryLog()
+       countmap = childcount(self._end, self._start)
+
+       for node in countmap:
+           memory.push(("value", node), node)
+
+       grads = GradLocked(countmap, {self._end: seed}, memory, inplace=True)
+       ready = NodeLogChildless(NodeLogVanilla(), countmap)
+
+       with concurrent.futures.ThreadPoolExecutor(self._workers) as pool:
+
+          futures = {pool.submit(self._step, self._end, grads)}
+
+          while futures:
+
+             done, futures = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+             )
+
+             for future in done:
+                 future.result().log(ready)
+
+             while ready:
+
+                node = ready.pop()
+
+                if node is not self._start:
+                   futures.add(pool.submit(self._step, node, grads))
+
+       self._step(self._start, grads)
+
+       _MEMORY = memory
+       return grads
+
+
+
+
+# --- Reverse gradient propagation over a node tape ------------------------- #
+
+class PropagationTape(Propagation):
+
+   def __init__(self, start, end, tape, release=False):
+
+       self._start   = start
+       self._end     = end
+       self._tape    = tape
+       self._release = release
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("start", self._start)
+       rep.val("end",   self._end)
+       rep.val("tape",  self._tape)
+
+       return str(rep)
+
+
+   def __eq__(self, other):
+
+       log = util.LogicalChain()
+       log.typ(self, other)
+
+       if bool(log):
+          log.val(self._start, other._start)
+          log.val(self._end,   other._end)
+          log.ref(self._tape,  other._tape)
+
+       return bool(log)
+
+
+   def apply(self, fun):
+
+       return fun(self._end)
+
+
+   def grads(self, seed):
+
+       if not self._end.depends(self._start):
+          return GradSlots(bytearray(), self._start.tonull())
+
+       grads = backprop(
+          self._tape, self._start.slot, self._end.slot, seed, self._release
+       )
+
+       if self._release:
+          self._tape.clear()
+
+       return grads
+
+
+   def freeze(self):
+
+       return self._tape.freeze(self._start.slot, self._end.slot)
+
+
+
+
+# --- Reverse sweep over the slots of a node tape --------------------------- #
+
+def backprop(tape, start, end, seed, release=False):
+
+    live  = tape.live(start, end)
+    grads = GradSlots(live).add((end,), (seed,))
+
+    for slot in reversed(range(start + 1, end + 1)):
+
+        if not grads.active(slot):
+           continue
+
+        inputs = tape.inputs(slot)
+        keep   = tuple(p is not None and live[p] for p in inputs)
+        vjps   = tape.op(slot).prune(keep).vjp(grads.pick(slot))
+
+        grads.add((p for p, k in zip(inputs, keep) if k), vjps)
+
+        if release:
+           tape.release(slot)
+
+    grads.pick(start)
+    return grads
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Function evaluation operator (builds AD computation graph)             ###
@@ -291,12 +668,15 @@ class EvalOp:
        return ag.Graph(root)
 
 
-   def execute(self, root):
+   def execute(self, root, tape=None):
 
        with self.graph(root) as graph:
-          start, end = graph.build(self._fun, self._x)  
 
-       return start, end
+          if tape is None:
+             return graph.build(self._fun, self._x)  
+
+          with an.taping(tape, graph.layer):
+             return graph.build(self._fun, self._x)
 
 
 
@@ -418,6 +798,9 @@ class NodeLogChildless(NodeLog):
 
        for node in nodes:
 
+           if node not in self._childcount:
+              continue
+
            if self._childcount[node] > 0:
               self._childcount[node] -= 1
 
@@ -436,7 +819,7 @@ class NodeLogChildless(NodeLog):
 
 # --- Create a dictionary of child counts of the computation graph ---------- #
 
-def childcount(end):
+def childcount(end, start=None):
 
     countmap = {}
     parents  = NodeLogVanilla(end)
@@ -444,6 +827,9 @@ def childcount(end):
     while parents:
 
        node = parents.pop()
+
+       if start is not None and not node.depends(start):
+          continue
     
        try:
           countmap[node] += 1
@@ -459,9 +845,12 @@ def childcount(end):
 
 # --- Iterate over the topological sort of the computation graph ------------ #
 
-def toposort(end):
+def toposort(end, countmap=None):
+
+    if countmap is None:
+       countmap = childcount(end)
 
-    childless = NodeLogChildless(NodeLogVanilla(end), childcount(end))
+    childless = NodeLogChildless(NodeLogVanilla(end), countmap)
 
     while childless:
 
@@ -558,7 +947,7 @@ class GradSum(GradCumulative):
 
 class GradAccum(GradCumulative):
 
-   def __init__(self, grads=None):
+   def __init__(self, grads=None, memory=None, inplace=False, nodes=None):
 
        if grads is None:
           grads = {}
@@ -566,7 +955,17 @@ class GradAccum(GradCumulative):
        if not isinstance(grads, dict):
           grads = {None: grads}
 
-       self._grads = grads
+       if memory is None:
+          memory = MemoryLog()
+
+       self._grads   = grads
+       self._memory  = memory
+       self._inplace = inplace
+       self._nodes   = nodes
+       self._owned   = set()
+
+       for node, grad in grads.items():
+           self._memory.push(("grad", node), grad)
 
 
    def __repr__(self):
@@ -596,10 +995,37 @@ class GradAccum(GradCumulative):
        return self._grads.get(node) 
 
 
+   def _addgrad(self, node, grad):
+
+       netgrad = self._netgrad(node)
+
+       if not self._inplace or netgrad is None:
+          return addgrads(netgrad, grad)
+
+       if isinstance(netgrad, Node) or isinstance(grad, Node):
+          return addgrads(netgrad, grad)
+
+       if node not in self._owned:
+          self._owned.add(node)
+          netgrad = netgrad.copy()
+
+       return grad.addto(netgrad, inplace=True)
+
+
+   def live(self, node):
+
+       return self._nodes is None or node in self._nodes
+
+
    def add(self, nodes, grads):
 
        for node, grad in zip(nodes, grads):
-           self._grads[node] = addgrads(self._netgrad(node), grad) 
+
+           if not self.live(node):
+              continue
+
+           self._grads[node] = self._addgrad(node, grad) 
+           self._memory.push(("grad", node), self._grads[node])
       
        return self
 
@@ -607,6 +1033,10 @@ class GradAccum(GradCumulative):
    def pick(self, node): 
  
        grad = self._grads.pop(node)
+       self._owned.discard(node)
+
+       self._memory.pop(("grad", node))
+       self._memory.push(("grad", None), grad)
 
        self._grads[None] = grad
        return grad
@@ -624,3 +1054,301 @@ class GradAccum(GradCumulative):
 
 
 
+# --- Gradient accumulation with per-node locks (for parallel propagation) -- #
+
+class GradLocked(GradAccum):
+
+   def __init__(self, nodes, grads=None, memory=None, inplace=False):
+
+       super().__init__(grads, memory, inplace, nodes)
+
+       self._locks = {node: threading.Lock() for node in nodes}
+
+
+   def add(self, nodes, grads):
+
+       for node, grad in zip(nodes, grads):
+
+           if not self.live(node):
+              continue
+
+           with self._locks[node]:
+              self._grads[node] = self._addgrad(node, grad) 
+              self._memory.push(("grad", node), self._grads[node])
+      
+       return self
+
+
+   def pick(self, node): 
+ 
+       with self._locks[node]:
+          return super().pick(node)
+
+
+   def release(self, node):
+
+       self._memory.pop(("value", node))
+       node.release()
+
+       return self
+
+
+
+
+# --- Gradient slots (gradient accumulation over a node tape) --------------- #
+
+class GradSlots(GradCumulative):
+
+   def __init__(self, live, result=None):
+
+       self._live   = live
+       self._grads  = [None] * len(live)
+       self._result = result
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("grads", self._grads)
+
+       return str(rep)
+
+
+   def __eq__(self, other):
+
+       log = util.LogicalChain()
+       log.typ(self, other)
+
+       if bool(log):
+          log.val(self._grads,  other._grads)
+          log.val(self._result, other._result)
+
+       return bool(log)
+
+
+   def active(self, slot):
+
+       return self._grads[slot] is not None
+
+
+   def add(self, slots, grads):
+
+       for slot, grad in zip(slots, grads):
+           self._grads[slot] = addgrads(self._grads[slot], grad) 
+      
+       return self
+
+
+   def pick(self, slot): 
+ 
+       grad = self._grads[slot]
+
+       self._grads[slot] = None
+       self._result      = grad
+
+       return grad
+
+
+   def result(self): 
+
+       return self._result
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Memory log: bytes held alive by gradient propagation                   ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Number of bytes held by a value --------------------------------------- #
+
+def nbytes(x):
+
+    try:
+       return int(x.nbytes)
+    except (AttributeError, TypeError):
+       return 0
+
+
+
+
+# --- Memory log ------------------------------------------------------------ #
+
+class MemoryLog:
+
+   def __init__(self):
+
+       self._live = {}
+       self._curr = 0
+       self._peak = 0
+       self._lock = threading.Lock()
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("current", self._curr)
+       rep.val("peak",    self._peak)
+
+       return str(rep)
+
+
+   def push(self, key, x):
+
+       size = nbytes(x)
+
+       with self._lock:
+
+          self._curr     -= self._live.pop(key, 0)
+          self._live[key] = size
+          self._curr     += size
+          self._peak      = max(self._peak, self._curr)
+
+       return self
+
+
+   def pop(self, key):
+
+       with self._lock:
+          self._curr -= self._live.pop(key, 0)
+
+       return self
+
+
+   @property
+   def current(self):
+       return self._curr
+
+   @property
+   def peak(self):
+       return self._peak
+
+
+
+
+# --- Memory log of the latest reverse propagation and its access port ------ #
+
+_MEMORY = MemoryLog()
+
+
+def backprop_memory():
+
+    return _MEMORY
+
+
+
+
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Graph stats: bytes pinned by the recorded computation graph            ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Memory buffers held by a value ---------------------------------------- #
+
+def buffers(x):
+
+    if isinstance(x, (tuple, list)):
+       return tuple(util.concat(map(buffers, x)))
+
+    try:
+       return tuple(x.buffers())
+    except (AttributeError, TypeError):
+       return tuple()
+
+
+
+
+# --- Graph stats ----------------------------------------------------------- #
+
+class GraphStats:
+
+   def __init__(self):
+
+       self._buffers = {}
+       self._holders = {}
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("nnodes",   self.nnodes)
+       rep.val("nbuffers", self.nbuffers)
+       rep.val("nbytes",   self.nbytes)
+
+       return str(rep)
+
+
+   def add(self, node, name, *values):
+
+       holder = self._holders.setdefault(node, ["source", 0])
+
+       if name is not None:
+          holder[0] = name
+
+       for key, size in buffers(values):
+
+           if key in self._buffers:
+              continue
+
+           self._buffers[key] = size
+           holder[1]         += size
+
+       return self
+
+
+   @property
+   def nnodes(self):
+       return len(self._holders)
+
+   @property
+   def nbuffers(self):
+       return len(self._buffers)
+
+   @property
+   def nbytes(self):
+       return sum(self._buffers.values())
+
+
+   def top(self, n=10):
+
+       holders = sorted(
+          self._holders.values(), key=lambda holder: holder[1], reverse=True
+       )
+
+       return [tuple(holder) for holder in holders[:n]]
+
+
+
+
+# --- Stats of the graph recorded up to an end node ------------------------- #
+
+def graph_stats(end):
+
+    stats = GraphStats()
+
+    if not isinstance(end, Node):
+       return stats
+
+    for node in childcount(end):
+        stats = node.account(stats)
+
+    return stats
+
+
+
+
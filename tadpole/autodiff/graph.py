@@ -48,7 +48,8 @@ def returns_node(fun):
 
 class Graph:
 
-   _layer = misc.minlayer() 
+   _layer  = misc.minlayer() 
+   _origin = 0
 
 
    def __init__(self, root):
@@ -88,9 +89,18 @@ class Graph:
        type(self)._layer -= 1
 
 
+   @property
+   def layer(self):
+
+       return type(self)._layer
+
+
    def build(self, fun, x):
 
-       start = an.node(x, type(self)._layer, self._root)  
+       type(self)._origin += 1
+
+       start = an.node(x, self.layer, self._root).mark(type(self)._origin)
+       start = an.tape_push(start, self.layer)
        end   = returns_node(fun)(start) 
 
        return start, end
@@ -127,13 +137,32 @@ class Differentiable(DifferentiableFun):
        return str(rep)
 
 
-   def __call__(self, *args, **kwargs):
+   @property
+   def name(self):
+
+       return getattr(self._fun, "__name__", type(self._fun).__name__)
+
+
+   def _call(self, *args, **kwargs):
+
+       if nodeless(*args):
+          return self._fun(*args, **kwargs)
 
        envelope = self._envelope(*args, **kwargs)
 
        return envelope.applywrap(self, self._fun)
 
 
+   def __call__(self, *args, **kwargs):
+
+       prof = util.profiler()
+
+       if prof is None:
+          return self._call(*args, **kwargs)
+
+       return prof.run(self.name, "forward", self._call, *args, **kwargs)
+
+
    def vjp(self, *args, **kwargs):
 
        return self._vjpmap.get(self)(*args, **kwargs)
@@ -144,16 +173,22 @@ class Differentiable(DifferentiableFun):
        return self._jvpmap.get(self)(*args, **kwargs)
 
 
+   def evaluate(self, *args, **kwargs):
+
+       return self._fun(*args, **kwargs)
+
+
 
 
 # --- Non-differentiable function wrap -------------------------------------- #
 
 class NonDifferentiable:
 
-   def __init__(self, fun, envelope):
+   def __init__(self, fun, envelope, structural=False):
 
-       self._fun      = fun
-       self._envelope = envelope
+       self._fun        = fun
+       self._envelope   = envelope
+       self._structural = structural
 
 
    def __repr__(self):
@@ -167,13 +202,33 @@ class NonDifferentiable:
 
    def __call__(self, *args, **kwargs):
 
+       if nodeless(*args):
+          return self._fun(*args, **kwargs)
+
        envelope = self._envelope(*args, **kwargs)
 
+       if not self._structural:
+          for layer in envelope.layers():
+              an.tape_taint(layer)
+
        return envelope.apply(self._fun)
 
 
 
 
+# --- Helper: check if arguments bypass the envelope (contain no Nodes) ----- #
+
+def nodeless(*args):
+
+    for arg in args:
+        if isinstance(arg, (Node, Args)):
+           return False
+
+    return True
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Function arguments and their concatenation                             ###
@@ -566,6 +621,11 @@ class PackArgs(Pack):
        return self._concat.innermost() 
 
 
+   def layer(self):
+
+       return self._layer
+
+
    def deshell(self):
 
        return self._concat.deshell()
@@ -648,6 +708,13 @@ class EnvelopeArgs(Envelope):
                        )
 
 
+   def layers(self):
+
+       return tuple(
+          pack.layer() for pack in self.packs() if not pack.innermost()
+       )
+
+
    def apply(self, fun):
 
        last = self.packs().last()
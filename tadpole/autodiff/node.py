@@ -81,14 +81,75 @@ class AdjointOpGen(AdjointOp):
        return fun(self._adxs, self._out, *self._args, **self._kwargs)
 
 
+   @property
+   def _name(self):
+
+       return getattr(self._fun, "name", type(self._fun).__name__)
+
+
+   def _profile(self, phase, adjfun, seed):
+
+       prof = util.profiler()
+
+       if prof is None:
+          return adjfun(seed)
+
+       return prof.run(self._name, phase, lambda g: tuple(adjfun(g)), seed)
+
+
    def vjp(self, seed):
 
-       return self._apply(self._fun.vjp)(seed)
+       return self._profile("vjp", self._apply(self._fun.vjp), seed)
 
 
    def jvp(self, seed):
 
-       return self._apply(self._fun.jvp)(seed)
+       return self._profile("jvp", self._apply(self._fun.jvp), seed)
+
+
+   def prune(self, keep):
+
+       if all(keep):
+          return self
+
+       adxs = tuple(adx for adx, k in zip(self._adxs, keep) if k)
+
+       return self.__class__(
+          self._fun, adxs, self._out, self._args, self._kwargs
+       )
+
+
+   def strip(self):
+
+       args = list(self._args)
+
+       for adx in self._adxs:
+           args[adx] = None
+
+       return self.__class__(
+          self._fun, self._adxs, None, tuple(args), self._kwargs
+       )
+
+
+   def bind(self, *xs):
+
+       args = list(self._args)
+
+       for adx, x in zip(self._adxs, xs):
+           args[adx] = x
+
+       out = self._fun.evaluate(*args, **self._kwargs)
+
+       return out, self.__class__(
+          self._fun, self._adxs, out, tuple(args), self._kwargs
+       )
+
+
+   def account(self, stats, node):
+
+       return stats.add(
+          node, self._name, self._out, *self._args, *self._kwargs.values()
+       )
 
 
 
@@ -124,6 +185,21 @@ class AdjointOpNull(AdjointOp):
        return seed
 
 
+   def prune(self, keep):
+
+       return self
+
+
+   def strip(self):
+
+       return self
+
+
+   def account(self, stats, node):
+
+       return stats
+
+
 
 
 ###############################################################################
@@ -235,6 +311,16 @@ class GateNull(Gate):
        return grads
 
 
+   def release(self):
+
+       return self
+
+
+   def account(self, node, stats):
+
+       return stats
+
+
 
 
 # --- Forward logic gate ---------------------------------------------------- #
@@ -301,6 +387,17 @@ class GateForward(Gate):
        return grads.add(node, self._op.jvp(seed))
 
 
+   def release(self):
+
+       self._op = AdjointOpNull()
+       return self
+
+
+   def account(self, node, stats):
+
+       return self._op.account(stats, node)
+
+
 
 
 # --- Reverse logic gate ---------------------------------------------------- #
@@ -359,9 +456,22 @@ class GateReverse(Gate):
 
    def grads(self, node, grads):
 
-       seed = grads.pick(node)
+       seed    = grads.pick(node)
+       keep    = tuple(map(grads.live, self._parents))
+       parents = (p for p, k in zip(self._parents, keep) if k)
+
+       return grads.add(parents, self._op.prune(keep).vjp(seed))
+
+
+   def release(self):
+
+       self._op = AdjointOpNull()
+       return self
+
 
-       return grads.add(self._parents, self._op.vjp(seed))
+   def account(self, node, stats):
+
+       return self._op.account(stats, node)
 
 
 
@@ -384,6 +494,8 @@ class NodeGen(Node):
        self._source = source              
        self._layer  = layer 
        self._gate   = gate
+       self._slot   = None
+       self._origin = 0
 
 
    # --- Equality, hashing, representation --- #
@@ -431,6 +543,11 @@ class NodeGen(Node):
        return self._layer == other._layer
 
 
+   def depends(self, other):
+
+       return self.connected(other) and self._origin == other._origin
+
+
    def concat(self, concatenable):
 
        return concatenable.attach(self, self._source, self._layer)
@@ -452,6 +569,51 @@ class NodeGen(Node):
        return self._gate.grads(self, grads)
 
 
+   def release(self):
+
+       self._source = None
+       self._gate.release()
+
+       return self
+
+
+   def account(self, stats):
+
+       stats = self._gate.account(self, stats)
+
+       return stats.add(self, None, self._source)
+
+
+   def tag(self, slot):
+
+       self._slot = slot
+       return self
+
+
+   @property
+   def slot(self):
+
+       return self._slot
+
+
+   def mark(self, origin):
+
+       self._origin = origin
+       return self
+
+
+   @property
+   def origin(self):
+
+       return self._origin
+
+
+   @property
+   def nbytes(self):
+
+       return getattr(self._source, "nbytes", 0)
+
+
 
 
 # --- NodeScape: draws new nodes -------------------------------------------- #
@@ -625,9 +787,251 @@ class ParentsGen(Parents):
 
    def next(self, source, layer, op):
 
-       flow = sum(parent.flow() for parent in self)
+       flow   = sum(parent.flow() for parent in self)
+       origin = max(parent.origin for parent in self)
+       out    = node(source, layer, flow.gate(self, op)).mark(origin)
+
+       return tape_push(out, layer, op, self._parents)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Node tape: a flat record of the nodes of one layer in creation order.  ###
+###  Each node is tagged with an integer slot, and the tape keeps the       ###
+###  adjoint op and the parent slots of every slot in flat arrays. The      ###
+###  creation order is a topological order, so the reverse sweep runs over  ###
+###  descending slots without touching the node objects.                    ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Node tape ------------------------------------------------------------- #
+
+class NodeTape:
+
+   def __init__(self):
+
+       self._nodes   = []
+       self._ops     = []
+       self._inputs  = []
+       self._tainted = False
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("nnodes", len(self))
+
+       return str(rep)
+
+
+   def __len__(self):
+
+       return len(self._ops)
+
+
+   def _slot(self, node):
+
+       slot = node.slot
+
+       if slot is None or slot >= len(self._nodes):
+          return None
+
+       if self._nodes[slot] is not node:
+          return None
+
+       return slot
+
+
+   def push(self, node, op=None, parents=tuple()):
+
+       if op is None:
+          op = AdjointOpNull()
+
+       node = node.tag(len(self._nodes))
+
+       self._nodes.append(node)
+       self._ops.append(op)
+       self._inputs.append(tuple(map(self._slot, parents)))
+
+       return node
+
+
+   def taint(self):
+
+       self._tainted = True
+       return self
+
+
+   @property
+   def tainted(self):
+
+       return self._tainted
+
+
+   def node(self, slot):
+
+       return self._nodes[slot]
+
+
+   def op(self, slot):
+
+       return self._ops[slot]
+
+
+   def inputs(self, slot):
+
+       return self._inputs[slot]
+
+
+   def live(self, start, end):
+
+       live        = bytearray(end + 1)
+       live[start] = 1
+
+       for slot in range(start + 1, end + 1):
+           live[slot] = any(
+              p is not None and live[p] for p in self._inputs[slot]
+           )
+
+       return live
+
+
+   def release(self, slot):
+
+       self._ops[slot] = AdjointOpNull()
+
+       if self._nodes[slot] is not None:
+          self._nodes[slot].release()
+
+       return self
+
+
+   def clear(self):
+
+       self._nodes   = []
+       self._ops     = []
+       self._inputs  = []
+       self._tainted = False
+
+       return self
+
+
+   def freeze(self, start, end):
+
+       live = self.live(start, end)
+       used = bytearray(end + 1)
+
+       used[end] = 1
+
+       for slot in reversed(range(start, end + 1)):
+           if used[slot]:
+              for p in self._inputs[slot]:
+                  if p is not None:
+                     used[p] = 1
+
+       tape  = self.__class__()
+       slots = {}
+
+       for slot in range(start, end + 1):
+
+           if not (live[slot] and used[slot]):
+              continue
+
+           inputs = self._inputs[slot]
+           keep   = tuple(p is not None and live[p] for p in inputs)
+
+           slots[slot] = len(tape)
+
+           tape._nodes.append(None)
+           tape._ops.append(self._ops[slot].prune(keep).strip())
+           tape._inputs.append(tuple(
+              slots[p] for p, k in zip(inputs, keep) if k
+           ))
+
+       return tape
+
+
+   def replay(self, x):
+
+       tape        = self.__class__()
+       tape._nodes = [None] * len(self)
+       tape._ops   = [self._ops[0]]
+
+       tape._inputs = self._inputs
+       values       = [x]
+
+       for slot in range(1, len(self)):
+
+           out, op = self._ops[slot].bind(
+              *(values[p] for p in self._inputs[slot])
+           )
+
+           values.append(out)
+           tape._ops.append(op)
+
+       return values[-1], tape
+
+
+
+
+# --- Active node tapes (one per layer) and their access ports -------------- #
+
+_TAPES = {}
+
+
+class Taping:
+
+   def __init__(self, tape, layer):
+
+       self._tape  = tape
+       self._layer = layer
+
+
+   def __enter__(self):
+
+       _TAPES[self._layer] = self._tape
+       return self._tape
+
+
+   def __exit__(self, exception_type, exception_val, trace):
+
+       del _TAPES[self._layer]
+
+
+
+
+def taping(tape, layer):
+
+    return Taping(tape, layer)
+
+
+
+
+def tape_push(node, layer, op=None, parents=tuple()):
+
+    try:
+       tape = _TAPES[layer]
+    except KeyError:
+       return node
+
+    return tape.push(node, op, parents)
+
+
+
+
+def tape_taint(layer):
+
+    try:
+       tape = _TAPES[layer]
+    except KeyError:
+       return None
 
-       return node(source, layer, flow.gate(self, op))
+    return tape.taint()
 
 
 
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tadpole.util           as util
+import tadpole.autodiff.nary  as nary
+import tadpole.autodiff.node  as an
+import tadpole.autodiff.grad  as ad
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Tracing: records the node tape of a computation graph, and freezes it  ###
+###  into a replayable tape that holds no values.                           ###
+###                                                                         ###
+###  Only differentiable ops are recorded, so a non-differentiable op       ###
+###  (sign, floor, comparisons, ...) applied to a traced node taints the    ###
+###  tape: its output would be replayed as a constant. A tainted trace      ###
+###  is not frozen, and the function is evaluated without a tape.           ###
+###  Structural ops (space, shape, indices, ...) do not taint the tape:     ###
+###  their output is fixed by the input signature.                          ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Record a tape by tracing a function ----------------------------------- #
+
+def trace(fun, x):
+
+    tape       = an.NodeTape()
+    start, end = ad.EvalOp(fun, x).execute(an.GateReverse(), tape)
+    prop       = ad.PropagationTape(start, end, tape, release=True)
+
+    frozen = None
+
+    if end.depends(start) and not tape.tainted:
+       frozen = prop.freeze()
+
+    op  = ad.DifferentialOp(prop)
+    out = op.value()
+
+    return out, op.grad(out.space().ones()), frozen
+
+
+
+
+# --- Replay a frozen tape: evaluate the value and gradient ----------------- #
+
+def replay(tape, x):
+
+    out, tape = tape.replay(x)
+    grads     = ad.backprop(
+                   tape, 0, len(tape) - 1, out.space().ones(), release=True
+                )
+
+    return out, grads.result()
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Compiled function: traces once per input signature, and replays the   ###
+###  recorded tape on subsequent calls.                                     ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Input signature of a compiled function call --------------------------- #
+
+class Signature:
+
+   def __init__(self, space, args, kwargs):
+
+       self._space  = space
+       self._args   = args
+       self._keys   = tuple(kwargs.keys())
+       self._kwargs = tuple(kwargs.values())
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("space",  self._space)
+       rep.ref("args",   self._args)
+       rep.ref("kwargs", self._kwargs)
+
+       return str(rep)
+
+
+   def __eq__(self, other):
+
+       log = util.LogicalChain()
+       log.typ(self, other)
+
+       if bool(log):
+          log.val(self._space,  other._space)
+          log.ref(self._args,   other._args)
+          log.val(self._keys,   other._keys)
+          log.ref(self._kwargs, other._kwargs)
+
+       return bool(log)
+
+
+
+
+# --- Compiled function ----------------------------------------------------- #
+
+class CompiledFun:
+
+   def __init__(self, fun, adx=None, maxsize=8):
+
+       self._fun      = fun
+       self._argproxy = nary.argproxy(adx)
+       self._adx      = adx
+       self._maxsize  = maxsize
+       self._tapes    = []
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("fun",     self._fun)
+       rep.val("adx",     self._adx)
+       rep.val("ntapes",  len(self._tapes))
+       rep.val("maxsize", self._maxsize)
+
+       return str(rep)
+
+
+   def _signature(self, x, args, kwargs):
+
+       blank = self._argproxy.extract(args)
+
+       if isinstance(blank, tuple):
+          blank = (None,) * len(blank)
+       else:
+          blank = None
+
+       args = self._argproxy.insert(args, blank)
+
+       return Signature(x.space(), args, kwargs)
+
+
+   def _lookup(self, signature):
+
+       for k, (sig, tape) in enumerate(self._tapes):
+
+           if sig == signature:
+              self._tapes.append(self._tapes.pop(k))
+              return True, tape
+
+       return False, None
+
+
+   def _trace(self, signature, x, args, kwargs):
+
+       def unary_fun(x):
+           return self._fun(*self._argproxy.insert(args, x), **kwargs)
+
+       out, grad, tape = trace(unary_fun, x)
+
+       self._tapes.append((signature, tape))
+
+       if len(self._tapes) > self._maxsize:
+          self._tapes.pop(0)
+
+       return out, grad
+
+
+   def retrace(self):
+
+       self._tapes = []
+       return self
+
+
+   def __call__(self, *args, **kwargs):
+
+       if any(isinstance(v, an.Node) for v in args):
+          return ad.evaluate_with_gradient(
+                    self._fun, self._adx
+                 )(*args, **kwargs)
+
+       x         = ad.pack(self._argproxy.extract(args))
+       signature = self._signature(x, args, kwargs)
+
+       found, tape = self._lookup(signature)
+
+       if not found:
+          return self._trace(signature, x, args, kwargs)
+
+       if tape is None:
+          return ad.evaluate_with_gradient(
+                    self._fun, self._adx
+                 )(*args, **kwargs)
+
+       return replay(tape, x)
+
+
+
+
+# --- Compile a function (just-in-time) ------------------------------------- #
+
+def jit(fun, adx=None, maxsize=8):
+
+    return CompiledFun(fun, adx, maxsize)
+
+
+
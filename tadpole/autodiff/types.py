@@ -48,6 +48,18 @@ class AdjointOp(abc.ABC):
    def jvp(self, seed):
        pass
 
+   @abc.abstractmethod
+   def prune(self, keep):
+       pass
+
+   @abc.abstractmethod
+   def strip(self):
+       pass
+
+   @abc.abstractmethod
+   def account(self, stats, node):
+       pass
+
 
 
 
@@ -94,6 +106,14 @@ class Gate(abc.ABC):
    def grads(self, node, grads):
        pass
 
+   @abc.abstractmethod
+   def release(self):
+       pass
+
+   @abc.abstractmethod
+   def account(self, node, stats):
+       pass
+
 
 
 
@@ -105,6 +125,10 @@ class Node(abc.ABC):
    def connected(self):
        pass
 
+   @abc.abstractmethod
+   def depends(self, other):
+       pass
+
    @abc.abstractmethod
    def flow(self):
        pass
@@ -121,6 +145,14 @@ class Node(abc.ABC):
    def grads(self, grads):
        pass
 
+   @abc.abstractmethod
+   def release(self):
+       pass
+
+   @abc.abstractmethod
+   def account(self, stats):
+       pass
+
 
 
 
@@ -158,6 +190,10 @@ class DifferentiableFun(abc.ABC):
    def jvp(self, *args, **kwargs):
        pass
 
+   @abc.abstractmethod
+   def evaluate(self, *args, **kwargs):
+       pass
+
 
 
 
@@ -226,6 +262,10 @@ class Pack(abc.ABC):
    def innermost(self):
        pass
 
+   @abc.abstractmethod
+   def layer(self):
+       pass
+
    @abc.abstractmethod
    def deshell(self):
        pass
@@ -249,6 +289,10 @@ class Envelope(abc.ABC):
    def packs(self):
        pass
 
+   @abc.abstractmethod
+   def layers(self):
+       pass
+
    @abc.abstractmethod
    def apply(self, fun):
        pass
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import math
+
 import tadpole.util                as util
 import tadpole.autodiff.nary       as nary
 import tadpole.autodiff.graph      as ag
@@ -92,6 +94,18 @@ def nondifferentiable(fun):
 
 
 
+# --- Structural function wrap (depends on spaces and indices, not values) -- #
+
+def structural(fun):
+
+    def envelope(*args, **kwargs):
+        return ag.EnvelopeArgs(*args, **kwargs)
+
+    return ag.NonDifferentiable(fun, envelope, structural=True)
+
+
+
+
 # --- Checkpointed function wrap -------------------------------------------- #
 
 def checkpoint(fun):
@@ -112,3 +126,144 @@ def checkpoint(fun):
 
 
 
+# --- Binomial (revolve) checkpointing schedule ----------------------------- #
+
+def binomial(snapshots, repeats):
+
+    return math.comb(snapshots + repeats, snapshots)
+
+
+
+
+def revolve_split(nsteps, snapshots):
+
+    repeats = 0
+
+    while binomial(snapshots, repeats) < nsteps:
+       repeats += 1
+
+    return max(1, nsteps - binomial(snapshots - 1, repeats))
+
+
+
+
+class Revolve:
+
+   def __init__(self, step_fun, nsteps, snapshots):
+
+       if nsteps < 0 or snapshots < 1:
+          raise ValueError(
+             f"{type(self).__name__}: the number of steps {nsteps} must be "
+             f"non-negative and the number of snapshots {snapshots} "
+             f"must be positive."
+          )
+
+       self._step_fun  = step_fun
+       self._nsteps    = nsteps
+       self._snapshots = snapshots
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("step_fun",  self._step_fun)
+       rep.val("nsteps",    self._nsteps)
+       rep.val("snapshots", self._snapshots)
+
+       return str(rep)
+
+
+   def advance(self, x, params, nsteps):
+
+       for _ in range(nsteps):
+           x = self._step_fun(x, *params)
+
+       return x
+
+
+   def step(self, g, x, params):
+
+       if not params:
+          return (ad.diffop_reverse(self._step_fun, x).grad(g),)
+
+       def fun(args):
+           return self._step_fun(*args)
+
+       return tuple(ad.diffop_reverse(fun, (x, *params)).grad(g))
+
+
+   def accumulate(self, grads, other):
+
+       return (other[0], *(a + b for a, b in zip(grads[1:], other[1:])))
+
+
+   def reverse(self, g, x, params, nsteps, snapshots):
+
+       if nsteps == 1:
+          return self.step(g, x, params)
+
+       if snapshots == 1:
+
+          grads = self.step(g, self.advance(x, params, nsteps - 1), params)
+
+          for k in reversed(range(nsteps - 1)):
+              grads = self.accumulate(grads,
+                 self.step(grads[0], self.advance(x, params, k), params)
+              )
+
+          return grads
+
+       split = revolve_split(nsteps, snapshots)
+       grads = self.reverse(
+                  g, self.advance(x, params, split),
+                  params, nsteps - split, snapshots - 1
+               )
+
+       return self.accumulate(grads,
+          self.reverse(grads[0], x, params, split, snapshots)
+       )
+
+
+   def __call__(self, x, *params):
+
+       return self.advance(x, params, self._nsteps)
+
+
+   def vjp(self, adxs, out, x, *params):
+
+       def vjpfun(g):
+
+           if self._nsteps == 0:
+              grads = (g, *(p.space().nullgrad() for p in params))
+           else:
+              grads = self.reverse(
+                         g, x, params, self._nsteps, self._snapshots
+                      )
+
+           return (grads[adx] for adx in adxs)
+
+       return vjpfun
+
+
+
+
+# --- Checkpointed loop wrap ------------------------------------------------ #
+
+def checkpoint_loop(step_fun, nsteps, snapshots):
+
+    # The loop carries a single state: step_fun(x, *params) -> x, and the
+    # returned function is called as loop(x, *params). Every variable the
+    # step depends on must be passed in params: gradients with respect to
+    # variables captured by step_fun in a closure are not propagated.
+
+    loop             = Revolve(step_fun, nsteps, snapshots)
+    checkpointed_fun = differentiable(loop)
+
+    makevjp_raw(checkpointed_fun, loop.vjp)
+    return checkpointed_fun
+
+
+
+
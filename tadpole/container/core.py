@@ -102,6 +102,13 @@ class ContainerSpace(util.Container, tn.Space):
        ) 
 
 
+   def dual(self):
+
+       return self._transform(
+          lambda x, i: x.dual()
+       ) 
+
+
    # --- Gradient factories --- #
 
    def sparsegrad(self, pos, vals):
@@ -245,7 +252,7 @@ class NullGrad(Container, tn.Grad):
 
    # --- Grad methods --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
           return self
@@ -295,6 +302,11 @@ class NullGrad(Container, tn.Grad):
        return self.space().fillwith(data)
 
 
+   def buffers(self):
+
+       return tuple()
+
+
    def space(self):
 
        return self._space 
@@ -342,13 +354,10 @@ class SparseGrad(Container, tn.Grad):
 
    # --- Grad methods --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
-          other = self.space().zeros()
-
-       if isinstance(other, self.__class__):
-          other = other.todense()
+          return self
 
        assert self.space() == other.space(), (
           f"{type(self).__name__}.addto: "
@@ -356,13 +365,44 @@ class SparseGrad(Container, tn.Grad):
           f"with non-matching spaces {self.space()} != {other.space()}"
        )
 
+       if isinstance(other, self.__class__):
+          return self.merge(other)
+
        data = put(other._data, self._pos, self._vals, accumulate=True) 
        return type(other)(data)
 
 
+   def merge(self, other):
+
+       out = self.__class__(
+                self._space, 
+                (*other._pos,  *self._pos), 
+                (*other._vals, *self._vals)
+             )
+
+       if len(out._pos) > len(self):
+          return out.coalesce()
+
+       return out
+
+
+   def coalesce(self):
+
+       vals = {}
+
+       for p, v in zip(self._pos, self._vals):
+           vals[p] = v.addto(vals.get(p))
+
+       return self.__class__(
+                 self._space, tuple(vals.keys()), tuple(vals.values())
+              )
+
+
    def todense(self):
 
-       return put(self.space().zeros(), self._pos, self._vals) 
+       grad = self.coalesce()
+
+       return put(self.space().zeros(), grad._pos, grad._vals) 
 
 
    def tonull(self):
@@ -404,6 +444,11 @@ class SparseGrad(Container, tn.Grad):
        return self.space().fillwith(data)
 
 
+   def buffers(self):
+
+       return tuple(util.concat(v.buffers() for v in self._vals))
+
+
    def space(self):
 
        return self._space 
@@ -497,7 +542,7 @@ class ContainerGen(Container, tn.Grad):
 
    # --- Grad methods --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
           return self
@@ -550,6 +595,11 @@ class ContainerGen(Container, tn.Grad):
        return self.space().fillwith(data)
 
 
+   def buffers(self):
+
+       return tuple(util.concat(x.buffers() for x in self._data))
+
+
    def space(self):
 
        return ContainerSpace(tuple(x.space() for x in self._data))
@@ -606,7 +656,7 @@ def todense(x):
     return x.todense()
 
 
-@ad.nondifferentiable
+@ad.structural
 def tonull(x):
 
     return x.tonull()
@@ -628,13 +678,13 @@ def copy(x, **opts):
     return x.copy(**opts)
 
 
-@ad.nondifferentiable
+@ad.structural
 def withdata(x, data):
 
     return x.withdata(data) 
 
 
-@ad.nondifferentiable
+@ad.structural
 def space(x):
 
     return x.space()
@@ -646,7 +696,7 @@ def item(x, pos=None):
     return x.item(pos)
 
 
-@ad.nondifferentiable
+@ad.structural
 def size(x):
 
     return len(x)
@@ -10,9 +10,15 @@ from .types import (
 from .index import (
    IndexGen,
    IndexLit,
+   IndexBatch,
+   IndexTangent,
    Indices,
    shapeof,
    sizeof,
+   isbatch,
+   batchinds,
+   istangent,
+   tangentinds,
 )
 
 
@@ -138,6 +138,24 @@ class IndexLit(IndexGen):
 
 
 
+# --- Batch Index ----------------------------------------------------------- #
+
+class IndexBatch(IndexGen): 
+
+   pass
+
+
+
+
+# --- Tangent Index (a batch of tangent seeds) ------------------------------ #
+
+class IndexTangent(IndexBatch): 
+
+   pass
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Collection of tensor indices with extra functionality                  ###
@@ -321,6 +339,31 @@ class Indices(util.Container):
 
 # --- Basic index info ------------------------------------------------------ #
 
+def isbatch(ind):
+
+    return isinstance(ind, IndexBatch)
+
+
+
+def batchinds(*inds):
+
+    return tuple(ind for ind in inds if isbatch(ind))
+
+
+
+def istangent(ind):
+
+    return isinstance(ind, IndexTangent)
+
+
+
+def tangentinds(*inds):
+
+    return tuple(ind for ind in inds if istangent(ind))
+
+
+
+
 def shapeof(*inds):
 
     return Indices(*inds).shape
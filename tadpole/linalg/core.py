@@ -35,6 +35,7 @@ def aligned(fun):
     def wrap(x, *args, linds=None, rinds=None, **kwargs):
       
         inds = Indices(*tn.union_inds(x))
+        inds = inds.remove(*tid.batchinds(*inds))
 
         if linds is not None:
 
@@ -80,9 +81,10 @@ class DecompOp:
 
    def reshape(self, x):
 
-       x = tn.fuse(x, {self._linds: "l", self._rinds: "r"})
+       batch = tid.batchinds(*tn.union_inds(x))
+       x     = tn.fuse(x, {self._linds: "l", self._rinds: "r"})
 
-       return tn.transpose(x, "l", "r")
+       return tn.transpose(x, *batch, "l", "r")
 
 
    def apply(self, x, *args, **kwargs):
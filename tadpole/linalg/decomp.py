@@ -149,32 +149,42 @@ class LinalgDecomp:
 
    def __init__(self, data, inds, sind):
 
-       if inds.ndim != 2:
+       batch = tid.batchinds(*inds)
+
+       if inds.ndim - len(batch) != 2 or inds[:len(batch)] != batch:
           raise ValueError(
-             f"LinalgDecomp: input must have ndim = 2, "
-             f"but data.ndim = {data.ndim}, inds.ndim = {inds.ndim}."
+             f"LinalgDecomp: input must have ndim = 2 (excluding any "
+             f"leading batch indices), but data.ndim = {data.ndim}, "
+             f"inds.ndim = {inds.ndim}, batch indices = {batch}."
           )
 
-       self._data = data
-       self._inds = inds
-       self._sind = sind
+       self._data  = data
+       self._inds  = inds
+       self._sind  = sind
+       self._batch = batch
 
 
    # --- Private helpers --- #
 
    def _ltensor(self, data):
 
-       return tn.TensorGen(data, (self._inds[0], self._sind(data.shape[1])))  
+       return tn.TensorGen(
+          data, (*self._batch, self._inds[-2], self._sind(data.shape[-1]))
+       )  
 
 
    def _stensor(self, data):
 
-       return tn.TensorGen(data, (self._sind(data.shape[0]), ))  
+       return tn.TensorGen(
+          data, (*self._batch, self._sind(data.shape[-1]))
+       )  
 
 
    def _rtensor(self, data):
 
-       return tn.TensorGen(data, (self._sind(data.shape[0]), self._inds[1]))  
+       return tn.TensorGen(
+          data, (*self._batch, self._sind(data.shape[-2]), self._inds[-1])
+       )  
 
 
    def _explicit(self, fun, trunc):
@@ -218,6 +228,12 @@ class LinalgDecomp:
        if trunc is None:
           trunc = TruncNull()
 
+       if self._batch and not isinstance(trunc, TruncNull):
+          raise ValueError(
+             f"LinalgDecomp.svd: truncation is not supported for "
+             f"batched input with batch indices {self._batch}."
+          )
+
        return self._explicit(ar.svd, trunc)
 
 
@@ -227,6 +227,51 @@ from .contraction import (
    dot,
    kron,
    trace,
+   untrace,
+)
+
+
+from .contraction import (
+   contract_cache_info,
+   contract_cache_clear,
+)
+
+
+from .contraction import (
+   plan,
+   contract_cost,
+)
+
+
+
+
+# --- Batching -------------------------------------------------------------- #
+
+from .batching import (
+   vmap,
+   jacobian,
+)
+
+
+
+
+# --- Lazy mode ------------------------------------------------------------ #
+
+from .deferred import (
+   LazyTensor,
+   lazy,
+)
+
+
+
+
+# --- Planning -------------------------------------------------------------- #
+
+from .planning import (
+   ContractionPlan,
+   ContractionCost,
+   MemoryBudgetError,
+   register_optimizer,
 )
 
 
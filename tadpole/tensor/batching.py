@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import tadpole.util          as util
+import tadpole.autodiff.nary as nary
+import tadpole.autodiff.grad as agrad
+
+import tadpole.tensor.interaction as tni
+import tadpole.tensor.reindexing  as reidx
+
+
+from tadpole.tensor.types import (
+   Tensor,
+)
+
+
+from tadpole.index import (
+   Index,
+   IndexGen,
+   IndexBatch,
+   IndexTangent,
+   Indices,
+   sizeof,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Vectorizing map: replaces the mapped index of each input with a        ###
+###  shared batch index, which all tensor engines carry through as-is.      ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Mapped index of an input tensor --------------------------------------- #
+
+def mapped_ind(x, axis):
+
+    if axis is None:
+       return None
+
+    inds = Indices(*tni.union_inds(x))
+
+    if isinstance(axis, int):
+       return inds[axis]
+
+    if isinstance(axis, Index):
+       return axis
+
+    ind, = inds.map(axis)
+    return ind
+
+
+
+
+# --- Batch and unbatch a tensor -------------------------------------------- #
+
+def batch(x, ind, batchind):
+
+    x    = reidx.reindex(x, {ind: batchind})
+    inds = tuple(tni.union_inds(x))
+
+    return reidx.transpose(x, batchind, *(i for i in inds if i != batchind))
+
+
+
+def unbatch(x, batchind, ind):
+
+    if batchind not in tni.union_inds(x):
+       x = reidx.expand(x, (batchind,))
+
+    return reidx.reindex(x, {batchind: ind})
+
+
+
+
+# --- Vectorizing map ------------------------------------------------------- #
+
+class Vmap:
+
+   def __init__(self, fun, in_axes=0):
+
+       self._fun     = fun
+       self._in_axes = in_axes
+
+
+   def _axes(self, args):
+
+       if isinstance(self._in_axes, (tuple, list)):
+          return self._in_axes
+
+       return (self._in_axes,) * len(args)
+
+
+   def __call__(self, *args):
+
+       inds = [
+          mapped_ind(x, axis) for x, axis in zip(args, self._axes(args))
+       ]
+
+       mapped = [ind for ind in inds if ind is not None]
+       sizes  = util.unique(map(len, mapped))
+
+       if len(sizes) != 1:
+          raise ValueError(
+             f"{type(self).__name__}: mapped indices {mapped} must all "
+             f"have the same size, but have sizes {sizes}."
+          )
+
+       batchind = IndexBatch("batch", sizes[0])
+
+       out = self._fun(*(
+          x if ind is None else batch(x, ind, batchind)
+             for x, ind in zip(args, inds)
+       ))
+
+       if isinstance(out, Tensor):
+          return unbatch(out, batchind, mapped[0])
+
+       return tuple(unbatch(y, batchind, mapped[0]) for y in out)
+
+
+
+
+def vmap(fun, in_axes=0):
+
+    return Vmap(fun, in_axes)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Jacobian: a batch of unit seeds, stacked along a batch index and       ###
+###  propagated through the graph in a single forward or reverse sweep.     ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Unit seeds stacked along a batch index -------------------------------- #
+
+def unit_seeds(x, inds, batchind):
+
+    fused = IndexGen("fused", sizeof(*inds))
+    eye   = x.space().reshape((fused, batchind)).eye()
+
+    return reidx.split(eye, {fused: inds})
+
+
+
+
+# --- Jacobian modes -------------------------------------------------------- #
+
+def jacobian_forward(fun, x, inds):
+
+    op = agrad.diffop_forward(fun, x)
+
+    xinds    = tuple(tni.union_inds(x))
+    yinds    = tuple(tni.union_inds(op.value()))
+    batchind = IndexTangent("tangent", sizeof(*xinds))
+
+    out = op.grad(unit_seeds(x, xinds, batchind))
+    out = reidx.split(out, {batchind: inds})
+
+    return reidx.transpose(out, *yinds, *inds)
+
+
+
+
+def jacobian_reverse(fun, x, inds, op=None):
+
+    if op is None:
+       op = agrad.diffop_reverse(fun, x)
+
+    y = op.value()
+
+    xinds    = tuple(tni.union_inds(x))
+    yinds    = tuple(tni.union_inds(y))
+    batchind = IndexTangent("tangent", sizeof(*yinds))
+
+    out = op.grad(unit_seeds(y, yinds, batchind))
+    out = reidx.reindex(out, dict(zip(xinds, inds)))
+    out = reidx.split(out, {batchind: yinds})
+
+    return reidx.transpose(out, *yinds, *inds)
+
+
+
+
+# --- Jacobian -------------------------------------------------------------- #
+
+@nary.nary_op
+def jacobian(fun, x, inds=None, mode=None):
+
+    if inds is None:
+       inds = tuple(x.space().dual().inds)
+
+    if mode == "forward":
+       return jacobian_forward(fun, x, inds)
+
+    if mode == "reverse":
+       return jacobian_reverse(fun, x, inds)
+
+    if mode is not None:
+       raise ValueError(
+          f"jacobian: invalid mode {mode}, must be one of "
+          f"None, 'forward', 'reverse'."
+       )
+
+    op = agrad.diffop_reverse(fun, x)
+
+    if x.size < op.value().size:
+       return jacobian_forward(fun, x, inds)
+
+    return jacobian_reverse(fun, x, inds, op)
+
+
+
+
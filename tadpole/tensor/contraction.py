@@ -14,6 +14,8 @@ import tadpole.index    as tid
 import tadpole.tensor.core        as core
 import tadpole.tensor.interaction as tni
 import tadpole.tensor.reindexing  as reidx
+import tadpole.tensor.planning    as planning
+import tadpole.tensor.execution   as execution
 
 
 from tadpole.tensor.types import (
@@ -28,10 +30,17 @@ from tadpole.tensor.engine import (
 )
 
 
+from tadpole.array import (
+   MAX_SYMBOLS,
+)
+
+
 from tadpole.index import (
    Index,
    IndexGen,  
    Indices,
+   isbatch,
+   batchinds,
 )
 
 
@@ -122,6 +131,72 @@ def make_equation(input_inds, output_inds):
 
 
 
+# --- Create integer sublists from input and output indices ----------------- #
+
+@lru_cache_indices(2**12)
+def make_sublists(input_inds, output_inds):
+
+    symbols = Symbols(int)
+
+    def tosublist(inds):
+        return tuple(map(symbols.next, inds))
+
+    inputs = tuple(tosublist(inds) for inds in input_inds)
+    output = tosublist(output_inds)
+
+    return inputs, output
+
+
+
+
+# --- Create einsum equation, switching to sublists for many symbols ------- #
+
+@lru_cache_indices(2**12)
+def contraction_equation(input_inds, output_inds):
+
+    if len(util.unique(util.concat(input_inds))) > MAX_SYMBOLS:
+       return make_sublists(input_inds, output_inds)
+
+    return make_equation(input_inds, output_inds)
+
+
+
+
+# --- Create tensordot pattern from input and output indices --------------- #
+
+@lru_cache_indices(2**12)
+def make_pairwise(input_inds, output_inds):
+
+    if len(input_inds) != 2:
+       return None
+
+    xinds, yinds = map(tuple, input_inds)
+
+    for inds in (xinds, yinds):
+        if len(util.unique(inds)) != len(inds):
+           return None
+
+    shared = tuple(ind for ind in xinds if ind in yinds)
+    free   = tuple(ind for ind in xinds + yinds if ind not in shared)
+
+    if any(ind in output_inds for ind in shared):
+       return None
+
+    if len(output_inds) != len(free) \
+       or any(ind not in free for ind in output_inds):
+       return None
+
+    axes = (
+       tuple(map(xinds.index, shared)), 
+       tuple(map(yinds.index, shared)),
+    )
+    perm = tuple(map(free.index, output_inds))
+
+    return axes, perm
+
+
+
+
 # --- Fixed index product --------------------------------------------------- #
 
 class IndexProductFixed(IndexProduct):
@@ -146,8 +221,13 @@ class IndexProductPairwise(IndexProduct):
 
    def __call__(self, inds):
 
+       yield from util.unique(batchinds(*util.concat(inds)))
+
        for ind, freq in util.frequencies(util.concat(inds)).items():
 
+           if isbatch(ind):
+              continue
+
            if freq > 2:
               raise ValueError(
                  f"{type(self).__name__}: "
@@ -178,6 +258,21 @@ class IndexProductTrace(IndexProduct):
 
 
 
+# --- Create an index product ---------------------------------------------- #
+
+def index_product(product=None):
+
+    if product is None:
+       return IndexProductPairwise()
+
+    if not isinstance(product, IndexProduct): 
+       return IndexProductFixed(product)
+
+    return product
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Tensor contraction engine                                              ###
@@ -187,12 +282,12 @@ class IndexProductTrace(IndexProduct):
 
 # --- Tensor contraction factory -------------------------------------------- #
 
-def tensor_contract(*xs, product=None):
-
-    if product is not None and not isinstance(product, IndexProduct): 
-       product = IndexProductFixed(product)
+def tensor_contract(*xs, product=None, plan=None, max_memory=None, 
+                         executor=None):
 
-    engine = EngineContract(product)
+    product = index_product(product)
+    plan    = planning.contraction_plan(plan, max_memory)
+    engine  = EngineContract(product, plan=plan, executor=executor)
 
     for x in xs:
         engine = x.pluginto(engine)
@@ -206,7 +301,7 @@ def tensor_contract(*xs, product=None):
 
 class EngineContract(Engine): 
 
-   def __init__(self, product=None, train=None):
+   def __init__(self, product=None, train=None, plan=None, executor=None):
 
        if product is None:
           product = IndexProductPairwise()
@@ -214,8 +309,10 @@ class EngineContract(Engine):
        if train is None:
           train = TrainTensorData()
 
-       self._product = product
-       self._train   = train
+       self._product  = product
+       self._train    = train
+       self._plan     = planning.contraction_plan(plan)
+       self._executor = execution.slice_executor(executor)
 
 
    def __eq__(self, other):
@@ -226,13 +323,20 @@ class EngineContract(Engine):
        if bool(log):
           log.val(self._product, other._product)
           log.val(self._train,   other._train)
+          log.val(self._plan,    other._plan)
+          log.val(self._executor, other._executor)
 
        return bool(log)
 
 
    def attach(self, data, inds):
 
-       return self.__class__(self._product, self._train.attach(data, inds))
+       return self.__class__(
+                 self._product, 
+                 self._train.attach(data, inds), 
+                 self._plan, 
+                 self._executor
+              )
 
 
    def operator(self):
@@ -240,7 +344,9 @@ class EngineContract(Engine):
        return TensorContract(
                  tuple(self._train.data()), 
                  tuple(self._train.inds()), 
-                 self._product
+                 self._product,
+                 self._plan,
+                 self._executor
               )
 
 
@@ -308,18 +414,20 @@ class TensorContract:
 
    # --- Construction --- #
 
-   def __init__(self, data, inds, product): 
+   def __init__(self, data, inds, product, plan=None, executor=None): 
 
-       self._data    = data
-       self._inds    = inds
-       self._product = product
+       self._data     = data
+       self._inds     = inds
+       self._product  = product
+       self._plan     = planning.contraction_plan(plan)
+       self._executor = execution.slice_executor(executor)
 
 
    # --- Private helpers --- #
 
    def _equation(self):
 
-       return make_equation(self._inds, self._output_inds())
+       return contraction_equation(self._inds, self._output_inds())
 
 
    def _output_inds(self):
@@ -332,15 +440,130 @@ class TensorContract:
        return core.TensorGen(data, Indices(*self._output_inds()))
 
 
+   def _itemsize(self):
+
+       return max(planning.itemsize(x.dtype) for x in self._data)
+
+
+   def _pairwise(self):
+
+       if self._plan.max_memory is not None:
+          return None
+
+       return make_pairwise(self._inds, self._output_inds())
+
+
+   def _schedule(self):
+
+       return self._plan.schedule(
+                 self._equation(), 
+                 self._inds, 
+                 self._output_inds(), 
+                 self._itemsize()
+              )
+
+
+   def _window(self, posmap):
+
+       def window(ind):
+
+           if ind in posmap:
+              return slice(posmap[ind], posmap[ind] + 1)
+
+           return slice(None)
+
+       return tuple(tuple(map(window, inds)) for inds in self._inds)
+
+
+   def _slices(self, sliced):
+
+       if not sliced:
+          yield {}
+          return
+
+       for pos in itertools.product(*(range(len(ind)) for ind in sliced)):
+           yield dict(zip(sliced, pos))
+
+
+   def _windows(self, outerpos, inner):
+
+       return [
+          self._window({**outerpos, **innerpos})
+             for innerpos in self._slices(inner)
+       ]
+
+
+   def _assemble(self, blocks, outer):
+
+       if not outer:
+          return blocks[0]
+
+       output = self._output_inds()
+       shape  = tuple(map(len, output))
+       out    = blocks[0].space().reshape(shape).zeros()
+
+       for posmap, block in zip(self._slices(outer), blocks):
+
+           window = tuple(
+              slice(posmap[ind], posmap[ind] + 1) if ind in posmap 
+                 else slice(None) for ind in output
+           )
+           ar.iadd(out[window], block)
+
+       return out
+
+
    # --- Main methods --- #
 
-   def contract(self):
+   def plan(self):
+
+       return self._plan.bind(
+                 self._equation(), 
+                 self._inds, 
+                 self._output_inds(), 
+                 self._itemsize()
+              )
+
 
-       data = ar.einsum(self._equation(), *self._data, optimize=True)
+   def tensordot(self, axes, perm):
+
+       data = ar.tensordot(*self._data, axes)
+
+       if perm != tuple(range(len(perm))):
+          data = ar.transpose(data, perm)
 
        return self._output_tensor(data)
 
 
+   def einsum(self):
+
+       equation     = self._equation()
+       sliced, path = self._schedule()
+
+       output = self._output_inds()
+       outer  = tuple(ind for ind in sliced if ind in output)
+       inner  = tuple(ind for ind in sliced if ind not in output)
+
+       blocks = self._executor.run(
+                   equation, 
+                   path, 
+                   self._data, 
+                   [self._windows(pos, inner) for pos in self._slices(outer)]
+                )
+
+       return self._output_tensor(self._assemble(blocks, outer))
+
+
+   def contract(self):
+
+       pairwise = self._pairwise()
+
+       if pairwise is not None:
+          return self.tensordot(*pairwise)
+
+       return self.einsum()
+
+
    def dot(self):
 
        data = ar.dot(*self._data)
@@ -348,6 +571,60 @@ class TensorContract:
        return self._output_tensor(data)
 
 
+   # --- Trace and its adjoint --- #
+
+   def _traced(self, inds, i=0):
+
+       xinds  = Indices(*self._inds[i])
+       traced = xinds.map(*inds)
+
+       return xinds, traced, xinds.axes(*traced), min(map(len, traced))
+
+
+   def trace(self, inds):
+
+       x = self._data[0]
+       xinds, traced, axes, size = self._traced(inds)
+
+       if len(traced) < 2:
+          return core.TensorGen(x, xinds)
+
+       if any(len(ind) != size for ind in traced):
+          x = x[tuple(
+                 slice(0, size) if axis in axes else slice(None) 
+                    for axis in range(len(xinds))
+              )]
+
+       sublist = tuple(
+          0 if ind in traced else i + 1 for i, ind in enumerate(xinds)
+       )
+       output  = tuple(s for s in sublist if s != 0)
+
+       data = ar.einsum(((sublist,), output), x)
+
+       return core.TensorGen(data, xinds.remove(*traced))
+
+
+   def untrace(self, inds):
+
+       x, target = self._data
+       xinds     = Indices(*self._inds[0])
+
+       tinds, traced, axes, size = self._traced(inds, 1)
+
+       if len(traced) < 2:
+          return core.TensorGen(x, xinds)
+
+       front = tuple(range(len(axes)))
+       vals  = ar.transpose(x, xinds.axes(*tinds.remove(*traced)))
+
+       data = ar.moveaxis(target, axes, front)
+       data = ar.put(data, (list(range(size)),) * len(axes), vals)
+       data = ar.moveaxis(data, front, axes)
+
+       return core.TensorGen(data, tinds)
+
+
 
 
 ###############################################################################
@@ -360,15 +637,79 @@ class TensorContract:
 # --- Contraction ----------------------------------------------------------- #
 
 @ad.differentiable
-def contract(*xs, product=None):
+def contract(*xs, product=None, plan=None, max_memory=None, executor=None):
 
-    op = tensor_contract(*xs, product=product)
+    op = tensor_contract(
+            *xs, 
+            product=product, 
+            plan=plan, 
+            max_memory=max_memory, 
+            executor=executor
+         )
 
     return op.contract() 
 
 
 
 
+# --- Contraction plan ------------------------------------------------------ #
+
+@ad.structural
+def plan(*xs, product=None, optimizer=None, max_memory=None):
+
+    op = tensor_contract(
+            *xs, product=product, plan=optimizer, max_memory=max_memory
+         )
+
+    return op.plan()
+
+
+
+
+# --- Contraction cost (computed from indices, without touching the data) -- #
+
+@ad.structural
+def contract_cost(*xs, product=None, optimizer=None, max_memory=None, 
+                       dtype=None):
+
+    def isinds(x):
+        return isinstance(x, (Indices, tuple, list))
+
+    input_inds = tuple(
+       tuple(x) if isinds(x) else tuple(tni.union_inds(x)) for x in xs
+    )
+
+    if dtype is None:
+       dtypes = [x.dtype for x in xs if not isinds(x)] or ["float64"]
+    else:
+       dtypes = [dtype]
+
+    itemsize    = max(map(planning.itemsize, dtypes))
+    output_inds = tuple(index_product(product)(input_inds))
+    equation    = contraction_equation(input_inds, output_inds)
+
+    plan = planning.contraction_plan(optimizer, max_memory)
+    plan = plan.bind(equation, input_inds, output_inds, itemsize)
+
+    return plan.cost()
+
+
+
+
+# --- Contraction cache statistics ------------------------------------------ #
+
+def contract_cache_info():
+
+    return ar.contract_cache_info()
+
+
+def contract_cache_clear():
+
+    return ar.contract_cache_clear()
+
+
+
+
 # --- Dot product ----------------------------------------------------------- #
 
 def dot(x, y):
@@ -389,12 +730,24 @@ def kron(x, y, kronmap):
 
 # --- Trace ----------------------------------------------------------------- #
 
+@ad.differentiable
 def trace(x, inds):
 
-    lind, rinds = inds[0], inds[1:]
-    eyes        = (core.space(x).eye(lind, rind) for rind in rinds)
+    op = tensor_contract(x)
+
+    return op.trace(inds)
+
+
+
+
+# --- Adjoint of trace: embeds x into the diagonal of a tensor in space ----- #
+
+@ad.differentiable
+def untrace(x, inds, space):
+
+    op = tensor_contract(x, space.zeros())
 
-    return contract(x, *eyes, product=IndexProductTrace())
+    return op.untrace(inds)
 
 
 
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 import tadpole.util     as util
 import tadpole.autodiff as ad
 import tadpole.array    as ar
@@ -8,6 +10,7 @@ import tadpole.index    as tid
 
 import tadpole.tensor.space           as sp
 import tadpole.tensor.contraction     as contraction
+import tadpole.tensor.deferred        as deferred
 import tadpole.tensor.reindexing      as reidx
 import tadpole.tensor.elemwise_unary  as unary
 import tadpole.tensor.elemwise_binary as binary
@@ -57,7 +60,7 @@ class NullGrad(Tensor, Grad, Pluggable):
 
    # --- Gradient operations --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
           return self
@@ -87,6 +90,11 @@ class NullGrad(Tensor, Grad, Pluggable):
        return self.space().fillwith(data) 
 
 
+   def buffers(self):
+
+       return tuple()
+
+
    def space(self):
 
        return self._space
@@ -261,6 +269,55 @@ class NullGrad(Tensor, Grad, Pluggable):
 
 
 
+# --- Helpers: flat coordinates of sparse gradient entries ------------------ #
+
+def strides(shape):
+
+    out = [1] * len(shape)
+
+    for i in reversed(range(len(shape) - 1)):
+        out[i] = out[i+1] * shape[i+1]
+
+    return tuple(out)
+
+
+
+
+def isgrid(pos):
+
+    return all(isinstance(p, ar.Array) for p in pos)
+
+
+
+
+def flatpos(pos, vals, shape):
+
+    lead  = ar.shape(pos[0])
+    trail = tuple(shape[len(pos):])
+    full  = (*lead, *trail)
+
+    pos = [
+       ar.broadcast_to(ar.reshape(p, (*lead, *(1,)*len(trail))), full) 
+          for p in pos
+    ]
+
+    for k, size in enumerate(trail):
+
+        axis = [1] * len(full)
+        axis[len(lead) + k] = size
+
+        pos.append(ar.broadcast_to(
+           ar.reshape(ar.asarray(np.arange(size)), tuple(axis)), full
+        ))
+
+    pos  = tuple(ar.reshape(p, (-1,)) for p in pos)
+    vals = ar.reshape(ar.broadcast_to(vals, full), (-1,))
+
+    return pos, vals
+
+
+
+
 # --- Sparse gradient ------------------------------------------------------- #
 
 class SparseGrad(Tensor, Grad, Pluggable):
@@ -283,13 +340,10 @@ class SparseGrad(Tensor, Grad, Pluggable):
 
    # --- Gradient operations --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
-          other = self.space().zeros()
-
-       if isinstance(other, SparseGrad):
-          other = other.todense()
+          return self
 
        assert self.space() == other.space(), (
           f"{type(self).__name__}.addto: "
@@ -297,16 +351,69 @@ class SparseGrad(Tensor, Grad, Pluggable):
           f"with non-matching spaces {self.space()} != {other.space()}"
        )
 
+       if isinstance(other, SparseGrad):
+
+          # Only index-grid positions (as built by getitem) are merged
+          # sparsely, other positions (e.g. slices) are not expanded and
+          # make the sum dense.
+          if isgrid(self._pos) and isgrid(other._pos):
+             return self.merge(other)
+
+          other = other.todense()
+
        data = ar.put(other._data, self._pos, self._vals, accumulate=True)
        return other.withdata(data)
 
 
+   def merge(self, other):
+
+       pos,  vals  = flatpos(self._pos,  self._vals,  self.shape)
+       opos, ovals = flatpos(other._pos, other._vals, self.shape)
+
+       pos  = tuple(ar.concat((x, y)) for x, y in zip(opos, pos))
+       vals = ar.concat((ovals, vals))
+
+       out = self.__class__(self._space, pos, vals)
+
+       if out.nnz > self.size:
+          return out.coalesce()
+
+       return out
+
+
+   def coalesce(self):
+
+       pos, vals = flatpos(self._pos, self._vals, self.shape)
+       keys      = 0
+
+       for x, stride in zip(pos, strides(self.shape)):
+           keys = ar.add(keys, ar.mul(x, stride))
+
+       keys, inverse = ar.unique(keys)
+
+       zeros = self._space.reshape((IndexGen("nnz", ar.size(keys)),)).zeros()
+       vals  = ar.put(zeros._data, (inverse,), vals, accumulate=True)
+
+       pos = tuple(
+          ar.mod(ar.floordiv(keys, stride), size) 
+             for stride, size in zip(strides(self.shape), self.shape)
+       )
+
+       return self.__class__(self._space, pos, vals)
+
+
    def todense(self):
 
        zeros = self.space().zeros()
        op    = unary.tensor_elemwise_unary(zeros)
 
-       return op.put(self._pos, self._vals)
+       return op.put(self._pos, self._vals, accumulate=True)
+
+
+   @property
+   def nnz(self):
+
+       return ar.size(self._pos[0])
 
 
    def tonull(self):
@@ -326,6 +433,14 @@ class SparseGrad(Tensor, Grad, Pluggable):
        return self.space().fillwith(data)
 
 
+   def buffers(self):
+
+       if isinstance(self._vals, ar.Array):
+          return self._vals.buffers()
+
+       return tuple()
+
+
    def space(self):
 
        return self._space
@@ -550,10 +665,10 @@ class TensorGen(Tensor, Grad, Pluggable):
 
    # --- Gradient operations --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
-          return self
+          return self.copy() if inplace else self
 
        if isinstance(other, SparseGrad):
           return other.addto(self)
@@ -564,6 +679,10 @@ class TensorGen(Tensor, Grad, Pluggable):
           f"with non-matching indices {self._inds} != {other._inds}"
        )
 
+       if inplace and self.dtype == other.dtype:
+          ar.iadd(other._data, self._data)
+          return other
+
        data = ar.add(self._data, other._data)
        return other.withdata(data)
 
@@ -592,6 +711,11 @@ class TensorGen(Tensor, Grad, Pluggable):
        return self.space().fillwith(data)
 
 
+   def buffers(self):
+
+       return self._data.buffers()
+
+
    def space(self):
 
        return sp.TensorSpace(self._data.space(), self._inds) 
@@ -612,6 +736,10 @@ class TensorGen(Tensor, Grad, Pluggable):
    def size(self):
        return self._data.size
 
+   @property 
+   def nbytes(self):
+       return self._data.nbytes
+
    @property 
    def ndim(self):
        return self._data.ndim  
@@ -708,6 +836,9 @@ class TensorGen(Tensor, Grad, Pluggable):
 
    def __matmul__(self, other):
 
+       if deferred.active():
+          return deferred.matmul(self, other)
+
        return contraction.contract(self, other)
 
 
@@ -750,6 +881,9 @@ class TensorGen(Tensor, Grad, Pluggable):
 
    def __rmatmul__(self, other):
 
+       if deferred.active():
+          return deferred.matmul(other, self)
+
        return contraction.contract(other, self)
 
 
@@ -776,19 +910,19 @@ def todense(x):
     return x.todense()
 
 
-@ad.nondifferentiable
+@ad.structural
 def tonull(x):
 
     return x.tonull()
 
 
-@ad.nondifferentiable
+@ad.structural
 def withdata(x, data):
 
     return x.withdata(data)
 
 
-@ad.nondifferentiable
+@ad.structural
 def space(x):
 
     return x.space()
@@ -804,25 +938,25 @@ def item(x, *pos):
 
 # --- Tensor properties ----------------------------------------------------- #
 
-@ad.nondifferentiable
+@ad.structural
 def dtype(x):
 
     return x.dtype
 
 
-@ad.nondifferentiable
+@ad.structural
 def size(x):
 
     return x.size
 
 
-@ad.nondifferentiable
+@ad.structural
 def ndim(x):
 
     return x.ndim
 
 
-@ad.nondifferentiable
+@ad.structural
 def shape(x):
 
     return x.shape
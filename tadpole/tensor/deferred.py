@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import abc
+import numbers
+
+import tadpole.util as util
+
+import tadpole.tensor.core            as core
+import tadpole.tensor.contraction     as contraction
+import tadpole.tensor.interaction     as tni
+import tadpole.tensor.reindexing      as reidx
+import tadpole.tensor.elemwise_unary  as unary
+import tadpole.tensor.elemwise_binary as binary
+
+
+from tadpole.tensor.types import (
+   Tensor,
+   Pluggable,
+)
+
+
+from tadpole.index import (
+   isbatch,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Lazy mode: while active, tensor products and elementwise operations    ###
+###  build a DAG of deferred nodes instead of being executed eagerly.       ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Lazy mode context ----------------------------------------------------- #
+
+class Lazy:
+
+   _registries = []
+
+
+   def __enter__(self):
+
+       type(self)._registries.append({})
+       return self
+
+
+   def __exit__(self, exception_type, exception_val, trace):
+
+       type(self)._registries.pop()
+
+
+
+
+# --- Lazy mode access ports ------------------------------------------------ #
+
+def lazy():
+
+    return Lazy()
+
+
+def active():
+
+    return bool(Lazy._registries)
+
+
+def registry():
+
+    return Lazy._registries[-1]
+
+
+
+
+# --- Create a deferred node or reuse an identical existing one ------------- #
+
+def deferred_node(key, factory):
+
+    nodes = registry()
+
+    if key not in nodes:
+       nodes[key] = factory()
+
+    return nodes[key]
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Nodes of a deferred computation                                        ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Deferred node --------------------------------------------------------- #
+
+class DeferredNode(abc.ABC):
+
+   def __init__(self, children=tuple()):
+
+       self._children = children
+       self._users    = 0
+       self._handles  = 0
+       self._value    = None
+
+       for child in children:
+           child._users += 1
+
+
+   @abc.abstractmethod
+   def _compute(self):
+       pass
+
+
+   def evaluated(self):
+
+       return self._value is not None
+
+
+   def shared(self):
+
+       return self._users > 1 or self._handles > 0
+
+
+   def evaluate(self):
+
+       if self._value is None:
+          self._value = self._compute()
+
+       return self._value
+
+
+
+
+# --- Leaf node (wraps a concrete tensor or a scalar) ----------------------- #
+
+class DeferredLeaf(DeferredNode):
+
+   def __init__(self, value):
+
+       super().__init__()
+       self._value = value
+
+
+   def _compute(self):
+
+       return self._value
+
+
+
+
+# --- Contraction node ------------------------------------------------------ #
+
+class DeferredContract(DeferredNode):
+
+   def _operands(self):
+
+       operands = []
+
+       for child in self._children:
+
+           if  isinstance(child, DeferredContract) \
+           and not child.shared() and not child.evaluated():
+               operands.extend(child._operands())
+           else:
+               operands.append(child)
+
+       return operands
+
+
+   def _compute(self):
+
+       operands = self._operands()
+       values   = [x.evaluate() for x in operands]
+
+       inds  = [tuple(tni.union_inds(x)) for x in values]
+       freqs = util.frequencies(util.concat(inds))
+
+       if any(freq > 2 for ind, freq in freqs.items() if not isbatch(ind)):
+          values = [x.evaluate() for x in self._children]
+
+       return contraction.contract(*values)
+
+
+
+
+# --- Elementwise node ------------------------------------------------------ #
+
+class DeferredElemwise(DeferredNode):
+
+   def __init__(self, fun, children):
+
+       super().__init__(children)
+       self._fun = fun
+
+
+   def _compute(self):
+
+       return self._fun(*(x.evaluate() for x in self._children))
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Deferred operations                                                    ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Helpers: node of an operand, forcing the evaluation of an operand ----- #
+
+def node(x):
+
+    if isinstance(x, LazyTensor):
+       return x._node
+
+    if isinstance(x, numbers.Number):
+       return deferred_node(
+                 ("const", type(x), x), lambda: DeferredLeaf(x)
+              )
+
+    return deferred_node(
+              ("leaf", id(x)), lambda: DeferredLeaf(x)
+           )
+
+
+def force(x):
+
+    if isinstance(x, LazyTensor):
+       return x.force()
+
+    return x
+
+
+
+
+# --- Check if operands can participate in a deferred computation ----------- #
+
+def deferrable(*xs, scalars=False):
+
+    if not active():
+       return False
+
+    types = (core.TensorGen, LazyTensor)
+
+    if scalars:
+       types = (*types, numbers.Number)
+
+    return all(isinstance(x, types) for x in xs) \
+       and any(isinstance(x, types[:2]) for x in xs)
+
+
+
+
+# --- Deferred contraction -------------------------------------------------- #
+
+def matmul(x, y):
+
+    if not deferrable(x, y):
+       return contraction.contract(force(x), force(y))
+
+    children = (node(x), node(y))
+
+    return LazyTensor(deferred_node(
+       ("contract", *map(id, children)),
+       lambda: DeferredContract(children)
+    ))
+
+
+
+
+# --- Deferred elementwise operation ---------------------------------------- #
+
+def elemwise(fun, *xs):
+
+    if not deferrable(*xs, scalars=True):
+       return fun(*map(force, xs))
+
+    children = tuple(map(node, xs))
+
+    return LazyTensor(deferred_node(
+       ("elemwise", fun, *map(id, children)),
+       lambda: DeferredElemwise(fun, children)
+    ))
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Lazy tensor: a handle to a deferred computation, evaluated when        ###
+###  the result is first needed.                                            ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Lazy tensor ----------------------------------------------------------- #
+
+class LazyTensor(Tensor, Pluggable):
+
+   # --- Construction --- #
+
+   def __init__(self, node):
+
+       self._node = node
+       self._node._handles += 1
+
+
+   def __del__(self):
+
+       self._node._handles -= 1
+
+
+   # --- Evaluation --- #
+
+   def force(self):
+
+       return self._node.evaluate()
+
+
+   # --- Plugging into an engine --- #
+
+   def pluginto(self, engine):
+
+       return self.force().pluginto(engine)
+
+
+   # --- Basic functionality --- #
+
+   def copy(self, **opts):
+
+       return self.force().copy(**opts)
+
+
+   def withdata(self, data):
+
+       return self.force().withdata(data)
+
+
+   def space(self):
+
+       return self.force().space()
+
+
+   def item(self, *pos):
+
+       return self.force().item(*pos)
+
+
+   # --- Tensor properties --- #
+
+   @property
+   def dtype(self):
+       return self.force().dtype
+
+   @property
+   def size(self):
+       return self.force().size
+
+   @property
+   def ndim(self):
+       return self.force().ndim
+
+   @property
+   def shape(self):
+       return self.force().shape
+
+
+   # --- Comparisons --- #
+
+   def __eq__(self, other):
+
+       return self.force() == force(other)
+
+
+   # --- Tensor manipulation --- #
+
+   def __call__(self, *inds):
+
+       return reidx.reindexto(self.force(), *inds)
+
+
+   @property
+   def C(self):
+       return elemwise(unary.conj, self)
+
+   @property
+   def T(self):
+       return reidx.transpose(self.force())
+
+   @property
+   def H(self):
+       return reidx.htranspose(self.force())
+
+
+   # --- Element access --- #
+
+   def __getitem__(self, elem):
+
+       return unary.getitem(self.force(), elem)
+
+
+   # --- Arithmetics --- #
+
+   def __neg__(self):
+
+       return elemwise(unary.neg, self)
+
+
+   def __add__(self, other):
+
+       return elemwise(binary.add, self, other)
+
+
+   def __sub__(self, other):
+
+       return elemwise(binary.sub, self, other)
+
+
+   def __mul__(self, other):
+
+       return elemwise(binary.mul, self, other)
+
+
+   def __truediv__(self, other):
+
+       return elemwise(binary.div, self, other)
+
+
+   def __floordiv__(self, other):
+
+       return binary.floordiv(self.force(), force(other))
+
+
+   def __mod__(self, other):
+
+       return binary.mod(self.force(), force(other))
+
+
+   def __pow__(self, other):
+
+       return binary.power(self.force(), force(other))
+
+
+   def __matmul__(self, other):
+
+       return matmul(self, other)
+
+
+   # --- Reflected arithmetics --- #
+
+   def __radd__(self, other):
+
+       return elemwise(binary.add, other, self)
+
+
+   def __rsub__(self, other):
+
+       return elemwise(binary.sub, other, self)
+
+
+   def __rmul__(self, other):
+
+       return elemwise(binary.mul, other, self)
+
+
+   def __rtruediv__(self, other):
+
+       return elemwise(binary.div, other, self)
+
+
+   def __rfloordiv__(self, other):
+
+       return binary.floordiv(force(other), self.force())
+
+
+   def __rmod__(self, other):
+
+       return binary.mod(force(other), self.force())
+
+
+   def __rpow__(self, other):
+
+       return binary.power(force(other), self.force())
+
+
+   def __rmatmul__(self, other):
+
+       return matmul(other, self)
+
+
+
@@ -74,7 +74,7 @@ def align(vals, pos):
     axes = tuple(i for i, x in enumerate(pos) if not isinstance(x, slice))
     vals = ar.asarray(vals)
 
-    if len(axes) < vals.ndim:
+    if vals.ndim > 0:
        vals = ar.unsqueeze(vals, axes)
 
     return vals
@@ -395,7 +395,7 @@ def ungetitem(x, elem, space):
 
 # --- Extracting info ------------------------------------------------------- #
 
-@ad.nondifferentiable
+@ad.structural
 @typecast_unary
 def iscomplex(x):
 
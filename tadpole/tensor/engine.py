@@ -2,7 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import itertools
-import tadpole.util as util
+import tadpole.util  as util
+import tadpole.array as ar
 
 
 from tadpole.tensor.types import (
@@ -14,6 +15,8 @@ from tadpole.index import (
    Index,
    IndexGen,  
    Indices,
+   isbatch,
+   batchinds,
 )
 
 
@@ -189,6 +192,41 @@ def aligned_ind(inds):
 
 
 
+# --- Batch-aligned input data and indices ---------------------------------- #
+
+def aligned_batch(data, inds):
+
+    batch = util.unique(batchinds(*util.concat(inds)))
+
+    if not batch:
+       return data, inds
+
+    free  = [[ind for ind in xinds if not isbatch(ind)] for xinds in inds]
+    nfree = max(map(len, free))
+
+    def align(x, xinds, xfree):
+
+        xinds = list(xinds)
+        axes  = [xinds.index(ind) for ind in batch if ind in xinds]
+        axes += [xinds.index(ind) for ind in xfree]
+
+        shape = (
+           *(len(ind) if ind in xinds else 1 for ind in batch),
+           *(1 for _ in range(nfree - len(xfree))),
+           *map(len, xfree),
+        )
+
+        return ar.reshape(ar.transpose(x, axes), shape)
+
+    data = tuple(map(align, data, inds, free))
+    inds = tuple((*batch, *(None,) * (nfree - len(xfree)), *xfree) 
+                    for xfree in free)
+
+    return data, inds 
+
+
+
+
 # --- Elementwise engine ---------------------------------------------------- #
 
 class EngineElemwise(Engine): 
@@ -216,9 +254,9 @@ class EngineElemwise(Engine):
        return bool(log)
 
 
-   def _inds(self):
+   def _inds(self, inds):
  
-       inds = (reversed(each_inds) for each_inds in self._train.inds())
+       inds = (reversed(each_inds) for each_inds in inds)
        inds = reversed(list(itertools.zip_longest(*inds)))
 
        return Indices(*map(aligned_ind, inds))
@@ -236,7 +274,11 @@ class EngineElemwise(Engine):
 
    def operator(self):
        
-       return self._optype(*self._train.data(), self._inds())
+       data, inds = aligned_batch(
+          tuple(self._train.data()), tuple(self._train.inds())
+       )
+
+       return self._optype(*data, self._inds(inds))
 
 
 
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import functools
+import concurrent.futures
+
+import numpy as np
+
+import tadpole.array as ar
+
+
+from multiprocessing import (
+   shared_memory,
+)
+
+
+from tadpole.tensor.types import (
+   SliceExecutor,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Helpers for the execution of sliced contractions                       ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Contract a sequence of windows (slices) and sum up the results -------- #
+
+def contract_windows(equation, path, data, windows):
+
+    partials = (
+       ar.contract(
+          equation,
+          *(x[w] for x, w in zip(data, window)),
+          optimize=path
+       )
+       for window in windows
+    )
+
+    return functools.reduce(ar.add, partials)
+
+
+
+
+# --- Pairwise (tree) reduction --------------------------------------------- #
+
+def tree_reduce(fun, xs):
+
+    xs = list(xs)
+
+    while len(xs) > 1:
+
+        pairs = zip(xs[0::2], xs[1::2])
+        tail  = xs[-1:] if len(xs) % 2 else []
+
+        xs = [fun(x, y) for x, y in pairs] + tail
+
+    return xs[0]
+
+
+
+
+# --- Split a list into a given number of contiguous chunks ----------------- #
+
+def chunked(xs, nchunks):
+
+    size = -(-len(xs) // nchunks)
+
+    return [xs[i : i + size] for i in range(0, len(xs), size)]
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Operands shared between processes via shared memory                    ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Shared operands (created by the parent process) ----------------------- #
+
+class SharedOperands:
+
+   def __init__(self, data):
+
+       self._data   = tuple(x.asdata() for x in data)
+       self._blocks = []
+
+
+   def __enter__(self):
+
+       for x in self._data:
+
+           block = shared_memory.SharedMemory(
+                      create=True, size=max(x.nbytes, 1)
+                   )
+
+           np.ndarray(x.shape, x.dtype, buffer=block.buf)[...] = x
+           self._blocks.append(block)
+
+       return self
+
+
+   def __exit__(self, exception_type, exception_val, trace):
+
+       for block in self._blocks:
+           block.close()
+           block.unlink()
+
+       self._blocks = []
+
+
+   def specs(self):
+
+       return tuple(
+          (block.name, x.shape, x.dtype.str)
+             for block, x in zip(self._blocks, self._data)
+       )
+
+
+
+
+# --- Attach to shared operands (from a worker process) --------------------- #
+
+def attach_shared(specs):
+
+    blocks = []
+    data   = []
+
+    for name, shape, dtype in specs:
+
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        data.append(ar.asarray(
+           np.ndarray(shape, dtype, buffer=block.buf), backend="numpy"
+        ))
+
+    return blocks, tuple(data)
+
+
+
+
+# --- Contract windows of shared operands (runs in a worker process) -------- #
+
+def contract_windows_shared(equation, path, specs, windows):
+
+    blocks, data = attach_shared(specs)
+
+    try:
+       out = contract_windows(equation, path, data, windows)
+       return np.array(out.asdata(), copy=True)
+
+    finally:
+       del data
+       for block in blocks:
+           block.close()
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Executors of sliced contractions. Parallelism is over slices only:     ###
+###  an unsliced contraction (no max_memory, or one that fits the budget)   ###
+###  runs as a single block on the calling thread, whatever the executor.   ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Serial executor ------------------------------------------------------- #
+
+class ExecutorSerial(SliceExecutor):
+
+   def __eq__(self, other):
+
+       return type(self) == type(other)
+
+
+   def __hash__(self):
+
+       return hash(type(self))
+
+
+   def run(self, equation, path, data, blocks):
+
+       return [
+          contract_windows(equation, path, data, windows)
+             for windows in blocks
+       ]
+
+
+
+
+# --- Executor based on a pool of threads or processes ---------------------- #
+
+class ExecutorPool(SliceExecutor):
+
+   def __init__(self, pool, nchunks=None):
+
+       if nchunks is None:
+          nchunks = os.cpu_count()
+
+       self._pool    = pool
+       self._nchunks = nchunks
+
+
+   def __eq__(self, other):
+
+       return type(self) == type(other) and self._pool is other._pool
+
+
+   def __hash__(self):
+
+       return hash((type(self), id(self._pool)))
+
+
+   def _shared(self):
+
+       if isinstance(self._pool, type):
+          return issubclass(
+                    self._pool, concurrent.futures.ProcessPoolExecutor
+                 )
+
+       return isinstance(self._pool, concurrent.futures.ProcessPoolExecutor)
+
+
+   def _submit(self, pool, equation, path, data, windows):
+
+       if self._shared():
+          return pool.submit(
+                    contract_windows_shared, equation, path, data, windows
+                 )
+
+       return pool.submit(
+                 contract_windows, equation, path, data, windows
+              )
+
+
+   def _result(self, future):
+
+       if self._shared():
+          return ar.asarray(future.result(), backend="numpy")
+
+       return future.result()
+
+
+   def _run(self, pool, equation, path, data, blocks):
+
+       nchunks = max(1, self._nchunks // len(blocks))
+
+       futures = [
+          [self._submit(pool, equation, path, data, chunk)
+              for chunk in chunked(windows, nchunks)]
+                 for windows in blocks
+       ]
+
+       return [
+          tree_reduce(ar.add, map(self._result, block))
+             for block in futures
+       ]
+
+
+   def _execute(self, pool, equation, path, data, blocks):
+
+       if not self._shared():
+          return self._run(pool, equation, path, data, blocks)
+
+       if not all(isinstance(x.asdata(), np.ndarray) for x in data):
+          raise ValueError(
+             f"{type(self).__name__}.run(): a process pool executor "
+             f"requires operands with a numpy backend."
+          )
+
+       with SharedOperands(data) as shared:
+          return self._run(pool, equation, path, shared.specs(), blocks)
+
+
+   def run(self, equation, path, data, blocks):
+
+       blocks = [list(windows) for windows in blocks]
+
+       if sum(map(len, blocks)) == 1:
+          return ExecutorSerial().run(equation, path, data, blocks)
+
+       if not isinstance(self._pool, type):
+          return self._execute(self._pool, equation, path, data, blocks)
+
+       with self._pool() as pool:
+          return self._execute(pool, equation, path, data, blocks)
+
+
+
+
+# --- Create a slice executor ----------------------------------------------- #
+
+def slice_executor(executor=None):
+
+    if isinstance(executor, SliceExecutor):
+       return executor
+
+    if executor is None or executor == "serial":
+       return ExecutorSerial()
+
+    if executor == "threads":
+       return ExecutorPool(concurrent.futures.ThreadPoolExecutor)
+
+    if executor == "processes":
+       return ExecutorPool(concurrent.futures.ProcessPoolExecutor)
+
+    if isinstance(executor, concurrent.futures.Executor):
+       return ExecutorPool(executor)
+
+    if isinstance(executor, type) \
+       and issubclass(executor, concurrent.futures.Executor):
+       return ExecutorPool(executor)
+
+    raise ValueError(
+       f"slice_executor(): invalid executor {executor}. The executor "
+       f"must be 'serial', 'threads', 'processes', a subclass or "
+       f"an instance of concurrent.futures.Executor."
+    )
@@ -34,6 +34,7 @@ from tadpole.index import (
    Index,
    IndexGen, 
    Indices,
+   istangent,
 )
 
 
@@ -141,21 +142,21 @@ class TensorInteraction:
 
 # --- Mutual index methods -------------------------------------------------- #
 
-@ad.nondifferentiable
+@ad.structural
 def union_inds(*xs, **opts):
 
     op = tensor_interaction(*xs)
     return op.union_inds(**opts)
 
 
-@ad.nondifferentiable
+@ad.structural
 def overlap_inds(*xs, **opts):
 
     op = tensor_interaction(*xs)
     return op.overlap_inds(**opts)
 
 
-@ad.nondifferentiable
+@ad.structural
 def complement_inds(*xs, **opts):
 
     op = tensor_interaction(*xs)
@@ -166,6 +167,13 @@ def complement_inds(*xs, **opts):
 
 # --- Tensor matching ------------------------------------------------------- #
 
+def tangent_complement_inds(x, target):
+
+    return (ind for ind in complement_inds(x, target) if istangent(ind))
+
+
+
+
 def match(x, target, **opts):
 
     return astype_like(reshape_like(x, target, **opts), target)
@@ -192,7 +200,9 @@ def expand_like(x, target, inds=None):
        inds = tuple(complement_inds(target, x))
 
     out = reidx.expand(x, inds)
-    out = reidx.transpose(out, *overlap_inds(target, out))
+    out = reidx.transpose(
+             out, *tangent_complement_inds(out, target), *overlap_inds(target, out)
+          )
 
     return out
 
@@ -205,7 +215,8 @@ def reshape_like(x, target, keepinds=True):
         target = reidx.squeeze(target) 
 
     for ind in complement_inds(x, target): 
-        x = redu.sumover(x, (ind,))
+        if not istangent(ind):
+           x = redu.sumover(x, (ind,))
 
     for ind in complement_inds(target, x):    
         x = reidx.expand(x, (ind,))
@@ -217,10 +228,12 @@ def reshape_like(x, target, keepinds=True):
 
 def transpose_like(x, target):
 
-    diff = tuple(complement_inds(x, target))
+    tangent = tuple(tangent_complement_inds(x, target))
+    diff    = tuple(ind for ind in complement_inds(x, target) 
+                           if ind not in tangent)
           
     if len(diff) == 0:
-       return reidx.transpose(x, *union_inds(target))
+       return reidx.transpose(x, *tangent, *union_inds(target))
 
     if len(diff) > 1:
        raise ValueError(
@@ -235,7 +248,7 @@ def transpose_like(x, target):
                        for ind in union_inds(target)
                   )
 
-    return reidx.transpose(x, *output_inds)
+    return reidx.transpose(x, *tangent, *output_inds)
 
  
 
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import functools
+import numpy      as np
+import opt_einsum as oe
+
+import tadpole.util as util
+
+
+from tadpole.index import (
+   Index,
+   IndexGen,
+   Indices,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Contraction path optimizers and their registry                         ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Hypergraph partitioning optimizer (requires cotengra) ----------------- #
+
+def hyper_optimizer():
+
+    try:
+        import cotengra as ctg
+    except ImportError:
+        raise ImportError("Cotengra is not installed. Please install "
+                          "Cotengra or use a different optimizer.")
+
+    return ctg.HyperOptimizer(methods=["kahypar", "greedy"])
+
+
+
+
+# --- Memory budget error --------------------------------------------------- #
+
+class MemoryBudgetError(Exception):
+
+   def __init__(self, value):
+       self.value = value
+
+   def __str__(self):
+       return repr(self.value)
+
+
+
+
+# --- Unsupported optimizer error ------------------------------------------- #
+
+class UnsupportedOptimizerError(Exception):
+
+   def __init__(self, value):
+       self.value = value
+
+   def __str__(self):
+       return repr(self.value)
+
+
+
+
+# --- Optimizer registry ---------------------------------------------------- #
+
+class OptimizerRegistry:
+
+   _optimizers = {
+      "auto":                lambda: "auto",
+      "greedy":              lambda: "greedy",
+      "optimal":             lambda: "optimal",
+      "dp":                  lambda: "dp",
+      "dynamic-programming": lambda: "dp",
+      "random-greedy":       lambda: "random-greedy",
+      "hyper":               hyper_optimizer,
+   }
+
+   def __init__(self):
+
+       self._optimizers = dict(type(self)._optimizers)
+
+
+   def register(self, name, factory):
+
+       self._optimizers[name] = factory
+       return self
+
+
+   def create(self, optimizer):
+
+       if optimizer in self._optimizers:
+          return self._optimizers[optimizer]()
+
+       raise UnsupportedOptimizerError(
+          f"Contraction optimizer '{optimizer}' is not supported."
+       )
+
+
+   def get(self, optimizer):
+
+       if optimizer is None:
+          optimizer = "auto"
+
+       if isinstance(optimizer, str):
+          return self.create(optimizer)
+
+       if isinstance(optimizer, oe.paths.PathOptimizer):
+          return optimizer
+
+       raise ValueError(
+          f"Invalid contraction optimizer '{optimizer}'. The optimizer "
+          f"input must be a string or an opt_einsum PathOptimizer object."
+       )
+
+
+
+
+# --- A global instance of optimizer registry and its access ports ---------- #
+
+_OPTIMIZERS = OptimizerRegistry()
+
+
+def get_optimizer(optimizer):
+
+    return _OPTIMIZERS.get(optimizer)
+
+
+def register_optimizer(name, factory):
+
+    _OPTIMIZERS.register(name, factory)
+
+
+
+
+# --- Optimized contraction path (cached) ----------------------------------- #
+
+@functools.lru_cache(2**10)
+def optimized_path(equation, shapes, optimizer):
+
+    path, info = oe.contract_path(
+                    symbolic_equation(equation), 
+                    *shapes, 
+                    shapes=True, 
+                    optimize=get_optimizer(optimizer)
+                 )
+
+    return tuple(map(tuple, path)), info
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Memory footprint of a contraction and slicing of contracted indices    ###
+###  to fit the contraction into a given memory budget.                     ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Item size (in bytes) of a given data type ----------------------------- #
+
+def itemsize(dtype):
+
+    return np.dtype(str(dtype).split(".")[-1]).itemsize
+
+
+
+
+# --- Split einsum equation into input and output terms --------------------- #
+
+def split_equation(equation):
+
+    if not isinstance(equation, str):
+       return equation
+
+    inputs, output = equation.split("->")
+
+    return tuple(inputs.split(",")), output
+
+
+
+
+# --- Einsum equation string from integer sublists ------------------------- #
+
+def symbolic_equation(equation):
+
+    if isinstance(equation, str):
+       return equation
+
+    inputs, output = equation
+
+    def tosymbols(sublist):
+        return "".join(map(oe.get_symbol, sublist))
+
+    return ",".join(map(tosymbols, inputs)) + "->" + tosymbols(output)
+
+
+
+
+# --- Peak memory of intermediates and output of a contraction path -------- #
+
+def peak_size(equation, shapes, path):
+
+    inputs, output = split_equation(equation)
+
+    sizes = {}
+    for term, shape in zip(inputs, shapes):
+        sizes.update(zip(term, shape))
+
+    def size(term):
+        return int(np.prod([sizes[symbol] for symbol in term]))
+
+    terms = list(inputs)
+    owned = [False] * len(terms) 
+    live  = 0
+    peak  = 0
+
+    for k, step in enumerate(path):
+
+        popped = [(terms.pop(i), owned.pop(i)) for i in sorted(step)[::-1]]
+        keep   = set(output).union(*terms)
+        term   = tuple(util.unique(
+                    s for t, _ in popped for s in t if s in keep
+                 ))
+
+        if k == len(path) - 1:
+           term = tuple(output)
+
+        peak  = max(peak, live + size(term))
+        live += size(term) - sum(size(t) for t, own in popped if own)
+
+        terms.append(term)
+        owned.append(True)
+
+    return peak
+
+
+
+
+# --- Shapes with the sliced symbols reduced to unit size ------------------- #
+
+def sliced_shapes(equation, shapes, sliced):
+
+    inputs, _ = split_equation(equation)
+
+    return tuple(
+       tuple(1 if s in sliced else n for s, n in zip(term, shape)) 
+          for term, shape in zip(inputs, shapes)
+    )
+
+
+
+
+# --- Sliced contraction path (cached) -------------------------------------- #
+
+@functools.lru_cache(2**10)
+def sliced_path(equation, shapes, optimizer, max_size=None):
+
+    inputs, output = split_equation(equation)
+
+    sizes = {}
+    for term, shape in zip(inputs, shapes):
+        sizes.update(zip(term, shape))
+
+    def evaluate(sliced):
+
+        xshapes    = sliced_shapes(equation, shapes, sliced)
+        path, info = optimized_path(equation, xshapes, optimizer)
+        peak       = peak_size(equation, xshapes, path)
+        nslices = int(np.prod([sizes[s] for s in sliced]))
+
+        return sliced, path, info, peak, nslices
+
+    best = evaluate(tuple())
+
+    while max_size is not None and best[3] > max_size:
+
+        candidates = [
+           s for s in util.unique(util.concat(inputs)) 
+             if s not in best[0] and sizes[s] > 1
+        ]
+
+        if not candidates:
+           raise MemoryBudgetError(
+              f"sliced_path(): the contraction {equation} with shapes "
+              f"{shapes} cannot be fitted into the memory budget of "
+              f"{max_size} elements, the smallest achievable peak "
+              f"memory is {best[3]} elements."
+           )
+
+        best = min(
+           (evaluate((*best[0], s)) for s in candidates),
+           key=lambda x: (x[3], x[2].opt_cost * x[4])
+        )
+
+    return best[:4]
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Contraction cost: FLOP count and memory footprint of a contraction.    ###
+###  All memory figures are in bytes. The peak covers the intermediates     ###
+###  and output of one slice; sliced outputs are assembled in a separate    ###
+###  buffer of output_memory bytes.                                         ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Contraction cost ------------------------------------------------------ #
+
+class ContractionCost:
+
+   def __init__(self, flops, intermediate_memory, peak_memory, 
+                      input_memory, output_memory, nslices=1, 
+                      assembled=False):
+
+       self._flops               = flops
+       self._intermediate_memory = intermediate_memory
+       self._peak_memory         = peak_memory
+       self._input_memory        = input_memory
+       self._output_memory       = output_memory
+       self._nslices             = nslices
+       self._assembled           = assembled
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("flops",               self._flops)
+       rep.val("intermediate_memory", self._intermediate_memory)
+       rep.val("peak_memory",         self._peak_memory)
+       rep.val("total_memory",        self.total_memory)
+       rep.val("nslices",             self._nslices)
+
+       return str(rep)
+
+
+   def __eq__(self, other):
+
+       log = util.LogicalChain()
+       log.typ(self, other)
+
+       if bool(log):
+          log.val(self._flops,               other._flops)
+          log.val(self._intermediate_memory, other._intermediate_memory)
+          log.val(self._peak_memory,         other._peak_memory)
+          log.val(self._input_memory,        other._input_memory)
+          log.val(self._output_memory,       other._output_memory)
+          log.val(self._nslices,             other._nslices)
+          log.val(self._assembled,           other._assembled)
+
+       return bool(log)
+
+
+   @property
+   def flops(self):
+       return self._flops
+
+   @property
+   def intermediate_memory(self):
+       return self._intermediate_memory
+
+   @property
+   def peak_memory(self):
+       return self._peak_memory
+
+   @property
+   def input_memory(self):
+       return self._input_memory
+
+   @property
+   def output_memory(self):
+       return self._output_memory
+
+   @property
+   def total_memory(self):
+
+       if self._assembled:
+          return self._input_memory + self._peak_memory + self._output_memory
+
+       return self._input_memory + self._peak_memory
+
+   @property
+   def nslices(self):
+       return self._nslices
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Contraction plan: the order in which a tensor network is contracted.   ###
+###  Created for a given set of input/output indices without touching       ###
+###  the data, can be reused for any tensors with the same indices.         ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Contraction plan ------------------------------------------------------ #
+
+class ContractionPlan:
+
+   # --- Construction --- #
+
+   def __init__(self, optimizer=None, max_memory=None, 
+                      inds=None, itemsize=None, 
+                      sliced=None, path=None, info=None, peak=None):
+
+       if optimizer is None:
+          optimizer = "auto"
+
+       if sliced is None:
+          sliced = tuple()
+
+       self._optimizer  = optimizer
+       self._max_memory = max_memory
+       self._inds       = inds
+       self._itemsize   = itemsize
+       self._sliced     = sliced
+       self._path       = path
+       self._info       = info
+       self._peak       = peak
+
+
+   # --- Equality, representation --- #
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("optimizer",  self._optimizer)
+       rep.val("max_memory", self._max_memory)
+       rep.val("sliced",     self._sliced)
+       rep.val("path",       self._path)
+
+       return str(rep)
+
+
+   def __str__(self):
+
+       if self._info is None:
+          return repr(self)
+
+       return str(self._info)
+
+
+   def __eq__(self, other):
+
+       log = util.LogicalChain()
+       log.typ(self, other)
+
+       if bool(log):
+          log.val(self._optimizer,  other._optimizer)
+          log.val(self._max_memory, other._max_memory)
+          log.val(self._inds,       other._inds)
+          log.val(self._sliced,     other._sliced)
+          log.val(self._path,       other._path)
+
+       return bool(log)
+
+
+   def __hash__(self):
+
+       path = self._path
+
+       if path is not None:
+          path = tuple(map(tuple, path))
+
+       return hash((
+          self._optimizer,
+          self._max_memory,
+          self._inds,
+          self._sliced,
+          path
+       ))
+
+
+   # --- Memory budget --- #
+
+   def budgeted(self, max_memory):
+
+       if max_memory == self._max_memory:
+          return self
+
+       return self.__class__(self._optimizer, max_memory)
+
+
+   # --- Binding to input/output indices --- #
+
+   def bound(self, input_inds, output_inds, itemsize=None):
+
+       if itemsize is not None and itemsize != self._itemsize:
+          return False
+
+       try:
+          return self._inds == (tuple(input_inds), tuple(output_inds))
+       except (ValueError, AssertionError):
+          return False
+
+
+   def _search(self, equation, input_inds, itemsize):
+
+       shapes   = tuple(Indices(*inds).shape for inds in input_inds)
+       max_size = None
+
+       if self._max_memory is not None:
+          max_size = self._max_memory // itemsize
+
+       sliced, path, info, peak = sliced_path(
+          equation, shapes, self._optimizer, max_size
+       )
+
+       symbols = util.unique(util.concat(split_equation(equation)[0]))
+       inds    = util.unique(util.concat(input_inds))
+       sliced  = tuple(inds[symbols.index(s)] for s in sliced)
+
+       return sliced, path, info, peak
+
+
+   def bind(self, equation, input_inds, output_inds, itemsize=8):
+
+       sliced, path, info, peak = self._search(
+          equation, input_inds, itemsize
+       )
+
+       return self.__class__(
+                 self._optimizer,
+                 self._max_memory,
+                 (tuple(input_inds), tuple(output_inds)),
+                 itemsize,
+                 sliced,
+                 path,
+                 info,
+                 peak
+              )
+
+
+   def schedule(self, equation, input_inds, output_inds, itemsize=8):
+
+       if self.bound(input_inds, output_inds, itemsize):
+          return self._sliced, self._path
+
+       sliced, path, _, _ = self._search(equation, input_inds, itemsize)
+       return sliced, path
+
+
+   # --- Plan properties --- #
+
+   @property
+   def optimizer(self):
+       return self._optimizer
+
+   @property
+   def max_memory(self):
+       return self._max_memory
+
+   @property
+   def sliced(self):
+       return self._sliced
+
+   @property
+   def nslices(self):
+       return int(np.prod([len(ind) for ind in self._sliced]))
+
+   @property
+   def path(self):
+       return self._path
+
+   @property
+   def info(self):
+       return self._info
+
+   @property
+   def flops(self):
+       return int(self._info.opt_cost) * self.nslices
+
+   @property
+   def largest_intermediate(self):
+       return int(self._info.largest_intermediate)
+
+   @property
+   def peak_memory(self):
+       return self._peak * self._itemsize
+
+
+   # --- Plan cost --- #
+
+   def cost(self):
+
+       input_inds, output_inds = self._inds
+
+       input_size  = sum(Indices(*inds).size for inds in input_inds)
+       output_size = Indices(*output_inds).size
+
+       return ContractionCost(
+                 self.flops, 
+                 self.largest_intermediate * self._itemsize, 
+                 self.peak_memory, 
+                 input_size  * self._itemsize,
+                 output_size * self._itemsize,
+                 self.nslices,
+                 any(ind in output_inds for ind in self._sliced)
+              )
+
+
+
+
+# --- Create a contraction plan --------------------------------------------- #
+
+def contraction_plan(plan=None, max_memory=None):
+
+    if not isinstance(plan, ContractionPlan):
+       plan = ContractionPlan(plan)
+
+    if max_memory is not None:
+       plan = plan.budgeted(max_memory)
+
+    return plan
@@ -26,6 +26,7 @@ from tadpole.index import (
    Index,
    IndexGen, 
    Indices,
+   batchinds,
 )
 
 
@@ -112,8 +113,16 @@ class TensorReduce:
        return self._inds.remove(*inds)
 
 
+   def _batch_inds(self):
+
+       return batchinds(*self._inds)
+
+
    def _apply(self, fun, inds=None, **opts):
 
+       if inds is None and self._batch_inds():
+          inds = self._inds.remove(*self._batch_inds())
+
        if inds is None:
           data = fun(self._data, **opts)
           return core.TensorGen(data, Indices())
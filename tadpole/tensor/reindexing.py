@@ -173,6 +173,9 @@ class TensorReindex:
           output_inds = tuple(reversed(self._inds))
 
        output_inds = self._map(*output_inds)
+       output_inds = (
+          *tid.tangentinds(*(self._inds ^ output_inds)), *output_inds
+       )
 
        assert set(self._inds) == set(output_inds), (
           f"{type(self).__name__}.transpose: "
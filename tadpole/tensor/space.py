@@ -184,11 +184,21 @@ class TensorSpace(Space):
 
    def reshape(self, inds):
 
+       if not isinstance(inds, Indices):
+          inds = Indices(*inds)
+
        arrayspace = self._arrayspace.reshape(tid.shapeof(*inds))
 
        return self.__class__(arrayspace, inds)
 
 
+   def dual(self):
+
+       return self.reshape(
+          tuple(ind.retagged(f"dual{k}") for k, ind in enumerate(self._inds))
+       )
+
+
    # --- Gradient factories --- #
 
    def sparsegrad(self, elem, vals):
@@ -301,6 +311,10 @@ class TensorSpace(Space):
    def shape(self):
        return self._arrayspace.shape
 
+   @property
+   def inds(self):
+       return self._inds
+
 
 
 
@@ -29,7 +29,7 @@ class Pluggable(abc.ABC):
 class Grad(abc.ABC):
 
    @abc.abstractmethod
-   def addto(self, other):
+   def addto(self, other, inplace=False):
        pass
 
    @abc.abstractmethod
@@ -359,3 +359,18 @@ class IndexProduct(abc.ABC):
 
 
 
+
+
+
+
+# --- Slice executor -------------------------------------------------------- #
+
+class SliceExecutor(abc.ABC):
+
+   @abc.abstractmethod
+   def run(self, equation, path, data, blocks):
+       pass
+
+
+
+
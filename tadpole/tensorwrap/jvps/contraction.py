@@ -25,7 +25,14 @@ from tadpole.index import (
 # --- Contraction ----------------------------------------------------------- #
 
 ad.makejvp_combo(tn.contract, "linear")
-ad.makejvp_combo(tn.trace,    "linear")
+
+
+
+
+# --- Trace ----------------------------------------------------------------- #
+
+ad.makejvp(tn.trace,   "linear")
+ad.makejvp(tn.untrace, "linear")
 
 
 
@@ -5,6 +5,7 @@ import tadpole.util      as util
 import tadpole.autodiff  as ad
 import tadpole.container as tc
 import tadpole.tensor    as tn
+import tadpole.index     as tid
 
 import tadpole.linalg.unwrapped as la
 
@@ -12,6 +13,8 @@ from tadpole.tensorwrap.vjps.linalg import (
    eye,
    fmatrix,
    tri,
+   batchslices,
+   batchstack,
 )
 
 from tadpole.index import (
@@ -31,6 +34,36 @@ from tadpole.index import (
 ###############################################################################
 
 
+# --- Helpers: batch-wise JVP of a decomposition ---------------------------- #
+
+def batchwise(jvpfun):
+
+    def wrap(g, out, x, *args, **kwargs):
+
+        batch = tid.batchinds(*tn.union_inds(x))
+
+        if not batch:
+           return jvpfun(g, out, x, *args, **kwargs)
+
+        ind   = batch[0]
+        outs  = zip(*(batchslices(y, ind) for y in out))
+        grads = [
+           wrap(gpos, outpos, xpos, *args, **kwargs)
+           for gpos, outpos, xpos in zip(
+              batchslices(g, ind), outs, batchslices(x, ind)
+           )
+        ]
+
+        return tc.container(*(
+           batchstack([grad[k] for grad in grads], ind, y)
+           for k, y in enumerate(out)
+        ))
+
+    return wrap
+
+
+
+
 # --- SVD ------------------------------------------------------------------- #
 
 def jvp_svd(g, out, x, sind=None, trunc=None):
@@ -249,11 +282,11 @@ def jvp_lq(g, out, x, sind=None):
 
 # --- Record decomp JVPs to JVP map ----------------------------------------- # 
 
-ad.makejvp(la.svd,  jvp_svd)
-ad.makejvp(la.eig,  jvp_eig)
-ad.makejvp(la.eigh, jvp_eigh)
-ad.makejvp(la.qr,   jvp_qr)
-ad.makejvp(la.lq,   jvp_lq)
+ad.makejvp(la.svd,  batchwise(jvp_svd))
+ad.makejvp(la.eig,  batchwise(jvp_eig))
+ad.makejvp(la.eigh, batchwise(jvp_eigh))
+ad.makejvp(la.qr,   batchwise(jvp_qr))
+ad.makejvp(la.lq,   batchwise(jvp_lq))
 
 
 
@@ -6,6 +6,7 @@ import tadpole.autodiff as ad
 import tadpole.tensor   as tn
 
 import tadpole.autodiff.node as an
+import tadpole.autodiff.grad as agrad
 import tadpole.container     as tc
 
 
@@ -25,7 +26,7 @@ class NodeTensor(an.NodeGen, tn.Tensor, tn.Grad):
 
    # --- Gradient operations --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other and not isinstance(other, tn.NullGrad):
           other = tn.NullGrad(self.space())
@@ -225,7 +226,7 @@ class NodeContainer(an.NodeGen, tc.Container, tn.Grad):
 
    # --- Gradient operations --- #
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other and not isinstance(other, tc.NullGrad):
           other = tc.NullGrad(len(self))
@@ -296,6 +297,13 @@ an.register(tc.NullGrad,     NodeContainer)
 
 
 
+# --- Pack plural variables (multiple argument indices) into Containers ----- #
+
+agrad.register_pack(tc.container)
+
+
+
+
 
 
 
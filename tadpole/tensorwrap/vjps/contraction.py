@@ -4,6 +4,7 @@
 import tadpole.util     as util
 import tadpole.autodiff as ad
 import tadpole.tensor   as tn
+import tadpole.index    as tid
 
 import tadpole.tensor.contraction as tnc
 
@@ -32,8 +33,18 @@ def vjp_contract(g, adx, out, *xs, **opts):
 
     inds    = Indices(*tn.complement_inds(this, *others, g))
     product = Indices(*tn.union_inds(this)) ^ inds
+    product = Indices(
+                 *tid.tangentinds(*tn.complement_inds(g, this)), *product
+              )
     
-    result = tn.contract(g, *others, product=product) 
+    result = tn.contract(
+                g, 
+                *others, 
+                product=product, 
+                plan=opts.get("plan"), 
+                max_memory=opts.get("max_memory"),
+                executor=opts.get("executor")
+             ) 
 
     return tn.match(tn.expand(result, inds), this)
 
@@ -45,5 +56,15 @@ def vjp_contract(g, adx, out, *xs, **opts):
 ad.makevjp_combo(tn.contract, vjp_contract)
 
 
+ad.makevjp(tn.trace, 
+              lambda g, out, x, inds: tn.untrace(g, inds, tn.space(x))
+)
+
+
+ad.makevjp(tn.untrace, 
+              lambda g, out, x, inds, space: tn.trace(g, inds)
+)
+
+
 
 
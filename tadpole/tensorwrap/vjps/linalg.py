@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import operator
+from functools import reduce
+
 import tadpole.util     as util
 import tadpole.autodiff as ad
 import tadpole.tensor   as tn
+import tadpole.index    as tid
 
 import tadpole.linalg.unwrapped as la
 
@@ -39,6 +43,68 @@ def eye(x, inds=None):
 
 
 
+# --- Helpers: slices of a batched decomposition ---------------------------- #
+
+def batchslices(x, ind):
+
+    inds = tuple(tn.union_inds(x))
+
+    if ind not in inds:
+       return [x] * len(ind)
+
+    x = tn.transpose(x, ind, *(i for i in inds if i != ind))
+
+    return [x[pos] for pos in range(len(ind))]
+
+
+
+
+def batchstack(xs, ind, target):
+
+    inds = tuple(tn.union_inds(target))
+
+    if ind not in inds:
+       return reduce(operator.add, xs)
+
+    rest = tuple(i for i in inds if i != ind)
+    flat = IndexGen("flat", tid.sizeof(*rest))
+    unit = IndexGen("unit", 1)
+
+    xs = (tn.expand(tn.fuse(x, {rest: flat}), (unit,)) for x in xs)
+    x  = la.concat(*xs, inds=(ind, flat), which="left")
+
+    return tn.transpose_like(tn.split(x, {flat: rest}), target)
+
+
+
+
+# --- Helpers: batch-wise VJP of a decomposition ---------------------------- #
+
+def batchwise(vjpfun):
+
+    def wrap(g, out, x, *args, **kwargs):
+
+        batch = tid.batchinds(*tn.union_inds(x))
+
+        if not batch:
+           return vjpfun(g, out, x, *args, **kwargs)
+
+        ind = batch[0]
+
+        gs   = zip(*(batchslices(y, ind) for y in g))
+        outs = zip(*(batchslices(y, ind) for y in out))
+        xs   = batchslices(x, ind)
+
+        return batchstack([
+           wrap(gpos, outpos, xpos, *args, **kwargs)
+           for gpos, outpos, xpos in zip(gs, outs, xs)
+        ], ind, x)
+
+    return wrap
+
+
+
+
 # --- Helpers: F-matrix ----------------------------------------------------- #
 
 def fmatrix(s): 
@@ -279,11 +345,11 @@ def vjp_lq(g, out, x, sind=None):
 
 # --- Record decomp VJPs ---------------------------------------------------- # 
 
-ad.makevjp(la.svd,  vjp_svd)
-ad.makevjp(la.eig,  vjp_eig)
-ad.makevjp(la.eigh, vjp_eigh)
-ad.makevjp(la.qr,   vjp_qr)
-ad.makevjp(la.lq,   vjp_lq)
+ad.makevjp(la.svd,  batchwise(vjp_svd))
+ad.makevjp(la.eig,  batchwise(vjp_eig))
+ad.makevjp(la.eigh, batchwise(vjp_eigh))
+ad.makevjp(la.qr,   batchwise(vjp_qr))
+ad.makevjp(la.lq,   batchwise(vjp_lq))
 
 
 
@@ -36,3 +36,12 @@ from tadpole.util.misc import (
 )
 
 
+from tadpole.util.profiling import (
+   Profiler,
+   profile,
+   profiler,
+   instrument,
+)
+
+
+
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import abc
 import itertools
 import cytoolz
 
@@ -220,79 +219,44 @@ class Loop:
 
 ###############################################################################
 ###                                                                         ###
-###  Sequence data structure                                                ###
+###  Sequence data structure: a persistent cons-list. Each push creates     ###
+###  a new cell that shares its tail with the original sequence.           ###
 ###                                                                         ###
 ###############################################################################
 
 
-# --- List with history ----------------------------------------------------- #
-
-class List:
-
-   def __init__(self, origin):
-
-       if not isinstance(origin, list):
-          origin = list(origin)
-
-       self._origin  = origin
-       self._history = tuple()
-
-
-   def __iter__(self):
-
-       return iter(self._origin)
-
-
-   def apply(self, tasks):
-
-       self.restore()
-
-       for task in tasks:
-           task.execute(self._origin) 
-
-       self._history = tuple(tasks)
-       return self
- 
-
-   def restore(self):
-
-       for task in reversed(self._history):
-           task.undo(self._origin)
-
-       self._history = tuple()
-       return self
-
+# --- Sequence -------------------------------------------------------------- #
 
+class Sequence:
 
+   def __init__(self, origin=None, cell=None, size=0):
 
-# --- Sequence -------------------------------------------------------------- #
+       if origin:
+          for item in origin:
+              cell  = (item, cell)
+              size += 1
 
-class Sequence:
+       self._cell = cell
+       self._size = size
 
-   def __init__(self, origin=None, tasks=tuple()):
 
-       if not origin:
-          origin = []
+   def _cells(self):
 
-       if not isinstance(origin, List):
-          origin = List(origin)
+       cell = self._cell
 
-       self._origin = origin
-       self._tasks  = tasks
+       while cell is not None:
+          item, cell = cell
+          yield item
 
 
    @property
    @util.cacheable
    def _list(self):
 
-       self._origin.apply(self._tasks)
-
-       return list(self._origin)
-
+       out = list(self._cells())
+       out.reverse()
 
-   def _apply(self, task):
-
-       return self.__class__(self._origin, (*self._tasks, task))
+       return out
 
 
    def __repr__(self):
@@ -327,12 +291,12 @@ class Sequence:
 
    def __reversed__(self):
 
-       return reversed(self._list)
+       return self._cells()
 
 
    def __len__(self):
 
-       return len(self._list)
+       return self._size
 
 
    def __contains__(self, item):
@@ -347,76 +311,15 @@ class Sequence:
 
    def push(self, item):
 
-       return self._apply(Push(item))
+       return self.__class__(cell=(item, self._cell), size=self._size + 1)
 
 
    def pop(self):
 
-       return self._apply(Pop())
-
-
-
-
-###############################################################################
-###                                                                         ###
-###  Sequence tasks operating on the internal list of a Sequence            ###
-###                                                                         ###
-###############################################################################
-
-
-# --- Task interface -------------------------------------------------------- #
-
-class Task(abc.ABC):
-
-   @abc.abstractmethod
-   def execute(self, lst):
-       pass
-
-   @abc.abstractmethod
-   def undo(self, lst):
-       pass
-
-
-
-
-# --- Push task ------------------------------------------------------------- #
-
-class Push(Task):
-
-   def __init__(self, item):
-
-       self._item = item
-
-
-   def execute(self, lst):
-
-       lst.append(self._item)
-
-
-   def undo(self, lst):
-
-       lst.remove(self._item)
-
-
-
-
-# --- Pop task -------------------------------------------------------------- #
-
-class Pop(Task):      
-       
-   def __init__(self):
-
-       self._item = None 
-
-
-   def execute(self, lst):
- 
-       self._item = lst.pop()
-
-
-   def undo(self, lst):
+       if self._cell is None:
+          raise IndexError(f"{type(self).__name__}.pop: empty sequence")
 
-       lst.append(self._item)
+       return self.__class__(cell=self._cell[1], size=self._size - 1)
 
 
 
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import threading
+import functools
+
+import tadpole.util as util
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Profiler: per-primitive call counts, wall times, output bytes and      ###
+###  shapes, split into forward, VJP, JVP and backend calls. Self times     ###
+###  exclude nested profiled calls, so they add up without double counts.   ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Helpers: bytes and shapes of an output -------------------------------- #
+
+def nbytes(x):
+
+    if isinstance(x, (tuple, list)):
+       return sum(map(nbytes, x))
+
+    try:
+       return int(x.nbytes)
+    except (AttributeError, TypeError):
+       return 0
+
+
+
+
+def shapeof(x):
+
+    if isinstance(x, (tuple, list)):
+
+       shapes = tuple(map(shapeof, x))
+
+       if any(shape is not None for shape in shapes):
+          return shapes
+
+       return None
+
+    try:
+       return tuple(x.shape)
+    except (AttributeError, TypeError):
+       return None
+
+
+
+
+# --- Profile event: a single timed call ------------------------------------ #
+
+class ProfileEvent:
+
+   def __init__(self, name, phase, start, duration, selftime, 
+                      nbytes, shape, thread):
+
+       self.name     = name
+       self.phase    = phase
+       self.start    = start
+       self.duration = duration
+       self.selftime = selftime
+       self.nbytes   = nbytes
+       self.shape    = shape
+       self.thread   = thread
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("name",     self.name)
+       rep.val("phase",    self.phase)
+       rep.val("duration", self.duration)
+       rep.val("selftime", self.selftime)
+       rep.val("nbytes",   self.nbytes)
+       rep.val("shape",    self.shape)
+
+       return str(rep)
+
+
+   def trace(self, origin):
+
+       return {
+               "name": self.name,
+               "cat":  self.phase,
+               "ph":   "X",
+               "ts":   (self.start - origin) / 1e3,
+               "dur":  self.duration / 1e3,
+               "pid":  0,
+               "tid":  self.thread,
+               "args": {
+                        "self":   self.selftime / 1e3,
+                        "nbytes": self.nbytes, 
+                        "shape":  str(self.shape),
+                       },
+              }
+
+
+
+
+# --- Profile stat: events of one primitive in one phase -------------------- #
+
+class ProfileStat:
+
+   def __init__(self, name, phase):
+
+       self.name     = name
+       self.phase    = phase
+       self.calls    = 0
+       self.time     = 0
+       self.selftime = 0
+       self.nbytes   = 0
+       self.shapes   = []
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("name",     self.name)
+       rep.val("phase",    self.phase)
+       rep.val("calls",    self.calls)
+       rep.val("time",     self.time)
+       rep.val("selftime", self.selftime)
+       rep.val("nbytes",   self.nbytes)
+
+       return str(rep)
+
+
+   def add(self, event):
+
+       self.calls    += 1
+       self.time     += event.duration
+       self.selftime += event.selftime
+       self.nbytes   += event.nbytes
+
+       if event.shape not in self.shapes:
+          self.shapes.append(event.shape)
+
+       return self
+
+
+
+
+# --- Profiler -------------------------------------------------------------- #
+
+class Profiler:
+
+   _phases = ("forward", "vjp", "jvp", "backend")
+
+
+   def __init__(self):
+
+       self._events = []
+       self._origin = time.perf_counter_ns()
+       self._lock   = threading.Lock()
+       self._local  = threading.local()
+
+
+   def __repr__(self):
+
+       rep = util.ReprChain()
+
+       rep.typ(self)
+       rep.val("nevents", len(self._events))
+
+       return str(rep)
+
+
+   def __enter__(self):
+
+       push(self)
+       return self
+
+
+   def __exit__(self, exception_type, exception_val, trace):
+
+       pop(self)
+
+
+   @property
+   def events(self):
+
+       return list(self._events)
+
+
+   def run(self, name, phase, fun, *args, **kwargs):
+
+       if getattr(self._local, "paused", False):
+          return fun(*args, **kwargs)
+
+       if not hasattr(self._local, "children"):
+          self._local.children = []
+
+       children = self._local.children
+       children.append(0)
+
+       try:
+          start = time.perf_counter_ns()
+          out   = fun(*args, **kwargs)
+          stop  = time.perf_counter_ns()
+       finally:
+          child = children.pop()
+
+       duration = stop - start
+
+       if children:
+          children[-1] += duration
+
+       self._local.paused = True
+
+       try:
+          event = ProfileEvent(
+             name, phase, start, duration, duration - child,
+             nbytes(out), shapeof(out), threading.get_ident()
+          )
+       finally:
+          self._local.paused = False
+
+       with self._lock:
+          self._events.append(event)
+
+       return out
+
+
+   def stats(self, phase=None):
+
+       stats = {}
+
+       for event in self.events:
+
+           if phase is not None and event.phase != phase:
+              continue
+
+           key = (event.phase, event.name)
+
+           if key not in stats:
+              stats[key] = ProfileStat(event.name, event.phase)
+
+           stats[key].add(event)
+
+       return sorted(
+          stats.values(),
+          key=lambda x: (self._phases.index(x.phase), -x.selftime)
+       )
+
+
+   def table(self, phase=None):
+
+       header = (
+          f"{'phase':<9}{'primitive':<24}{'calls':>8}"
+          f"{'self [ms]':>12}{'total [ms]':>13}{'mean [us]':>12}"
+          f"{'out bytes':>14}  shapes"
+       )
+       lines = [header, "-" * len(header)]
+
+       for stat in self.stats(phase):
+
+           lines.append(
+              f"{stat.phase:<9}{stat.name:<24}{stat.calls:>8}"
+              f"{stat.selftime / 1e6:>12.3f}"
+              f"{stat.time / 1e6:>13.3f}"
+              f"{stat.selftime / 1e3 / stat.calls:>12.1f}"
+              f"{stat.nbytes:>14}  "
+              f"{', '.join(map(str, stat.shapes[:3]))}"
+           )
+
+       return "\n".join(lines)
+
+
+   def trace(self):
+
+       return {
+               "traceEvents": [
+                  event.trace(self._origin) for event in self.events
+               ],
+               "displayTimeUnit": "ms",
+              }
+
+
+   def save(self, path):
+
+       with open(path, "w") as f:
+          json.dump(self.trace(), f)
+
+       return path
+
+
+
+
+# --- Stack of active profilers and its access ports ------------------------ #
+
+_PROFILERS = []
+
+
+def profiler():
+
+    if _PROFILERS:
+       return _PROFILERS[-1]
+
+    return None
+
+
+def push(prof):
+
+    if not _PROFILERS:
+       _INSTRUMENTS.install()
+
+    _PROFILERS.append(prof)
+
+
+def pop(prof):
+
+    _PROFILERS.remove(prof)
+
+    if not _PROFILERS:
+       _INSTRUMENTS.uninstall()
+
+
+def profile():
+
+    return Profiler()
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Instruments: class methods that report to the active profiler.         ###
+###  Installed only while a profiler is active.                             ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Helper: a method wrap that reports to the active profiler ------------- #
+
+def instrumented(fun, name, phase):
+
+    @functools.wraps(fun)
+    def wrap(*args, **kwargs):
+
+        prof = profiler()
+
+        if prof is None:
+           return fun(*args, **kwargs)
+
+        return prof.run(name, phase, fun, *args, **kwargs)
+
+    return wrap
+
+
+
+
+# --- Instrument registry --------------------------------------------------- #
+
+class InstrumentRegistry:
+
+   def __init__(self):
+
+       self._targets = []
+       self._saved   = []
+
+
+   def register(self, cls, names, prefix, phase):
+
+       self._targets.append((cls, tuple(sorted(names)), prefix, phase))
+       return self
+
+
+   def install(self):
+
+       for cls, names, prefix, phase in self._targets:
+           for name in names:
+
+               self._saved.append((cls, name, cls.__dict__.get(name)))
+
+               setattr(cls, name, instrumented(
+                  getattr(cls, name), f"{prefix}.{name}", phase
+               ))
+
+       return self
+
+
+   def uninstall(self):
+
+       for cls, name, fun in reversed(self._saved):
+
+           if fun is None:
+              delattr(cls, name)
+           else:
+              setattr(cls, name, fun)
+
+       self._saved = []
+       return self
+
+
+
+
+# --- A global instance of instrument registry and its access port ---------- #
+
+_INSTRUMENTS = InstrumentRegistry()
+
+
+def instrument(cls, names, prefix, phase="backend"):
+
+    _INSTRUMENTS.register(cls, names, prefix, phase)
+
+
+
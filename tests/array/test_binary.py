@@ -338,6 +338,24 @@ class TestArray:
        assert ar.allclose(out, ans)
 
 
+   @pytest.mark.parametrize("shapes", [
+      [(2,3,4), (2,3,4)],
+   ])
+   @pytest.mark.parametrize("dtypes", [
+      ["complex128", "complex128"],
+   ])
+   def test_iadd(self, shapes, dtypes):
+
+       w = data.narray_dat(data.randn)(self.backend, shapes, dtypes)
+
+       ans = w.datas[0] + w.datas[1]
+       ans = unary.asarray(ans, **options(backend=self.backend))
+       out = ar.iadd(w.arrays[0], w.arrays[1])
+
+       assert ar.allclose(out, ans)
+       assert ar.allclose(w.arrays[0], ans)
+
+
    @pytest.mark.parametrize("shapes", [
       [(2,3,4), (2,3,4)],
    ])
@@ -478,6 +496,25 @@ class TestArray:
            assert False
 
 
+   @pytest.mark.parametrize("shapes, axes", [
+      [[(2,3,4), (4,3,6)], ((1,2), (1,0))],
+      [[(2,3,4), (4,5)  ], ((2,),  (0,)) ],
+      [[(2,3),   (4,5)  ], ((),    ())   ],
+   ])
+   @pytest.mark.parametrize("dtypes", [
+      ["complex128", "complex128"],
+   ])
+   def test_tensordot(self, shapes, axes, dtypes):
+
+       w = data.narray_dat(data.randn)(self.backend, shapes, dtypes)
+
+       out = ar.tensordot(w.arrays[0], w.arrays[1], axes)
+       ans = np.tensordot(w.datas[0],  w.datas[1], axes)
+       ans = unary.asarray(ans, **options(backend=self.backend))
+
+       assert ar.allclose(out, ans)
+
+
    @pytest.mark.parametrize("shapes", [
       [(2,3,4), (2,5,6)],
    ])
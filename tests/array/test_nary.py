@@ -174,6 +174,61 @@ class TestArray:
        assert ar.allclose(out, ans)
 
 
+   @pytest.mark.parametrize("sublists, shapes, dtypes", [
+      [(((0,1,2), (2,3,4)), (0,1,3,4)),                 [(3,4,6), (6,2,5)           ], ["complex128"]*2],
+      [(((0,1,2), (2,3,4), (4,5,3,1)), (0,4,5)),        [(3,4,6), (6,2,5), (5,7,2,4)], ["complex128"]*3],
+      [(((60,61,62), (62,63,64), (64,65,63,61)), (60,65)), [(3,4,6), (6,2,5), (5,7,2,4)], ["complex128"]*3],
+   ])
+   def test_einsum_sublists(self, sublists, shapes, dtypes):
+
+       w = data.narray_dat(data.randn)(
+              self.backend, shapes, dtypes
+           )
+
+       inputs, output = sublists
+       symbols = {s: chr(ord("a") + i) for i, s in enumerate(
+                    sorted(set(itertools.chain(*inputs)))
+                 )}
+
+       equation = ",".join("".join(map(symbols.get, x)) for x in inputs) \
+                + "->" + "".join(map(symbols.get, output))
+
+       out = ar.einsum(sublists, *w.arrays)
+       ans = np.einsum(equation, *w.datas)
+       ans = unary.asarray(ans, **options(backend=self.backend))
+
+       assert ar.allclose(out, ans)
+
+       out = ar.contract(sublists, *w.arrays)
+
+       assert ar.allclose(out, ans)
+
+
+   @pytest.mark.parametrize("equation, shapes, dtypes", [
+      ["ijk,klm->ijlm",     [(3,4,6), (6,2,5)           ], ["complex128"]*2],
+      ["ijk,klm,mqlj->imq", [(3,4,6), (6,2,5), (5,7,2,4)], ["complex128"]*3],
+   ])
+   def test_contract(self, equation, shapes, dtypes):
+
+       w = data.narray_dat(data.randn)(
+              self.backend, shapes, dtypes
+           )
+
+       ar.contract_cache_clear()
+
+       out = ar.contract(equation, *w.arrays)
+       ans = np.einsum(equation, *w.datas)
+       ans = unary.asarray(ans, **options(backend=self.backend))
+
+       assert ar.allclose(out, ans)
+
+       out = ar.contract(equation, *w.arrays)
+       info = ar.contract_cache_info()
+
+       assert ar.allclose(out, ans)
+       assert (info.hits, info.misses) == (1, 1)
+
+
    @pytest.mark.parametrize("equation, shapes, dtypes", [
       ["ijk,klm->ijlm",     [(3,4,6), (7,2,5)           ], ["complex128"]*2],
       ["ijk,klm,mqlj->imq", [(3,4,6), (6,2,5), (2,7,2,4)], ["complex128"]*3],
@@ -284,6 +284,18 @@ class TestArray:
        assert w.array.size == np.prod(shape)
 
 
+   @pytest.mark.parametrize("shape", [(2,3,4)])
+   def test_buffers(self, shape):
+
+       w = data.array_dat(data.randn)(self.backend, shape)
+
+       (key, nbytes), = w.array.buffers()
+       (key1, nbytes1), = ar.reshape(w.array, (-1,))[2:5].buffers()
+
+       assert (key1, nbytes1) == (key, nbytes)
+       assert nbytes == w.array.nbytes
+
+
    @pytest.mark.parametrize("shape", [(2,3,4)])
    def test_ndim(self, shape):
 
@@ -614,6 +626,16 @@ class TestArray:
        assert out == ans
 
 
+   def test_unique(self):
+
+       x = unary.asarray(np.array([3,1,3,0,1]), backend=self.backend)
+
+       vals, inverse = ar.unique(x)
+
+       assert vals    == unary.asarray(np.array([0,1,3]),     backend=self.backend)
+       assert inverse == unary.asarray(np.array([2,1,2,0,1]), backend=self.backend)
+
+
    @pytest.mark.parametrize("shape, idxs", [
       [(2,3,4), (((1,0,1),), ((0,2,0),), ((2,1,3),))], 
    ])
@@ -44,6 +44,11 @@ class DifferentiableFun(at.DifferentiableFun):
        return self._fun["jvp", lambda g: fake.Value()](*args, **kwargs)
 
 
+   def evaluate(self, *args, **kwargs):
+
+       return self._fun["evaluate", fake.Value()](*args, **kwargs)
+
+
 
 
 ###############################################################################
@@ -194,6 +199,11 @@ class Pack(at.Pack):
        return self._fun["innermost", False]()
 
 
+   def layer(self):
+
+       return self._fun["layer", 0]()
+
+
    def deshell(self):
 
        return self._fun["deshell", Args()]()
@@ -231,6 +241,11 @@ class Envelope(at.Envelope):
        return self._fun["packs", default]()
 
 
+   def layers(self):
+
+       return self._fun["layers", tuple()]()
+
+
    def apply(self, fun):
 
        return self._fun["apply", fake.Value()](fun)
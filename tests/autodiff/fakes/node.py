@@ -36,6 +36,21 @@ class AdjointOp(at.AdjointOp):
        return self._fun["jvp", seed](seed)
 
 
+   def prune(self, keep):
+
+       return self._fun["prune", self](keep)
+
+
+   def strip(self):
+
+       return self._fun["strip", self]()
+
+
+   def account(self, stats, node):
+
+       return self._fun["account", stats](stats, node)
+
+
 
 
 ###############################################################################
@@ -112,6 +127,16 @@ class Gate(at.Gate):
        return self._fun["grads", grads](node, grads)  
 
 
+   def release(self):
+
+       return self._fun["release", self]()
+
+
+   def account(self, node, stats):
+
+       return self._fun["account", stats](node, stats)
+
+
 
 
 ###############################################################################
@@ -135,6 +160,17 @@ class Node(at.Node):
        return self._fun["connected", True](other)
 
 
+   def depends(self, other):
+ 
+       return self._fun["depends", True](other)
+
+
+   @property
+   def origin(self):
+
+       return self._fun["origin", 0]()
+
+
    def concat(self, concatenable):
 
        return self._fun["concat", concatenable](concatenable)
@@ -155,6 +191,16 @@ class Node(at.Node):
        return self._fun["grads", grads](grads)
 
 
+   def release(self):
+
+       return self._fun["release", self]()
+
+
+   def account(self, stats):
+
+       return self._fun["account", stats](stats)
+
+
 an.register(Node, an.NodeGen)
 
 
@@ -2,12 +2,14 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import numpy as np
 from tests.common import arepeat, arange, amap
 
 import tests.autodiff.fakes as fake
 import tests.autodiff.data  as data
 
 import tadpole.util           as util
+import tadpole.array          as ar
 import tadpole.autodiff.types as at
 import tadpole.autodiff.node  as an
 import tadpole.autodiff.graph as ag
@@ -125,6 +127,60 @@ class TestPropagationReverse:
        assert prop.grads(seed) == grads
 
 
+   @pytest.mark.parametrize("layer", [0])
+   def test_grads_release(self, layer):
+
+       w = data.reverse_node_network_dat(layer)
+
+       prop  = ad.PropagationReverse(w.start, w.end, release=True)
+       seed  = w.gradmap[w.end]
+       grads = ad.GradAccum({None: w.gradmap[w.start]})
+
+       assert prop.grads(seed) == grads
+       assert w.end.nbytes == 0
+
+
+
+
+# --- Reverse gradient propagation with a pool of threads ------------------- #
+
+class TestPropagationParallel:
+
+   def test_apply(self):
+
+       dat  = data.graph_dat("REVERSE")
+       prop = ad.PropagationParallel(dat.start, dat.end)
+
+       assert prop.apply(lambda x: ag.ArgsGen(x).deshelled()[0]) == dat.out
+
+
+   @pytest.mark.parametrize("layer",   [0])
+   @pytest.mark.parametrize("workers", [1,2,4])
+   def test_grads(self, layer, workers):
+
+       w = data.reverse_node_network_dat(layer)
+
+       prop  = ad.PropagationParallel(w.start, w.end, workers)
+       seed  = w.gradmap[w.end]
+       grads = ad.GradAccum({None: w.gradmap[w.start]})
+
+       assert prop.grads(seed).result() == grads.result()
+
+
+   @pytest.mark.parametrize("layer",   [0])
+   @pytest.mark.parametrize("workers", [1,2,4])
+   def test_grads_release(self, layer, workers):
+
+       w = data.reverse_node_network_dat(layer)
+
+       prop  = ad.PropagationParallel(w.start, w.end, workers, release=True)
+       seed  = w.gradmap[w.end]
+       grads = ad.GradAccum({None: w.gradmap[w.start]})
+
+       assert prop.grads(seed).result() == grads.result()
+       assert w.end.nbytes == 0
+
+
 
 
 ###############################################################################
@@ -346,6 +402,30 @@ class TestToposort:
        assert tuple(ad.toposort(w.end)) == tuple(w.nodes)
 
 
+   def test_childcount_pruned(self):
+
+       w     = data.reverse_node_network_dat()
+       stale = w.leaves[2].mark(1)
+
+       countmap = {
+          node: count for node, count in w.countmap.items() 
+                         if node is not stale
+       }
+
+       assert ad.childcount(w.end, w.leaves[0]) == countmap
+
+
+   def test_toposort_pruned(self):
+
+       w        = data.reverse_node_network_dat()
+       stale    = w.leaves[2].mark(1)
+       countmap = ad.childcount(w.end, w.leaves[0])
+
+       assert tuple(ad.toposort(w.end, countmap)) == tuple(
+          node for node in w.nodes if node is not stale
+       )
+
+
 
 
 ###############################################################################
@@ -432,6 +512,36 @@ class TestGradAccum:
                          }
 
 
+   @pytest.mark.parametrize("valency", [2,3])
+   def test_add_pruned(self, valency):
+
+       x = data.reverse_node_dat(valency)
+
+       gradmap = {x.node: x.seed}
+       grads   = ad.GradAccum(gradmap, nodes={x.node, *x.parents[1:]})
+
+       grads.add(x.parents, x.grads)
+       assert gradmap == {
+                          x.node: x.seed,
+                          **dict(zip(x.parents[1:], x.grads[1:])),
+                         }
+
+
+   @pytest.mark.parametrize("valency", [1,2,3])
+   def test_add_inplace(self, valency):
+
+       x = data.reverse_node_dat(valency)
+
+       grads  = ad.GradAccum({x.node: x.seed}, inplace=True)
+       grads1 = ad.GradAccum({x.node: x.seed})
+
+       for _ in range(3):
+           grads.add(x.parents, x.grads)
+           grads1.add(x.parents, x.grads)
+
+       assert grads == grads1
+
+
    @pytest.mark.parametrize("valency", [1,2,3])
    def test_pick(self, valency):
 
@@ -459,3 +569,87 @@ class TestGradAccum:
 
 
 
+###############################################################################
+###                                                                         ###
+###  Memory log: bytes held alive by gradient propagation                   ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Memory log ------------------------------------------------------------ #
+
+class TestMemoryLog:
+
+   def test_push_pop(self):
+
+       log = ad.MemoryLog()
+
+       log.push("x", np.zeros(10))
+       log.push("y", np.zeros(20))
+       assert (log.current, log.peak) == (240, 240)
+
+       log.pop("x")
+       assert (log.current, log.peak) == (160, 240)
+
+       log.push("y", np.zeros(5))
+       assert (log.current, log.peak) == (40, 240)
+
+       log.pop("z")
+       log.push("z", object())
+       assert (log.current, log.peak) == (40, 240)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Graph stats: bytes pinned by the recorded computation graph            ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Graph stats ----------------------------------------------------------- #
+
+class TestGraphStats:
+
+   def test_add(self):
+
+       x = ar.asarray(np.zeros(10))
+       y = ar.asarray(np.zeros(20))
+
+       nodeA, nodeB = fake.Node(), fake.Node()
+
+       stats = ad.GraphStats()
+       stats.add(nodeA, "mul", x, (y, 3), {"a": 1})
+       stats.add(nodeB, None,  ar.reshape(y, (4,5)), x)
+
+       assert (stats.nnodes, stats.nbuffers, stats.nbytes) == (2, 2, 240)
+       assert stats.top()  == [("mul", 240), ("source", 0)]
+       assert stats.top(1) == [("mul", 240)]
+
+
+   def test_graph_stats(self):
+
+       x = ar.asarray(np.zeros(10))
+       y = ar.asarray(np.zeros(20))
+
+       start = fake.Node(account=lambda stats: stats.add(start, None, x))
+       end   = fake.Node(
+                  account=lambda stats: stats.add(end, "sin", y, x),
+                  log=lambda log: log.push(start),
+               )
+
+       stats = ad.graph_stats(end)
+
+       assert (stats.nnodes, stats.nbytes) == (2, 240)
+       assert stats.top() == [("sin", 240), ("source", 0)]
+
+
+   def test_graph_stats_nonode(self):
+
+       stats = ad.graph_stats(ar.asarray(np.zeros(10)))
+       assert (stats.nnodes, stats.nbytes) == (0, 0)
+
+
+
+
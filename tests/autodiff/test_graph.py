@@ -126,6 +126,19 @@ class TestDifferentiable:
        assert x.funwrap(*x.args) == x.out
 
 
+   @pytest.mark.parametrize("n", [1,2,3])
+   def test_call_nodeless(self, n):
+
+       args = arepeat(fake.Value, n)
+       out  = fake.Value()
+
+       funwrap = ag.Differentiable(
+          fake.Fun(out, *args), fake.Fun(None), adj.VjpMap(), adj.JvpMap()
+       )
+
+       assert funwrap(*args) == out
+
+
    @pytest.mark.parametrize("n, adxs, layers", [
       [1, (0,),  (0,)],
       [2, (0,),  (1,)],
@@ -189,6 +202,17 @@ class TestNonDifferentiable:
        assert x.funwrap(*x.args) == x.out
 
 
+   @pytest.mark.parametrize("n", [1,2,3])
+   def test_call_nodeless(self, n):
+
+       args = arepeat(fake.Value, n)
+       out  = fake.Value()
+
+       funwrap = ag.NonDifferentiable(fake.Fun(out, *args), fake.Fun(None))
+
+       assert funwrap(*args) == out
+
+
 
 
 ###############################################################################
@@ -479,6 +479,19 @@ class TestNodeGen:
 
        assert x.connected(y) == result
 
+
+   @pytest.mark.parametrize("origin1, origin2, result", [
+      [1, 1, True],
+      [1, 2, False],
+   ])
+   def test_depends(self, origin1, origin2, result):
+
+       x = data.node_dat(0).node.mark(origin1)
+       y = data.node_dat(0).node.mark(origin2)
+
+       assert x.depends(y) == result
+       assert x.origin     == origin1
+
        
    def test_concat(self):
 
@@ -792,3 +805,74 @@ class TestParentsGen:
 
 
 
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Node tape: records the nodes of one layer in the order of creation.    ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Node tape ------------------------------------------------------------- #
+
+class TestNodeTape:
+
+   def test_push(self):
+
+       tape  = an.NodeTape()
+       nodes = [an.NodeGen(fake.Node(), 0, an.GateNull()) for _ in range(3)]
+
+       for node in nodes:
+           assert tape.push(node) is node
+
+       assert len(tape) == 3
+
+       for slot, node in enumerate(nodes):
+           assert node.slot      == slot
+           assert tape.node(slot) is node
+
+
+   def test_inputs(self):
+
+       tape  = an.NodeTape()
+       nodes = [an.NodeGen(fake.Node(), 1, an.GateNull()) for _ in range(4)]
+       stray = an.NodeGen(fake.Node(), 1, an.GateNull())
+
+       tape.push(nodes[0])
+       tape.push(nodes[1], fake.AdjointOp(), (nodes[0],))
+       tape.push(nodes[2], fake.AdjointOp(), (stray,))
+       tape.push(nodes[3], fake.AdjointOp(), (nodes[1], nodes[2], nodes[0]))
+
+       assert tape.inputs(0) == tuple()
+       assert tape.inputs(1) == (0,)
+       assert tape.inputs(2) == (None,)
+       assert tape.inputs(3) == (1, 2, 0)
+
+       assert list(tape.live(0, 3)) == [1, 1, 0, 1]
+
+
+   def test_clear(self):
+
+       tape = an.NodeTape()
+
+       tape.push(an.NodeGen(fake.Node(), 0, an.GateNull()))
+       tape.push(an.NodeGen(fake.Node(), 0, an.GateNull()))
+
+       assert len(tape.clear()) == 0
+
+
+   @pytest.mark.parametrize("layer", [0, 1])
+   def test_taping(self, layer):
+
+       tape = an.NodeTape()
+       node = an.NodeGen(fake.Node(), layer, an.GateNull())
+
+       with an.taping(tape, layer):
+          assert an.tape_push(node, layer)   is node
+          assert an.tape_push(node, layer+1) is node
+
+       assert len(tape) == 1
+       assert an.tape_push(an.NodeGen(fake.Node(), layer, an.GateNull()), layer).slot is None
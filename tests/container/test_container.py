@@ -628,6 +628,27 @@ class TestSparseGrad:
        assert w.container.todense() == w.dense
 
 
+   @pytest.mark.parametrize("shapes, inds, pos", [ 
+      [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], [1,  ]],
+      [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], [2, 0]],
+   ]) 
+   def test_coalesce(self, shapes, inds, pos):
+
+       w = data.sparse_container_dat(data.randn)(
+              self.backend, inds, shapes, pos
+           )
+
+       out = w.container
+
+       for _ in range(3):
+           out = w.container.addto(out)
+
+       assert len(out.coalesce()._pos) == len(pos)
+
+       for outi, densei in zip(out, w.dense):
+           assert tn.allclose(outi, 4 * densei)
+
+
    @pytest.mark.parametrize("shapes, inds, pos", [ 
       [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], [1,  ]],
       [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], [2, 0]],
@@ -1135,6 +1156,8 @@ class TestGradAccum:
        for i, p in enumerate(ypos):
            ans[p] = tn.addgrads(ans[p], yvals[i])
 
+       assert isinstance(out, SparseGrad)
+
        for outi, ansi in zip(out, ans):
            assert tn.allclose(outi, ansi)
 
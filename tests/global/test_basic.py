@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import numpy as np
 import data    as data
 import tadpole as td
 
@@ -47,6 +48,239 @@ class TestScalar:
        assert allclose(grad, w.grad(adx))
 
 
+   @pytest.mark.parametrize("scalardat, adx", [
+      [data.scalar_dat_001, (0,1)], 
+      [data.scalar_dat_001, (1,0)],
+   ])
+   def test_gradient_plural(self, scalardat, adx):
+
+       w     = scalardat()
+       grads = td.gradient(w.fun, adx)(*w.args)
+
+       assert len(grads) == len(adx)
+
+       for grad, i in zip(grads, adx):
+           assert allclose(grad, w.grad(i))
+
+
+   @pytest.mark.parametrize("scalardat, adx", [
+      [data.scalar_dat_001, (0,1)], 
+   ])
+   def test_evaluate_with_gradient_plural(self, scalardat, adx):
+
+       w          = scalardat()
+       out, grads = td.evaluate_with_gradient(w.fun, adx)(*w.args)
+
+       assert allclose(out, w.out)
+
+       for grad, i in zip(grads, adx):
+           assert allclose(grad, w.grad(i))
+
+
+   @pytest.mark.parametrize("scalardat, adx", [
+      [data.scalar_dat_002, None], 
+      [data.scalar_dat_003, None],
+   ])
+   def test_backprop_memory(self, scalardat, adx):
+
+       w    = scalardat()
+       grad = td.gradient(w.fun, adx)(*w.args)
+       mem  = td.backprop_memory()
+
+       assert allclose(grad, w.grad(adx))
+       assert 0 < mem.current < mem.peak
+       assert mem.current == grad.nbytes
+
+
+   @pytest.mark.parametrize("scalardat, adx", [
+      [data.scalar_dat_001, 0], 
+      [data.scalar_dat_001, 1],
+      [data.scalar_dat_001, (0,1)],
+      [data.scalar_dat_002, None], 
+      [data.scalar_dat_003, None],
+   ])
+   @pytest.mark.parametrize("engine", ["tape", "parallel"])
+   def test_gradient_engine(self, scalardat, adx, engine):
+
+       w = scalardat()
+
+       with td.reverse_engine(engine):
+          grads = td.gradient(w.fun, adx)(*w.args)
+
+       if not isinstance(adx, tuple):
+          adx, grads = (adx,), (grads,)
+
+       for grad, i in zip(grads, adx):
+           assert allclose(grad, w.grad(i))
+
+
+   @pytest.mark.parametrize("engine", ["graph", "tape", "parallel"])
+   def test_gradient_stale_node(self, engine):
+
+       x     = td.randn((td.IndexGen("i", 3),), dtype="float64", seed=1)
+       cache = {}
+
+       def fun(x):
+
+           if "y" not in cache:
+              cache["y"] = td.exp(x) 
+              return td.sumover(td.sin(x))
+
+           return td.sumover(td.sin(x) * cache["y"])
+
+       td.gradient(fun)(x)
+
+       with td.reverse_engine(engine):
+          grad = td.gradient(fun)(x)
+
+       assert allclose(grad, td.cos(x) * td.exp(x))
+
+
+   @pytest.mark.parametrize("engine", ["graph", "tape", "parallel"])
+   def test_gradient_stale_node_vjp(self, engine):
+
+       x     = td.randn((td.IndexGen("i", 3),), dtype="float64", seed=1)
+       cache = {}
+       calls = []
+
+       mul = td.differentiable(lambda x, y: x * y)
+
+       td.makevjp(mul,
+          lambda g, out, x, y: calls.append(0) or g * y,
+          lambda g, out, x, y: calls.append(1) or g * x,
+       )
+
+       def fun(x):
+
+           if "y" not in cache:
+              cache["y"] = td.exp(x)
+              return td.sumover(td.sin(x))
+
+           return td.sumover(mul(td.sin(x), cache["y"]))
+
+       td.gradient(fun)(x)
+
+       with td.reverse_engine(engine):
+          grad = td.gradient(fun)(x)
+
+       assert allclose(grad, td.cos(x) * td.exp(x))
+       assert calls == [0]
+
+
+   @pytest.mark.parametrize("workers", [1,2,4])
+   def test_gradient_parallel_fanout(self, workers):
+
+       i, j = td.IndexGen("i", 3), td.IndexGen("j", 4)
+
+       x    = td.randn((i,j), dtype="float64", seed=1)
+       envs = [td.randn((j,), dtype="float64", seed=s) for s in range(2,10)]
+
+       def fun(x):
+
+           out = td.sumover(td.tanh(x) @ envs[0])
+
+           for env in envs[1:]:
+               out = out + td.sumover(td.tanh(x) @ env) 
+
+           return out
+
+       grad = td.gradient(fun)(x)
+
+       with td.reverse_engine("parallel", workers):
+          assert allclose(td.gradient(fun)(x), grad)
+
+
+   @pytest.mark.parametrize("engine", ["graph", "parallel"])
+   def test_gradient_fanin(self, engine):
+
+       i, j = td.IndexGen("i", 3), td.IndexGen("j", 4)
+
+       x = td.randn((i,j), dtype="float64", seed=1)
+       y = x.copy()
+
+       def fun(x):
+           return td.sumover(x * x + x * x + td.sin(x) * x + x)
+
+       with td.reverse_engine(engine):
+          grad = td.gradient(fun)(x)
+
+       assert allclose(grad, 4 * x + td.cos(x) * x + td.sin(x) + 1)
+       assert allclose(x, y)
+
+
+   def test_profile(self):
+
+       i, j = td.IndexGen("i", 3), td.IndexGen("j", 4)
+       x    = td.randn((i,j), dtype="float64", seed=1)
+
+       def fun(x):
+           return td.sumover(td.sin(x) * x)
+
+       with td.profile() as prof:
+          grad = td.gradient(fun)(x)
+
+       stats = {(s.phase, s.name): s for s in prof.stats()}
+
+       assert allclose(grad, td.cos(x) * x + td.sin(x))
+       assert stats["forward", "sin"].calls  == 1
+       assert stats["forward", "sin"].shapes == [(3,4)]
+       assert stats["vjp", "sin"].nbytes     == 96
+       assert stats["backend", "numpy.sin"].calls == 1
+
+
+   def test_graph_stats(self):
+
+       i, j = td.IndexGen("i", 3), td.IndexGen("j", 4)
+       x    = td.randn((i,j), dtype="float64", seed=1)
+
+       stats = []
+
+       def fun(x):
+
+           out = td.sumover(td.sin(x) * x)
+           stats.append(td.graph_stats(out))
+
+           return out
+
+       td.gradient(fun)(x)
+
+       assert stats[0].nnodes == 4
+       assert stats[0].nbytes == 3 * x.nbytes
+       assert stats[0].top(1) == [("mul", 2 * x.nbytes)]
+
+
+   @pytest.mark.parametrize("fun, ans", [
+      [lambda x: td.sumover(x[0]) + td.sumover(x[1]),   
+       lambda x: np.array([[1.]*4, [1.]*4, [0.]*4])],
+      [lambda x: td.sumover(x[0]) * td.sumover(x[0]),   
+       lambda x: np.array([[2 * x[0].sum()]*4, [0.]*4, [0.]*4])],
+      [lambda x: td.sumover(x[0:2]) + td.sumover(x[1:3]), 
+       lambda x: np.array([[1.]*4, [2.]*4, [1.]*4])],
+      [lambda x: x[0,1] * x[0,1] + x[2,3],                
+       lambda x: np.array([[0., 2 * x[0,1], 0., 0.], [0.]*4, [0.]*3 + [1.]])],
+      [lambda x: td.sumover(x[:,1] * x[:,1]),
+       lambda x: np.array([[0., 2 * x[k,1], 0., 0.] for k in range(3)])],
+      [lambda x: td.sumover(x[:,1]) + td.sumover(x[:,2]),
+       lambda x: np.array([[0., 1., 1., 0.]]*3)],
+      [lambda x: td.sumover(x[1:3,2]) + td.sumover(x[:,2]),
+       lambda x: np.array([[0., 0., 1., 0.], [0., 0., 2., 0.], [0., 0., 2., 0.]])],
+   ])
+   def test_gradient_getitem_twice(self, fun, ans):
+
+       i, j = td.IndexGen("i", 3), td.IndexGen("j", 4)
+       x    = td.randn((i,j), dtype="float64", seed=1)
+
+       grad = td.gradient(fun)(x)
+
+       assert np.allclose(td.asdata(grad), ans(td.asdata(x)))
+
+
+   def test_reverse_engine(self):
+
+       with pytest.raises(ValueError):
+          td.reverse_engine("sideways")
+
+
    @pytest.mark.parametrize("scalardat, adx", [
       [data.scalar_dat_001, 0], 
       [data.scalar_dat_001, 1],
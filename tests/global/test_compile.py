@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import tests.tensor.data as data
+
+import tadpole.util     as util
+import tadpole.tensor   as tn
+import tadpole.index    as tid
+import tadpole.autodiff as ad
+
+from tests.common import (
+   available_backends,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Compiled functions: trace once, replay many times                      ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Compiled function ----------------------------------------------------- #
+
+@pytest.mark.parametrize("current_backend", available_backends, indirect=True)
+class TestCompile:
+
+   @pytest.fixture(autouse=True)
+   def request_backend(self, current_backend):
+
+       self._backend = current_backend
+
+
+   @property
+   def backend(self):
+
+       return self._backend
+
+
+   def _fun(self, x, y):
+
+       z = x
+       for _ in range(3):
+           z = tn.sin(0.5 * z) * x
+
+       return tn.sumover(tn.sin(z @ y))
+
+
+   def _data(self, seed, shapes=((3,2), (2,4))):
+
+       return data.ntensor_dat(data.randn)(
+                 self.backend, ["ij", "jk"], shapes, seed=seed
+              ) 
+
+
+   @pytest.mark.parametrize("adx", [0, 1, (0,1)])
+   def test_compile(self, adx):
+
+       fun  = ad.jit(self._fun, adx)
+       x, y = self._data(1).tensors
+
+       for seed in range(1, 4):
+
+           x1, _ = self._data(seed).tensors
+           x1    = tn.TensorGen(tn.asdata(x1), tuple(tn.union_inds(x)))
+
+           out, grad = fun(x1, y)
+           ans, ansg = ad.evaluate_with_gradient(self._fun, adx)(x1, y)
+
+           assert tn.allclose(out, ans)
+
+           if isinstance(adx, tuple):
+              assert all(tn.allclose(g, a) for g, a in zip(grad, ansg))
+           else:
+              assert tn.allclose(grad, ansg)
+
+
+   def test_compile_retrace(self):
+
+       fun = ad.jit(self._fun)
+
+       for shapes in [((3,2), (2,4)), ((5,2), (2,4)), ((3,2), (2,4))]:
+
+           x, y      = self._data(1, shapes).tensors
+           out, grad = fun(x, y)
+           ans, ansg = ad.evaluate_with_gradient(self._fun)(x, y)
+
+           assert tn.allclose(out,  ans)
+           assert tn.allclose(grad, ansg)
+
+
+   def test_compile_constant_args(self):
+
+       fun = ad.jit(self._fun)
+       x,  = self._data(1).tensors[:1]
+
+       for seed in range(1, 3):
+
+           _, y      = self._data(seed).tensors
+           out, grad = fun(x, y)
+           ans, ansg = ad.evaluate_with_gradient(self._fun)(x, y)
+
+           assert tn.allclose(out,  ans)
+           assert tn.allclose(grad, ansg)
+
+
+   def test_compile_lru(self):
+
+       fun = ad.jit(self._fun, maxsize=2)
+       x,  = self._data(1).tensors[:1]
+       ys  = [self._data(seed).tensors[1] for seed in range(1, 4)]
+
+       for y in [*ys, ys[1]]:
+           fun(x, y)
+
+       tapes = [tape for _, tape in fun._tapes]
+
+       out, grad = fun(x, ys[2])
+       ans, ansg = ad.evaluate_with_gradient(self._fun)(x, ys[2])
+
+       assert len(tapes) == 2
+       assert None not in tapes
+       assert [tape for _, tape in fun._tapes] == tapes[::-1]
+       assert tn.allclose(out,  ans)
+       assert tn.allclose(grad, ansg)
+
+
+   def test_compile_nondifferentiable(self):
+
+       def fun(x):
+           return tn.sumover(x * tn.sign(x))
+
+       jitfun = ad.jit(fun)
+       x,     = self._data(1).tensors[:1]
+
+       for v in [x, -x, x]:
+
+           out, grad = jitfun(v)
+           ans, ansg = ad.evaluate_with_gradient(fun)(v)
+
+           assert tn.allclose(out,  ans)
+           assert tn.allclose(grad, ansg)
+
+       assert [tape for _, tape in jitfun._tapes] == [None]
+
+
+   def test_compile_structural(self):
+
+       def fun(x):
+           i, j = tn.union_inds(x)
+           y    = tn.sumover(tn.sin(x) * x.space().ones(), (i,))
+
+           return tn.sumover(y * y)
+
+       jitfun = ad.jit(fun)
+       x,     = self._data(1).tensors[:1]
+
+       for v in [x, -2 * x]:
+
+           out, grad = jitfun(v)
+           ans, ansg = ad.evaluate_with_gradient(fun)(v)
+
+           assert tn.allclose(out,  ans)
+           assert tn.allclose(grad, ansg)
+
+       assert all(tape is not None for _, tape in jitfun._tapes)
+
+
+   def test_compile_first_call(self):
+
+       calls = []
+
+       def fun(x, y):
+           calls.append(x)
+           return self._fun(x, y)
+
+       x, y      = self._data(1).tensors
+       out, grad = ad.jit(fun)(x, y)
+       ans, ansg = ad.evaluate_with_gradient(self._fun)(x, y)
+
+       assert len(calls) == 1
+       assert tn.allclose(out,  ans)
+       assert tn.allclose(grad, ansg)
+
+
+   def test_builtin_compile(self):
+
+       import tadpole
+
+       assert not hasattr(tadpole, "compile")
+       assert "compile" not in vars(ad)
+
+
+   def test_compile_nested(self):
+
+       fun  = ad.jit(self._fun)
+       x, y = self._data(1).tensors
+
+       def grad(x):
+           return tn.sumover(fun(x, y)[1])
+
+       def ans(x):
+           return tn.sumover(ad.gradient(self._fun)(x, y))
+
+       assert tn.allclose(ad.gradient(grad)(x), ad.gradient(ans)(x))
+
+
+
+
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+
+import tests.tensor.data as data
+
+import tadpole.util     as util
+import tadpole.tensor   as tn
+import tadpole.index    as tid
+import tadpole.autodiff as ad
+
+from tests.common import (
+   available_backends,
+)
+
+
+from tadpole.index import (
+   IndexGen,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Second derivatives: forward-over-reverse                               ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Hessian-vector product and Hessian ------------------------------------ #
+
+@pytest.mark.parametrize("current_backend", available_backends, indirect=True)
+class TestHessian:
+
+   @pytest.fixture(autouse=True)
+   def request_backend(self, current_backend):
+
+       self._backend = current_backend
+
+
+   @property
+   def backend(self):
+
+       return self._backend
+
+
+   @pytest.mark.parametrize("indnames, shape", [
+      ["i",  (4,)],
+      ["ij", (2,3)],
+   ])
+   def test_hvp(self, indnames, shape):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, indnames, shape, dtype="float64", seed=1
+           )
+       v = data.tensor_dat(data.randn)(
+              self.backend, indnames, shape, dtype="float64", seed=2
+           )
+       v = tn.TensorGen(v.array, x.inds)
+
+       def fun(x):
+           return tn.sumover(x * tn.sin(x))
+
+       out = ad.hvp(fun)(x.tensor, v)
+       ans = (2 * np.cos(x.data) - x.data * np.sin(x.data)) * tn.asdata(v)
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_hvp_profile(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "ij"], [(2,3), (2,3)], dtype="float64"
+           )
+       x, v = w.tensors
+
+       def fun(x):
+           return tn.sumover(x * tn.sin(x))
+
+       with util.profile() as prof:
+          ad.hvp(fun)(x, v)
+
+       phases = {s.phase for s in prof.stats()}
+       names  = {s.name  for s in prof.stats("jvp")}
+
+       assert phases == {"forward", "vjp", "jvp", "backend"}
+       assert "sin" in names
+
+
+   def test_hvp_adx(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "ij", "ij"], [(2,3), (2,3), (2,3)]
+           )
+       x, y, v = w.tensors
+
+       def fun(x, y):
+           return tn.sumover(x * x * y)
+
+       assert tn.allclose(ad.hvp(fun, 0)(x, y, v), 2 * y * v)
+       assert tn.allclose(ad.hvp(fun, 1)(x, y, v), v.space().zeros())
+
+
+   @pytest.mark.parametrize("indnames, shape", [
+      ["i",  (4,)],
+      ["ij", (2,3)],
+   ])
+   def test_hessian(self, indnames, shape):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, indnames, shape, dtype="float64", seed=1
+           )
+       inds = tuple(IndexGen(f"{name}'", size) 
+                       for name, size in zip(indnames, shape))
+
+       def fun(x):
+           return tn.sumover(x * tn.sin(x)) + tn.sumover(x)**2
+
+       out = ad.hessian(fun, inds=inds)(x.tensor)
+       out = tn.transpose(out, *x.inds, *inds)
+
+       ans = np.diag(np.ravel(2 * np.cos(x.data) - x.data * np.sin(x.data)))
+       ans = np.reshape(ans + 2, (*shape, *shape))
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_hessian_inds(self):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "ij", (2,3), dtype="float64", seed=1
+           )
+
+       def fun(x):
+           return tn.sumover(x * tn.sin(x)) + tn.sumover(x)**2
+
+       out  = ad.hessian(fun)(x.tensor)
+       inds = tuple(ind for ind in tn.union_inds(out) if ind not in x.inds)
+
+       assert len(inds) == 2
+       assert tuple(map(len, inds)) == (2,3)
+
+       out = tn.transpose(out, *x.inds, *inds)
+
+       ans = np.diag(np.ravel(2 * np.cos(x.data) - x.data * np.sin(x.data)))
+       ans = np.reshape(ans + 2, (2,3,2,3))
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_hessian_nested(self):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "i", (3,), dtype="float64", seed=1
+           )
+       v = tn.TensorGen(np.ones(3), x.inds)
+
+       def fun(x):
+           return tn.sumover(tn.sin(x))
+
+       out = ad.gradient(lambda x: tn.sumover(ad.hvp(fun)(x, v)))(x.tensor)
+
+       assert np.allclose(tn.asdata(out), -np.cos(x.data))
+
+
+
+
+
+
+   @pytest.mark.parametrize("engine", ["tape", "parallel"])
+   def test_hessian_nested_engine(self, engine):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "i", (3,), dtype="float64", seed=1
+           )
+       v = tn.TensorGen(np.ones(3), x.inds)
+
+       def fun(x):
+           return tn.sumover(tn.sin(x))
+
+       with ad.reverse_engine(engine):
+          out = ad.gradient(lambda x: tn.sumover(ad.hvp(fun)(x, v)))(x.tensor)
+
+       assert np.allclose(tn.asdata(out), -np.cos(x.data))
@@ -155,6 +155,159 @@ class TestCheckpoint:
 
 
 
+# --- Checkpointed loop wrap ------------------------------------------------ #
+
+@pytest.mark.parametrize("current_backend", available_backends, indirect=True)
+class TestCheckpointLoop:
+
+   @pytest.fixture(autouse=True)
+   def request_backend(self, current_backend):
+
+       self._backend = current_backend
+
+
+   @property
+   def backend(self):
+
+       return self._backend
+
+
+   @pytest.mark.parametrize("nsteps, snapshots", [
+      [1,  1],
+      [7,  1],
+      [7,  2],
+      [20, 3],
+      [20, 25],
+   ])
+   def test_checkpoint_loop(self, nsteps, snapshots):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "ij", (2,3), dtype="float64", seed=1
+           )
+
+       def step(x):
+           return tn.sin(1.1 * x + 0.1)
+
+       loop = ad.checkpoint_loop(step, nsteps, snapshots)
+
+       def fun1(x):
+           for _ in range(nsteps):
+               x = step(x)
+           return tn.sumover(x)
+
+       def fun2(x):
+           return tn.sumover(loop(x))
+
+       assert tn.allclose(
+                 fun1(x.tensor), 
+                 fun2(x.tensor)
+              )
+       assert tn.allclose(
+                 ad.gradient(fun1)(x.tensor), 
+                 ad.gradient(fun2)(x.tensor)
+              )
+
+
+   @pytest.mark.parametrize("nsteps, snapshots", [
+      [7, 2],
+   ])
+   def test_checkpoint_loop_nested(self, nsteps, snapshots):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "ij", (2,3), dtype="float64", seed=1
+           )
+
+       def step(x):
+           return tn.sin(1.1 * x + 0.1)
+
+       loop = ad.checkpoint_loop(step, nsteps, snapshots)
+
+       def fun1(x):
+           for _ in range(nsteps):
+               x = step(x)
+           return tn.sumover(x)
+
+       def fun2(x):
+           return tn.sumover(loop(x))
+
+       def hess(fun):
+           return ad.gradient(lambda x: tn.sumover(ad.gradient(fun)(x)))
+
+       assert tn.allclose(
+                 hess(fun1)(x.tensor), 
+                 hess(fun2)(x.tensor)
+              )
+
+
+   @pytest.mark.parametrize("nsteps, snapshots", [
+      [0,  2],
+      [1,  1],
+      [4,  2],
+      [7,  1],
+      [20, 3],
+   ])
+   def test_checkpoint_loop_params(self, nsteps, snapshots):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "ij", (2,3), dtype="float64", seed=1
+           )
+
+       beta = 1.3 * x.tensor.space().ones()
+
+       def step(x, beta):
+           return tn.sin(x) * beta
+
+       loop = ad.checkpoint_loop(step, nsteps, snapshots)
+
+       def fun1(x, beta):
+           for _ in range(nsteps):
+               x = step(x, beta)
+           return tn.sumover(x)
+
+       def fun2(x, beta):
+           return tn.sumover(loop(x, beta))
+
+       for adx in [0, 1, (0,1)]:
+
+           grad1 = ad.gradient(fun1, adx)(x.tensor, beta)
+           grad2 = ad.gradient(fun2, adx)(x.tensor, beta)
+
+           if not isinstance(adx, tuple):
+              grad1, grad2 = (grad1,), (grad2,)
+
+           for g1, g2 in zip(grad1, grad2):
+               assert tn.allclose(g1, g2)
+
+
+   def test_checkpoint_loop_recomputation(self):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, "ij", (2,3), dtype="float64", seed=1
+           )
+
+       calls = []
+
+       def step(x):
+           calls.append(x)
+           return tn.sin(x)
+
+       def ncalls(snapshots):
+
+           calls.clear()
+           loop = ad.checkpoint_loop(step, 20, snapshots)
+           ad.gradient(lambda x: tn.sumover(loop(x)))(x.tensor)
+
+           return len(calls)
+
+       assert ncalls(1) == 20 + 20 * 21 // 2
+       assert ncalls(3) <  ncalls(2) < ncalls(1)
+       assert ncalls(20) == 3 * 20 - 1
+
+
+   def test_checkpoint_loop_invalid(self):
+
+       with pytest.raises(ValueError):
+          ad.checkpoint_loop(tn.sin, 10, 0)
 
 
 
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+
+import tadpole.util          as util
+import tadpole.autodiff      as ad
+import tadpole.autodiff.grad as agrad
+import tadpole.array         as ar
+import tadpole.tensor        as tn
+import tadpole.linalg        as la
+import tadpole.index         as tid
+
+import tests.tensor.fakes as fake
+import tests.tensor.data  as data
+
+
+from tests.common import (
+   available_backends,
+)
+
+
+from tadpole.autodiff.types import (
+   Node,
+)
+
+
+from tadpole.index import (
+   Index,
+   IndexGen,
+   IndexBatch,
+   IndexTangent,
+   Indices,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Vectorizing map over a batch index                                     ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Vmap ------------------------------------------------------------------ #
+
+@pytest.mark.parametrize("current_backend", available_backends, indirect=True)
+class TestVmap:
+
+   @pytest.fixture(autouse=True)
+   def request_backend(self, current_backend):
+
+       self._backend = current_backend
+
+
+   @property
+   def backend(self):
+
+       return self._backend
+
+
+   # --- Contraction --- #
+
+   @pytest.mark.parametrize("in_axes", [0, "b", (0, "b")])
+   def test_contract(self, in_axes):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij", "bjk"], [(4,2,3), (4,3,5)]
+           )
+
+       out = tn.vmap(lambda x, y: x @ y, in_axes)(*w.tensors)
+       ans = np.einsum("bij,bjk->bik", *map(tn.asdata, w.tensors))
+
+       assert tuple(tn.union_inds(out)) == w.inds.map(*"bik")
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_contract_unmapped(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij", "jk"], [(4,2,3), (3,5)]
+           )
+
+       out = tn.vmap(lambda x, y: x @ y, (0, None))(*w.tensors)
+       ans = np.einsum("bij,jk->bik", *map(tn.asdata, w.tensors))
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_contract_batch_index(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(4,3), (3,5)]
+           )
+
+       b = IndexBatch("batch", 2)
+       x = tn.expand(w.tensors[0], (b,))
+       y = tn.expand(w.tensors[1], (b,))
+
+       out = tn.contract(x, y)
+
+       assert tuple(tn.union_inds(out)) == (b, *w.inds.map(*"ik"))
+       assert np.allclose(
+          tn.asdata(out), np.einsum("ij,jk->ik", *w.datas)[None]
+       )
+
+
+   # --- Elementwise and reduction --- #
+
+   def test_elemwise(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij", "j"], [(4,2,3), (3,)]
+           )
+
+       out = tn.vmap(lambda x, y: tn.sin(x) * y, (0, None))(*w.tensors)
+       ans = np.sin(w.datas[0]) * w.datas[1]
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_elemwise_broadcast(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij", "bj"], [(4,2,3), (4,3)]
+           )
+
+       out = tn.vmap(lambda x, y: x * y)(*w.tensors)
+       ans = w.datas[0] * w.datas[1][:, None, :]
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_sumover(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ibj"], [(2,4,3)]
+           )
+
+       out = tn.vmap(lambda x: tn.sumover(x), "b")(*w.tensors)
+
+       assert tuple(tn.union_inds(out)) == w.inds.map("b")
+       assert np.allclose(tn.asdata(out), w.datas[0].sum(axis=(0,2)))
+
+
+   # --- Linalg decompositions --- #
+
+   def test_svd(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bijk"], [(4,2,3,5)]
+           )
+
+       i = w.inds.map("i")
+
+       U, S, VH, error = tn.vmap(lambda x: la.svd(x, linds=i))(*w.tensors)
+
+       ans = np.linalg.svd(
+          np.reshape(w.datas[0], (4,2,15)), full_matrices=False
+       )
+
+       assert np.allclose(tn.asdata(S), ans[1])
+       assert tn.allclose(
+          tn.vmap(lambda u, s, v: (u * s) @ v)(U, S, VH), w.tensors[0]
+       )
+
+
+   def test_qr(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij"], [(4,5,3)]
+           )
+
+       Q, R = tn.vmap(lambda x: la.qr(x, linds=w.inds.map("i")))(*w.tensors)
+
+       assert tn.allclose(tn.vmap(lambda q, r: q @ r)(Q, R), w.tensors[0])
+
+
+   # --- Gradients --- #
+
+   def test_grad(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij", "jk"], [(4,2,3), (3,5)]
+           )
+
+       x, y = w.tensors
+       b, i, k = w.inds.map(*"bik")
+
+       def fun(y):
+           return tn.sumover(tn.sin(tn.vmap(lambda x, y: x @ y, (0, None))(x, y)))
+
+       def ans(y):
+           return tn.sumover(tn.sin(tn.contract(x, y, product=(b,i,k))))
+
+       assert tn.allclose(ad.gradient(fun)(y), ad.gradient(ans)(y))
+
+
+   @pytest.mark.parametrize("decomp", ["svd", "qr"])
+   def test_grad_decomp(self, decomp):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij"], [(3,4,2)], dtype="float64"
+           )
+
+       x,   = w.tensors
+       b, i = w.inds.map(*"bi")
+
+       def decompfun(x):
+           return tn.sin(getattr(la, decomp)(x, linds=(i,))[1])
+
+       def fun(x):
+           return tn.sumover(tn.vmap(decompfun, b)(x))
+
+       def ans(x):
+           return sum(tn.sumover(decompfun(x[k])) for k in range(len(b)))
+
+       assert tn.allclose(ad.gradient(fun)(x), ad.gradient(ans)(x))
+
+
+   def test_grad_decomp_stacked(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["bij"], [(5,4,2)], dtype="float64"
+           )
+
+       x,   = w.tensors
+       b, i = w.inds.map(*"bi")
+
+       def decompfun(x):
+           return tn.sin(la.svd(x, linds=(i,))[1])
+
+       def fun(x):
+           return tn.sumover(tn.vmap(decompfun, b)(x))
+
+       with util.profile() as prof:
+          ad.gradient(fun)(x)
+
+       stats = {(s.phase, s.name): s for s in prof.stats()}
+
+       assert stats["forward", "concat"].calls    == 1
+       assert stats["forward", "ungetitem"].calls  < len(b)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Jacobian from a batch of tangent seeds                                 ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Jacobian -------------------------------------------------------------- #
+
+@pytest.mark.parametrize("current_backend", available_backends, indirect=True)
+class TestJacobian:
+
+   @pytest.fixture(autouse=True)
+   def request_backend(self, current_backend):
+
+       self._backend = current_backend
+
+
+   @property
+   def backend(self):
+
+       return self._backend
+
+
+   @pytest.mark.parametrize("mode", [None, "forward", "reverse"])
+   def test_jacobian(self, mode):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(3,2), (2,4)], dtype="float64"
+           )
+
+       x, y    = w.tensors
+       i, j, k = w.inds.map(*"ijk")
+       p, q    = IndexGen("p", 3), IndexGen("q", 2)
+
+       out = tn.jacobian(lambda x: tn.sin(x) @ y, inds=(p,q), mode=mode)(x)
+       ans = np.einsum("ip,pq,qk->ikpq", np.eye(3), np.cos(w.datas[0]), w.datas[1])
+
+       assert tuple(tn.union_inds(out)) == (i,k,p,q)
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   @pytest.mark.parametrize("mode", [None, "forward", "reverse"])
+   def test_jacobian_scalar(self, mode):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij"], [(3,2)], dtype="float64"
+           )
+
+       x,   = w.tensors
+       p, q = IndexGen("p", 3), IndexGen("q", 2)
+
+       out = tn.jacobian(lambda x: tn.sumover(x * x), inds=(p,q), mode=mode)(x)
+
+       assert tuple(tn.union_inds(out)) == (p,q)
+       assert np.allclose(tn.asdata(out), 2 * w.datas[0])
+
+
+   @pytest.mark.parametrize("mode", [None, "forward", "reverse"])
+   def test_jacobian_reindex(self, mode):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij"], [(3,2)], dtype="float64"
+           )
+
+       x,   = w.tensors
+       i, j = w.inds.map(*"ij")
+       p, q = IndexGen("p", 3), IndexGen("q", 2)
+
+       def fun(x):
+           return tn.sumover(tn.exp(tn.transpose(x, j, i)), (j,))
+
+       out = tn.jacobian(fun, inds=(p,q), mode=mode)(x)
+       ans = np.einsum("ip,pq->ipq", np.eye(3), np.exp(w.datas[0]))
+
+       assert tuple(tn.union_inds(out)) == (i,p,q)
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   @pytest.mark.parametrize("mode", [None, "forward", "reverse"])
+   def test_jacobian_dual_inds(self, mode):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(3,2), (2,4)], dtype="float64"
+           )
+
+       x, y    = w.tensors
+       i, j, k = w.inds.map(*"ijk")
+
+       out = tn.jacobian(lambda x: tn.sin(x) @ y, mode=mode)(x)
+       ans = np.einsum("ip,pq,qk->ikpq", np.eye(3), np.cos(w.datas[0]), w.datas[1])
+
+       assert tuple(tn.union_inds(out))[:2] == (i,k)
+       assert not set(tuple(tn.union_inds(out))[2:]) & {i,j,k}
+       assert out.shape == (3,4,3,2)
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   @pytest.mark.parametrize("size, graphs", [[1, 1], [4, 2]])
+   def test_jacobian_auto_graphs(self, size, graphs):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(3,2), (2,size)], dtype="float64"
+           )
+
+       x, y  = w.tensors
+       p, q  = IndexGen("p", 3), IndexGen("q", 2)
+       calls = []
+
+       def fun(x):
+           calls.append(isinstance(x, Node))
+           return tn.sin(x) @ y
+
+       tn.jacobian(fun, inds=(p,q))(x)
+
+       assert calls == [True] * graphs
+
+
+   def test_tangent_seeds(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij"], [(3,2)], dtype="float64"
+           )
+
+       x,   = w.tensors
+       i, j = w.inds.map(*"ij")
+       t    = IndexTangent("tangent", 4)
+
+       seeds = tn.randn((t,i,j), dtype="float64", backend=self.backend)
+
+       op  = agrad.diffop_forward(lambda x: tn.sin(x) * x, x)
+       out = op.grad(seeds)
+
+       ans = (np.cos(w.datas[0]) * w.datas[0] + np.sin(w.datas[0]))
+       ans = ans[None] * tn.asdata(seeds)
+
+       assert tuple(tn.union_inds(out)) == (t,i,j)
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   def test_invalid_mode(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij"], [(3,2)], dtype="float64"
+           )
+
+       with pytest.raises(ValueError):
+          tn.jacobian(tn.sin, inds=w.inds, mode="sideways")(*w.tensors)
+
+
+
+
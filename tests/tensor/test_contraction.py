@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
+import sys
 import pytest
+import textwrap
+import subprocess
 import collections
 import itertools
 import numpy as np
+import opt_einsum as oe
 
 import tadpole.util     as util
 import tadpole.autodiff as ad
@@ -15,6 +20,8 @@ import tadpole.index    as tid
 import tadpole.array.backends     as backends
 import tadpole.tensor.contraction as tnc
 import tadpole.tensor.engine      as tne 
+import tadpole.tensor.planning    as tnp
+import tadpole.tensor.execution   as tnx
 
 import tests.tensor.fakes as fake
 import tests.tensor.data  as data
@@ -72,6 +79,57 @@ class TestMakeEquation:
        assert tnc.make_equation(input_inds, output_inds) == equation
 
 
+   @pytest.mark.parametrize("shapes, inds, outinds, sublists", [
+      [[(3,4,4),                   ], ["ijj",              ], "i",    (((0,1,1),), (0,))                         ],  
+      [[(3,4,6), (6,3,4)           ], ["ijk", "kij",       ], "",     (((0,1,2), (2,0,1)), ())                   ], 
+      [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], "imq",  (((0,1,2), (2,3,4), (4,5,3,1)), (0,4,5))   ],
+   ]) 
+   def test_make_sublists(self, shapes, inds, outinds, sublists):
+
+       w = data.nindices_dat(inds, shapes)
+
+       input_inds  = tuple(w.inds.map(*xinds) for xinds in inds)
+       output_inds = w.inds.map(*outinds)
+
+       assert tnc.make_sublists(input_inds, output_inds) == sublists
+
+
+   @pytest.mark.parametrize("nsymbols", [4, 52, 53, 80])
+   def test_contraction_equation(self, nsymbols):
+
+       inds = tuple(IndexGen(f"i{n}", 1) for n in range(nsymbols))
+
+       input_inds  = (inds[:nsymbols // 2], inds[nsymbols // 2:])
+       output_inds = inds
+
+       out = tnc.contraction_equation(input_inds, output_inds)
+
+       if nsymbols > tnc.MAX_SYMBOLS:
+          assert out == tnc.make_sublists(input_inds, output_inds)
+       else:
+          assert out == tnc.make_equation(input_inds, output_inds)
+
+
+   @pytest.mark.parametrize("shapes, inds, outinds, pairwise", [
+      [[(3,4,6), (6,2,5)           ], ["ijk", "klm",       ], "ijlm", (((2,), (0,)), (0,1,2,3))],  
+      [[(3,4,6), (6,2,5)           ], ["ijk", "klm",       ], "mlji", (((2,), (0,)), (3,2,1,0))],  
+      [[(3,4,6), (6,3,4)           ], ["ijk", "kij",       ], "",     (((0,1,2), (1,2,0)), ()) ], 
+      [[(3,4,6), (2,5)             ], ["ijk", "lm",        ], "ijklm",(((), ()), (0,1,2,3,4))],
+      [[(3,4,6), (6,3,4)           ], ["ijk", "kij",       ], "i",    None                     ], 
+      [[(3,4,6), (6,2,5)           ], ["ijk", "klm",       ], "ilm",  None                     ],  
+      [[(3,4,4), (4,2)             ], ["ijj", "jl",        ], "il",   None                     ],  
+      [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], "iq",   None                     ], 
+   ]) 
+   def test_make_pairwise(self, shapes, inds, outinds, pairwise):
+
+       w = data.nindices_dat(inds, shapes)
+
+       input_inds  = tuple(w.inds.map(*xinds) for xinds in inds)
+       output_inds = w.inds.map(*outinds)
+
+       assert tnc.make_pairwise(input_inds, output_inds) == pairwise
+
+
 
 
 # --- Index products -------------------------------------------------------- #
@@ -210,6 +268,342 @@ class TestTensorContract:
        assert out.space() == ans.space()
 
 
+   @pytest.mark.parametrize("shapes, inds, outinds, equation", [
+      [[(3,4,6), (6,2,5)], ["ijk", "klm"], "ijlm",  "ijk,klm->ijlm" ],  
+      [[(3,4,6), (6,2,5)], ["ijk", "klm"], "mlji",  "ijk,klm->mlji" ],  
+      [[(3,4,6), (6,3,4)], ["ijk", "kij"], "",      "ijk,kij->"     ], 
+      [[(3,4,6), (2,5)  ], ["ijk", "lm" ], "ijklm", "ijk,lm->ijklm" ],
+      [[(3,4,6), (6,3,4)], ["ijk", "kij"], "i",     "ijk,kij->i"    ], 
+   ])   
+   def test_contract_pairwise(self, shapes, inds, outinds, equation):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       tn.contract_cache_clear()
+
+       out = tn.contract(*w.tensors, product=outinds)
+       ans = ar.einsum(equation, *w.arrays)
+       ans = tn.TensorGen(ans, w.inds.map(*outinds))
+
+       assert tn.allclose(out, ans)
+       assert out.space() == ans.space()
+
+       pairwise = tnc.make_pairwise(
+                     tuple(w.inds.map(*xinds) for xinds in inds), 
+                     w.inds.map(*outinds)
+                  )
+       einsums  = tn.contract_cache_info().currsize 
+
+       assert einsums == (0 if pairwise else 1)
+
+
+   @pytest.mark.parametrize("size", [30, 40])
+   def test_contract_many_symbols(self, size):
+
+       bonds = [IndexGen(f"b{n}", 2) for n in range(size)]
+       opens = [IndexGen(f"o{n}", 2) for n in range(size)]
+
+       xs = [
+          tn.randn((bonds[n], opens[n], bonds[(n + 1) % size]),
+                   backend=self.backend, seed=n)
+             for n in range(size)
+       ]
+
+       out = tn.contract(*xs, product=opens[:3])
+       ans = oe.contract(*util.concat(
+                (tn.asdata(x), [n, size + n, (n + 1) % size])
+                   for n, x in enumerate(xs)
+             ), [size, size + 1, size + 2])
+
+       assert np.allclose(tn.asdata(out), ans)
+
+
+   @pytest.mark.parametrize("shapes, inds", [
+      [[(3,4), (4,5), (5,6)        ], ["ij", "jk", "kl"       ]],  
+      [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"]], 
+   ])   
+   def test_contract_cache(self, shapes, inds):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       tn.contract_cache_clear()
+
+       ans = tn.contract(*w.tensors)
+
+       for _ in range(5):
+           out = tn.contract(*w.tensors)
+           assert tn.allclose(out, ans)
+
+       info = tn.contract_cache_info()
+
+       assert info.misses == 1
+       assert info.hits   == 5
+
+
+   # --- Contraction plan --- #
+
+   @pytest.mark.parametrize("shapes, inds, outinds, equation", [
+      [[(3,4,6), (6,2,5)           ], ["ijk", "klm",       ], "ijlm", "ijk,klm->ijlm"   ],  
+      [[(3,4,6), (6,2,5), (5,7,2,4)], ["ijk", "klm", "mqlj"], "iq",   "ijk,klm,mqlj->iq"], 
+      [[(3,4), (4,5), (5,6), (6,3) ], ["ij", "jk", "kl", "li"], "",   "ij,jk,kl,li->"   ],
+   ])   
+   @pytest.mark.parametrize("optimizer", [
+      "auto", "greedy", "optimal", "dp", "random-greedy",
+   ])
+   def test_plan(self, shapes, inds, outinds, equation, optimizer):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       plan = tn.plan(*w.tensors, optimizer=optimizer)
+
+       assert plan.optimizer == optimizer
+       assert len(plan.path) == max(len(shapes) - 1, 1)
+       assert plan.flops > 0
+
+       out = tn.contract(*w.tensors, plan=plan)
+       ans = ar.einsum(equation, *w.arrays)
+       ans = tn.TensorGen(ans, w.inds.map(*outinds))
+
+       assert tn.allclose(out, ans)
+       assert out.space() == ans.space()
+
+
+   @pytest.mark.parametrize("shapes, inds", [
+      [[(3,4), (4,5), (5,6), (6,3)], ["ij", "jk", "kl", "li"]],
+   ])   
+   def test_plan_reuse(self, shapes, inds):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       plan = tn.plan(*w.tensors, optimizer="dp")
+
+       for _ in range(3):
+           xs  = [tn.space(x).randn() for x in w.tensors]
+           out = tn.contract(*xs, plan=plan)
+           ans = tn.contract(*xs)
+           assert tn.allclose(out, ans)
+
+       out = tn.contract(w.tensors[0], w.tensors[1], plan=plan)
+       ans = tn.contract(w.tensors[0], w.tensors[1])
+
+       assert tn.allclose(out, ans)
+
+
+   def test_plan_hash(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "kl"], [(3,4), (4,5), (5,6)]
+           )
+
+       plan1 = tn.plan(*w.tensors, optimizer="dp")
+       plan2 = tn.plan(*w.tensors, optimizer="dp")
+
+       assert plan1 is not plan2
+       assert plan1 == plan2
+       assert hash(plan1) == hash(plan2)
+       assert len({plan1, plan2}) == 1
+
+
+   # --- Sliced contraction --- #
+
+   @pytest.mark.parametrize("shapes, inds, outinds, equation, max_memory", [
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], "l", "ij,jk,klm,mi->l", 400],
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], "l", "ij,jk,klm,mi->l", 240],
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], "l", "ij,jk,klm,mi->l", 160],
+      [[(6,7), (7,8), (8,9)           ], ["ij", "jk", "kl"       ], "il", "ij,jk,kl->il",   64 ],
+      [[(6,7), (7,8)                  ], ["ij", "jk"             ], "ik", "ij,jk->ik",      160],
+   ])   
+   def test_contract_sliced(self, shapes, inds, outinds, equation, max_memory):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       plan = tn.plan(*w.tensors, max_memory=max_memory)
+
+       assert plan.nslices > 1
+       assert plan.peak_memory <= max_memory
+
+       out = tn.contract(*w.tensors, max_memory=max_memory)
+       ans = ar.einsum(equation, *w.arrays)
+       ans = tn.TensorGen(ans, w.inds.map(*outinds))
+
+       assert tn.allclose(out, ans)
+       assert out.space() == ans.space()
+
+       out = tn.contract(*w.tensors, plan=plan)
+
+       assert tn.allclose(out, ans)
+       assert out.space() == ans.space()
+
+
+   def test_plan_peak_pairwise(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(6,7), (7,8)]
+           )
+
+       plan = tn.plan(*w.tensors, max_memory=10**6)
+       size = 6 * 8 * tnp.itemsize(w.arrays[0].dtype)
+
+       assert plan.nslices     == 1
+       assert plan.peak_memory == size
+
+
+   def test_contract_sliced_fail(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "kl"], [(6,7), (7,8), (8,9)]
+           )
+
+       with pytest.raises(tn.MemoryBudgetError):
+          tn.contract(*w.tensors, max_memory=1)
+
+
+   @pytest.mark.parametrize("executor", [
+      "serial", "threads", "processes",
+   ])
+   @pytest.mark.parametrize("shapes, inds, outinds, equation, max_memory", [
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], "l", "ij,jk,klm,mi->l", 240],
+      [[(6,7), (7,8), (8,9)           ], ["ij", "jk", "kl"       ], "il", "ij,jk,kl->il",   64 ],
+   ])
+   def test_contract_sliced_executor(self, shapes, inds, outinds, equation,
+                                           max_memory, executor):
+
+       if executor == "processes" and self.backend != "numpy":
+          pytest.skip("Process pool executor requires the numpy backend")
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       out = tn.contract(
+                *w.tensors, max_memory=max_memory, executor=executor
+             )
+       ans = ar.einsum(equation, *w.arrays)
+       ans = tn.TensorGen(ans, w.inds.map(*outinds))
+
+       assert tn.allclose(out, ans)
+       assert out.space() == ans.space()
+
+
+   def test_contract_processes_stderr(self):
+
+       if self.backend != "numpy":
+          pytest.skip("Process pool executor requires the numpy backend")
+
+       script = textwrap.dedent("""
+          import tadpole        as td
+          import tadpole.tensor as tn
+
+          i, j, k, l, m = (
+             td.IndexGen(c, n) for c, n in zip("ijklm", (8,9,10,11,7))
+          )
+
+          xs = [
+             td.randn(inds, seed=seed) for seed, inds in 
+                enumerate([(i,j), (j,k), (k,l,m), (m,i)])
+          ]
+
+          tn.contract(*xs, max_memory=200, executor="processes")
+       """)
+
+       root = os.path.dirname(os.path.dirname(os.path.dirname(
+                 os.path.abspath(__file__)
+              )))
+       proc = subprocess.run(
+                 [sys.executable, "-c", script], capture_output=True, 
+                 text=True, env={**os.environ, "PYTHONPATH": root},
+              )
+
+       assert proc.returncode == 0
+       assert proc.stderr     == ""
+
+
+   @pytest.mark.parametrize("executor", [
+      "serial", "threads", "processes",
+   ])
+   def test_executor_hash(self, executor):
+
+       x = tnx.slice_executor(executor)
+       y = tnx.slice_executor(executor)
+
+       assert x == y
+       assert hash(x) == hash(y)
+       assert len({x, y, tnx.slice_executor("serial")}) == (
+          1 if executor == "serial" else 2
+       )
+
+
+   @pytest.mark.parametrize("shapes, inds, max_memory", [
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], None],
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], 240 ],
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], 160 ],
+      [[(6,7), (7,8), (8,9)           ], ["ij", "jk", "kl"       ], None],
+   ])
+   def test_contract_cost(self, shapes, inds, max_memory):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       plan = tn.plan(*w.tensors, max_memory=max_memory)
+       cost = tn.contract_cost(*w.tensors, max_memory=max_memory)
+
+       itemsize = tnp.itemsize(w.tensors[0].dtype)
+       output   = tn.contract(*w.tensors)
+
+       assert cost.flops               == plan.flops
+       assert cost.intermediate_memory == plan.largest_intermediate * itemsize
+       assert cost.peak_memory         == plan.peak_memory
+       assert cost.nslices             == plan.nslices
+
+       assert cost.input_memory  == itemsize * sum(x.size for x in w.tensors)
+       assert cost.output_memory == itemsize * output.size
+       assert cost.total_memory  == cost.input_memory + cost.peak_memory + (
+          cost.output_memory if set(plan.sliced) & set(tn.union_inds(output))
+             else 0
+       )
+
+       inds = [w.inds.map(*xinds) for xinds in inds]
+       assert tn.contract_cost(
+                 *inds, max_memory=max_memory, dtype=w.tensors[0].dtype
+              ) == cost
+
+
+   def test_plan_unsupported_optimizer(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(3,4), (4,5)]
+           )
+
+       with pytest.raises(tnp.UnsupportedOptimizerError):
+          tn.plan(*w.tensors, optimizer="nonexistent")
+
+
+   def test_plan_hyper(self):
+
+       pytest.importorskip("cotengra")
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "ki"], [(3,4), (4,5), (5,3)]
+           )
+
+       plan = tn.plan(*w.tensors, optimizer="hyper")
+       out  = tn.contract(*w.tensors, plan=plan)
+       ans  = tn.contract(*w.tensors)
+
+       assert tn.allclose(out, ans)
+
+
    # --- Dot product --- #
 
    @pytest.mark.parametrize("shapes, inds, outinds", [
@@ -278,6 +672,31 @@ class TestTensorContract:
        assert out.space() == ans.space()
 
 
+   @pytest.mark.parametrize("shape, inds, traceinds", [
+      [(4,4),       "ij",    "ij" ], 
+      [(3,3,3),     "ijk",   "ijk"], 
+      [(3,4,4),     "ijk",   "jk" ],
+      [(3,4,5,6),   "ijkl",  "ki" ], 
+      [(3,4,5,6,7), "ijklm", "ikl"],
+   ])   
+   def test_untrace(self, shape, inds, traceinds):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, inds, shape
+           )
+
+       g = tn.space(tn.trace(x.tensor, traceinds)).randn()
+       y = tn.untrace(g, traceinds, tn.space(x.tensor))
+
+       assert y.space() == x.tensor.space()
+       size = min(map(len, x.inds.map(*traceinds)))
+
+       assert tn.allclose(tn.trace(y, traceinds), size * g)
+       assert tn.allclose(
+          tn.sumover(y * x.tensor), tn.sumover(g * tn.trace(x.tensor, traceinds))
+       )
+
+
 
 
 
@@ -242,6 +242,44 @@ class TestSparseGrad:
        assert out == w.tensor
 
 
+   @pytest.mark.parametrize("graddat", [
+      data.sparsegrad_dat,
+      data.sparsegrad_dat_001,
+      data.sparsegrad_dat_002,
+      data.sparsegrad_dat_003,
+      data.sparsegrad_dat_004,
+      data.sparsegrad_dat_005,
+   ])
+   def test_addto_sparse(self, graddat):
+
+       w   = graddat(self.backend)
+       out = w.grad.addto(w.grad)
+
+       assert isinstance(out, tn.SparseGrad)
+       assert tn.allclose(out.todense(), 2 * w.tensor)
+
+
+   @pytest.mark.parametrize("graddat", [
+      data.sparsegrad_dat,
+      data.sparsegrad_dat_001,
+      data.sparsegrad_dat_002,
+      data.sparsegrad_dat_003,
+      data.sparsegrad_dat_004,
+      data.sparsegrad_dat_005,
+   ])
+   def test_coalesce(self, graddat):
+
+       w   = graddat(self.backend)
+       out = w.grad
+
+       for _ in range(7):
+           out = w.grad.addto(out)
+
+       assert out.nnz <= w.grad.size
+       assert tn.allclose(out.coalesce().todense(), 8 * w.tensor)
+       assert tn.allclose(out.todense(), 8 * w.tensor)
+
+
    @pytest.mark.parametrize("graddat", [
       data.sparsegrad_dat,
       data.sparsegrad_dat_001,
@@ -452,6 +490,51 @@ class TestTensorGen:
        assert out == w.tensor
 
 
+   @pytest.mark.parametrize("inds, shape, dtype", [
+      ["ijk", (2,3,4), "complex128"],
+   ])
+   def test_addto(self, inds, shape, dtype):
+
+       w = data.tensor_dat(data.randn)(
+              self.backend, inds, shape, dtype=dtype
+           )
+       x   = w.tensor.copy()
+       out = w.tensor.addto(x)
+
+       assert out is not x
+       assert tn.allclose(out, 2 * w.tensor)
+       assert tn.allclose(x, w.tensor)
+
+
+   @pytest.mark.parametrize("inds, shape, dtype", [
+      ["ijk", (2,3,4), "complex128"],
+   ])
+   def test_addto_inplace(self, inds, shape, dtype):
+
+       w = data.tensor_dat(data.randn)(
+              self.backend, inds, shape, dtype=dtype
+           )
+       x   = w.tensor.copy()
+       out = w.tensor.addto(x, inplace=True)
+
+       assert out is x
+       assert tn.allclose(x, 2 * w.tensor)
+
+
+   @pytest.mark.parametrize("inds, shape, dtype", [
+      ["ijk", (2,3,4), "complex128"],
+   ])
+   def test_addto_inplace_null(self, inds, shape, dtype):
+
+       w = data.tensor_dat(data.randn)(
+              self.backend, inds, shape, dtype=dtype
+           )
+       out = w.tensor.addto(w.tensor.tonull(), inplace=True)
+
+       assert out is not w.tensor
+       assert out == w.tensor
+
+
    @pytest.mark.parametrize("inds, shape, dtype", [
       ["ijk", (2,3,4), "complex128"],
    ])
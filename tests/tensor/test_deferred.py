@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import operator
+import functools
+import collections
+import itertools
+import numpy as np
+
+import tadpole.util     as util
+import tadpole.autodiff as ad
+import tadpole.array    as ar
+import tadpole.tensor   as tn
+import tadpole.index    as tid
+
+import tadpole.array.backends  as backends
+import tadpole.tensor.deferred as dfr
+
+import tests.tensor.fakes as fake
+import tests.tensor.data  as data
+
+
+from tests.common import (
+   available_backends,
+)
+
+
+from tadpole.index import (
+   Index,
+   IndexGen,
+   Indices,
+)
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Lazy mode: deferred contractions and elementwise operations            ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Lazy tensor ----------------------------------------------------------- #
+
+@pytest.mark.parametrize("current_backend", available_backends, indirect=True)
+class TestLazyTensor:
+
+   @pytest.fixture(autouse=True)
+   def request_backend(self, current_backend):
+
+       self._backend = current_backend
+
+
+   @property
+   def backend(self):
+
+       return self._backend
+
+
+   # --- Deferred contraction --- #
+
+   @pytest.mark.parametrize("shapes, inds", [
+      [[(3,4), (4,5), (5,6), (6,7)        ], ["ij", "jk", "kl", "lm"        ]],
+      [[(3,4,6), (6,2,5), (5,7,2,4)       ], ["ijk", "klm", "mqlj"          ]],
+      [[(3,4), (4,5), (4,6)               ], ["ij", "jk", "jl"              ]],
+      [[(3,4), (4,5), (5,6), (6,3)        ], ["ij", "jk", "kl", "li"        ]],
+   ])
+   def test_matmul(self, shapes, inds):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       ans = functools.reduce(operator.matmul, w.tensors)
+
+       with tn.lazy():
+          out = functools.reduce(operator.matmul, w.tensors)
+          assert isinstance(out, tn.LazyTensor)
+
+       assert tn.allclose(out, ans)
+       assert out.space() == ans.space()
+
+
+   def test_matmul_flattened(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "kl", "lm"], [(3,4), (4,5), (5,6), (6,7)]
+           )
+
+       with tn.lazy():
+          out = functools.reduce(operator.matmul, w.tensors)
+
+       assert len(out._node._operands()) == 4
+
+
+   def test_matmul_eager(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk"], [(3,4), (4,5)]
+           )
+
+       out = w.tensors[0] @ w.tensors[1]
+
+       assert not isinstance(out, tn.LazyTensor)
+       assert tn.allclose(out, tn.contract(*w.tensors))
+
+
+   # --- Common subexpressions --- #
+
+   def test_shared(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "kl", "km"], [(3,4), (4,5), (5,6), (5,7)]
+           )
+
+       x, y, u, v = w.tensors
+
+       with tn.lazy():
+          env  = x @ y
+          out1 = env @ u
+          out2 = env @ v
+          out3 = (x @ y) @ u
+
+       assert out1._node is out3._node
+       assert env._node._users == 2
+       assert len(out1._node._operands()) == 2
+
+       assert tn.allclose(out1, tn.contract(x, y, u))
+       assert tn.allclose(out2, tn.contract(x, y, v))
+
+       assert env._node.evaluated()
+
+
+   def test_shared_handle(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "kl"], [(3,4), (4,5), (5,6)]
+           )
+
+       x, y, u = w.tensors
+
+       with tn.lazy():
+          env = x @ y
+          out = env @ u
+
+       assert len(out._node._operands()) == 2
+
+       with util.profile() as prof:
+          out.force()
+          assert env._node.evaluated()
+          env.force()
+
+       stats = {(s.phase, s.name): s for s in prof.stats()}
+
+       assert stats["forward", "contract"].calls == 2
+       assert tn.allclose(out, tn.contract(x, y, u))
+       assert tn.allclose(env, tn.contract(x, y))
+
+
+   # --- Deferred elementwise operations --- #
+
+   def test_elemwise(self):
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, ["ij", "jk", "ik"], [(3,4), (4,5), (3,5)]
+           )
+
+       x, y, z = w.tensors
+
+       with tn.lazy():
+          out = 2 * (x @ y) - z / 3 + (-z)
+          assert isinstance(out, tn.LazyTensor)
+
+       ans = 2 * (x @ y) - z / 3 + (-z)
+
+       assert tn.allclose(out, ans)
+
+
+
+
@@ -114,6 +114,23 @@ class TestTensorSpace:
        assert x.reshape(inds2) == ans
 
 
+   @pytest.mark.parametrize("dtype", ["complex128"])
+   @pytest.mark.parametrize("shape", [(2,3,4)])
+   @pytest.mark.parametrize("inds",  ["ijk"])
+   def test_dual(self, dtype, shape, inds):
+
+       v = data.indices_dat(inds, shape)
+       x = tn.TensorSpace(
+              ar.ArraySpace(backends.get(self.backend), shape, dtype), v.inds
+           )
+
+       out = x.dual()
+
+       assert out.shape == x.shape
+       assert out.dtype == x.dtype
+       assert not set(tn.union_inds(out.zeros())) & set(v.inds)
+
+
    # --- Gradient factories --- #
 
    @pytest.mark.parametrize("graddat", [
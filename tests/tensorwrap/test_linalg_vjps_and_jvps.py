@@ -41,6 +41,7 @@ from tadpole.index import (
    Index,
    IndexGen, 
    IndexLit, 
+   IndexBatch,
    Indices,
 )
 
@@ -290,6 +291,40 @@ class TestGradsDecomp:
 
 
 
+   @pytest.mark.parametrize("decomp", ["svd", "qr", "lq"])
+   @pytest.mark.parametrize("shape",  [(3,4), (4,3)])
+   def test_batched(self, decomp, shape):
+
+       bind = IndexBatch("b", 2)
+       lind = IndexGen("l", shape[0])
+       rind = IndexGen("r", shape[1])
+
+       x = tn.randn((bind, lind, rind), dtype="float64", backend=self.backend)
+
+       def fun(x):
+           return getattr(la, decomp)(x, sind="s")
+
+       assert_grad(fun, order=1)(x)
+
+
+   @pytest.mark.parametrize("decomp", ["eig", "eigh"])
+   def test_batched_square(self, decomp):
+
+       bind = IndexBatch("b", 2)
+       lind = IndexGen("l", 3)
+       rind = IndexGen("r", 3)
+
+       x = tn.randn((bind, lind, rind), dtype="float64", backend=self.backend)
+
+       def fun(x):
+           x = x + tn.transpose(x(bind, rind, lind), bind, lind, rind)
+           return getattr(la, decomp)(x, sind="s")
+
+       assert_grad(fun, order=1)(x)
+
+
+
+
 ###############################################################################
 ###                                                                         ###
 ###  Linalg decomposition grads: auxiliary tests                            ###
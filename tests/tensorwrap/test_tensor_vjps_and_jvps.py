@@ -884,6 +884,59 @@ class TestGradsContraction:
            assert_grad(fun, i)(*w.tensors, product=outinds) 
 
 
+   @pytest.mark.parametrize("shapes, inds", [
+      [[(3,4,6),   (6,2,5), (5,7,2,4)], ["ijk",  "klm", "mqlj"]], 
+      [[(3,4),     (4,5),   (5,6), (6,3)], ["ij", "jk", "kl", "li"]], 
+   ])    
+   @pytest.mark.parametrize("optimizer", ["greedy", "dp"])
+   def test_contract_plan(self, shapes, inds, optimizer):
+
+       def fun(*xs, plan=None):
+           return tn.contract(*xs, plan=plan)
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       plan = tn.plan(*w.tensors, optimizer=optimizer)
+
+       for i in range(len(w.tensors)):
+           assert_grad(fun, i)(*w.tensors, plan=plan) 
+
+
+   @pytest.mark.parametrize("shapes, inds, max_memory", [
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], 400],
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], 240],
+   ])    
+   def test_contract_sliced(self, shapes, inds, max_memory):
+
+       def fun(*xs, max_memory=None):
+           return tn.contract(*xs, max_memory=max_memory)
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       for i in range(len(w.tensors)):
+           assert_grad(fun, i)(*w.tensors, max_memory=max_memory)
+
+
+   @pytest.mark.parametrize("shapes, inds, max_memory", [
+      [[(8,9), (9,10), (10,11,7), (7,8)], ["ij", "jk", "klm", "mi"], 240],
+   ])
+   def test_contract_sliced_threads(self, shapes, inds, max_memory):
+
+       def fun(*xs, max_memory=None):
+           return tn.contract(*xs, max_memory=max_memory, executor="threads")
+
+       w = data.ntensor_dat(data.randn)(
+              self.backend, inds, shapes
+           )
+
+       for i in range(len(w.tensors)):
+           assert_grad(fun, i)(*w.tensors, max_memory=max_memory)
+
+
    @pytest.mark.parametrize("shape, inds, traceinds", [
       [(4,4),       "ij",    "ij" ], 
       [(3,3,3),     "ijk",   "ijk"], 
@@ -904,6 +957,26 @@ class TestGradsContraction:
        assert_grad(fun)(x.tensor, traceinds)  
 
 
+   @pytest.mark.parametrize("shape, inds, traceinds", [
+      [(4,4),       "ij",    "ij" ], 
+      [(3,4,4),     "ijk",   "jk" ], 
+      [(3,4,5,6,7), "ijklm", "ikl"],
+   ])
+   def test_untrace(self, shape, inds, traceinds):
+
+       x = data.tensor_dat(data.randn)(
+              self.backend, inds, shape
+           )
+
+       space = tn.space(x.tensor)
+       g     = tn.space(tn.trace(x.tensor, traceinds)).randn()
+
+       def fun(g, inds):
+           return tn.untrace(g, inds, space)
+
+       assert_grad(fun)(g, traceinds)
+
+
    @pytest.mark.parametrize("shapes, inds, outshape, outinds", [ 
       [[(2,5,4), (3,6,7)], ["ijk", "lmn"], (6,30,28), "abc"],  
    ])   
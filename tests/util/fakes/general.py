@@ -142,6 +142,11 @@ class Value:
        return tuple(self)[idx]
 
 
+   def copy(self):
+
+       return self.__class__(self._val)
+
+
    def __add__(self, other):
 
        if not other:
@@ -168,7 +173,7 @@ class Value:
        return self.__mul__(other)
 
 
-   def addto(self, other):
+   def addto(self, other, inplace=False):
 
        if not other:
           return self
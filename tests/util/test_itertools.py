@@ -144,6 +144,38 @@ class TestSequence:
            assert x == ans[i]
 
 
+   @pytest.mark.parametrize("items", [
+      arepeat(fake.Value, 1),
+      arepeat(fake.Value, 3),
+   ])
+   def test_branch(self, items):
+
+       x, y = fake.Value(), fake.Value()
+
+       seq  = util.Sequence(items)
+       seqx = seq.push(x)
+       seqy = seq.pop().push(y)
+
+       assert list(seq)  == list(items)
+       assert list(seqx) == [*items, x]
+       assert list(seqy) == [*items[:-1], y]
+
+
+   @pytest.mark.parametrize("items", [
+      tuple(),
+      arepeat(fake.Value, 3),
+   ])
+   def test_reversed(self, items):
+
+       assert list(reversed(util.Sequence(items))) == list(reversed(items))
+
+
+   def test_pop_empty(self):
+
+       with pytest.raises(IndexError):
+          util.Sequence().pop()
+
+
 
 
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import pytest
+import numpy as np
+
+import tadpole.util as util
+
+import tadpole.util.profiling as profiling
+
+
+
+
+###############################################################################
+###                                                                         ###
+###  Profiler: per-primitive call counts, wall times, output bytes and      ###
+###  shapes, split into forward, VJP, JVP and backend calls. Self times     ###
+###  exclude nested profiled calls, so they add up without double counts.   ###
+###                                                                         ###
+###############################################################################
+
+
+# --- Profiler -------------------------------------------------------------- #
+
+class TestProfiler:
+
+   def test_run(self):
+
+       prof = util.Profiler()
+       out  = prof.run("ones", "forward", np.ones, (2,3))
+
+       event, = prof.events
+
+       assert np.allclose(out, np.ones((2,3)))
+       assert (event.name, event.phase) == ("ones", "forward")
+       assert (event.nbytes, event.shape) == (48, (2,3))
+       assert event.duration >= 0
+
+
+   def test_run_tuple(self):
+
+       prof = util.Profiler()
+       prof.run("pair", "vjp", lambda: (np.ones(2), np.ones((2,3)), None))
+
+       event, = prof.events
+
+       assert event.nbytes == 64
+       assert event.shape  == ((2,), (2,3), None)
+
+
+   def test_run_nested(self):
+
+       prof = util.Profiler()
+
+       def inner():
+           time.sleep(0.02)
+           return np.ones(2)
+
+       def outer():
+           time.sleep(0.01)
+           return prof.run("inner", "backend", inner) 
+
+       prof.run("outer", "forward", outer)
+
+       inner, outer = prof.events
+
+       assert inner.selftime == inner.duration
+       assert outer.selftime == outer.duration - inner.duration
+       assert outer.selftime >= 0.01 * 1e9
+
+       total = sum(stat.selftime for stat in prof.stats())
+
+       assert total == outer.duration
+
+
+   def test_stats(self):
+
+       prof = util.Profiler()
+
+       for _ in range(3):
+           prof.run("ones", "forward", np.ones, (2,3))
+
+       prof.run("ones",  "vjp",     np.ones, (4,))
+       prof.run("zeros", "forward", np.zeros, (2,3))
+
+       stats = {(s.phase, s.name): s for s in prof.stats()}
+
+       assert set(stats) == {
+          ("forward", "ones"), ("vjp", "ones"), ("forward", "zeros")
+       }
+       assert stats["forward", "ones"].calls  == 3
+       assert stats["forward", "ones"].nbytes == 144
+       assert stats["forward", "ones"].shapes == [(2,3)]
+       assert [s.phase for s in prof.stats("vjp")] == ["vjp"]
+
+
+   def test_table(self):
+
+       prof = util.Profiler()
+       prof.run("ones", "forward", np.ones, (2,3))
+
+       lines = prof.table().splitlines()
+
+       assert len(lines) == 3
+       assert lines[2].split()[:3] == ["forward", "ones", "1"]
+       assert "out bytes" in lines[0]
+
+
+   def test_save(self, tmp_path):
+
+       prof = util.Profiler()
+       prof.run("ones", "forward", np.ones, (2,3))
+
+       with open(prof.save(tmp_path / "trace.json")) as f:
+          trace = json.load(f)
+
+       event, = trace["traceEvents"]
+
+       assert (event["name"], event["cat"], event["ph"]) == (
+          "ones", "forward", "X"
+       )
+
+
+   def test_context(self):
+
+       with util.profile() as prof:
+          assert util.profiler() is prof
+
+          with util.profile() as prof1:
+             assert util.profiler() is prof1
+
+          assert util.profiler() is prof
+
+       assert util.profiler() is None
+
+
+
+
+# --- Instrumented method --------------------------------------------------- #
+
+class TestInstrumented:
+
+   def test_instrumented(self):
+
+       fun = profiling.instrumented(np.ones, "fake.ones", "backend")
+
+       assert np.allclose(fun((2,3)), np.ones((2,3)))
+
+       with util.profile() as prof:
+          fun((2,3))
+
+       event, = prof.events
+       assert (event.name, event.phase) == ("fake.ones", "backend")
+
+
+   def test_instrument_registry(self):
+
+       class Fake:
+
+          def ones(self, shape):
+              return np.ones(shape)
+
+       registry = profiling.InstrumentRegistry()
+       registry.register(Fake, ["ones"], "fake", "backend")
+
+       registry.install()
+
+       with util.profile() as prof:
+          Fake().ones((2,))
+
+       registry.uninstall()
+
+       with util.profile() as prof1:
+          Fake().ones((2,))
+
+       event, = prof.events
+
+       assert (event.name, event.nbytes) == ("fake.ones", 16)
+       assert prof1.events == []
+
+
+
+